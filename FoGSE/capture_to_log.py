@@ -0,0 +1,143 @@
+"""
+Write a run folder of downlink log files straight from a packet capture
+(pcap or pcapng, e.g. from tcpdump or Wireshark), without replaying it
+through the network.
+
+The capture is streamed (see `FoGSE.io.capture`): downlink datagrams
+are picked out by destination address and port, fragmented ones are
+reassembled, and each is fed through the same `listening.LogFileManager`
+reassembly the Listener uses (see
+`reassemble_journal.reassemble_datagrams()`). Frames are indexed at
+the capture time of their datagrams, and the run folder is named after
+the time of the first datagram, as the Listener would have named it, so
+the GUI and readers find it as usual.
+
+From a shell:
+    python FoGSE/capture_to_log.py <capture> <systems.json> <log folder> [--address 224.1.1.118] [--port 9999] [cdte1_pc=0x800c ...]
+"""
+import json
+import os
+import sys
+import time
+from datetime import datetime
+
+from FoGSE.io.capture import CaptureReader, DEFAULT_MAX_FRAGMENTED, DEFAULT_FRAGMENT_TIMEOUT_S
+from FoGSE.io.newest_data import run_folder_name
+from FoGSE.reassemble_journal import reassemble_datagrams
+from FoGSE.utils import get_system_dict
+
+def convert_capture(capture_path, json_config_file, log_folder, frame_sizes=None,
+                    local_system="gse", address: str=None, port: int=None,
+                    max_fragmented: int=DEFAULT_MAX_FRAGMENTED,
+                    fragment_timeout_s: float=DEFAULT_FRAGMENT_TIMEOUT_S):
+    """
+    Write the downlink datagrams in a capture to a new run folder.
+
+    Parameters
+    ----------
+    capture_path : `str`
+        The pcap or pcapng capture.
+
+    json_config_file : `str`
+        systems.json file to take systems, data types, frame sizes, the
+        packet payload size and the downlink address from.
+
+    log_folder : `str`
+        Folder to make the run folder in (e.g. `logs/received`).
+
+    frame_sizes : `dict` or `None`
+        As for `reassemble_journal.reassemble_datagrams()`.
+
+    local_system : `str`
+        The `name` of the system in `json_config_file` that received the
+        downlink.
+
+    address : `str`
+        Destination address of the downlink datagrams. Default is the
+        local system's `mcast_group`, or else its `address`.
+
+    port : `int`
+        Destination port of the downlink datagrams. Default is the local
+        system's `port`.
+
+    max_fragmented, fragment_timeout_s :
+        As for `capture.CaptureReader`.
+
+    Returns
+    -------
+    `str`, `dict` :
+        The run folder, and the statistics from
+        `reassemble_journal.reassemble_datagrams()` plus `"capture"`:
+        the number of capture records, downlink datagrams and datagrams
+        dropped for missing fragments.
+
+    Raises
+    ------
+    RuntimeError : if the local system can't be found, or the run folder
+    already exists.
+    ValueError : if the capture holds no downlink datagrams.
+    """
+    with open(json_config_file, "r") as json_config:
+        json_dict = json.load(json_config)
+    local_system_config = get_system_dict(local_system, json_dict)
+    if local_system_config is None:
+        print("can't access system in provided JSON!")
+        raise RuntimeError
+    interface = local_system_config["ethernet_interface"]
+    if address is None:
+        address = interface.get("mcast_group", interface["address"])
+    if port is None:
+        port = interface["port"]
+
+    capture = CaptureReader(capture_path, address, port, max_fragmented, fragment_timeout_s)
+    datagrams = capture.datagrams()
+    first = next(datagrams, None)
+    if first is None:
+        print("no downlink datagrams to", address + ":" + str(port), "in", capture_path)
+        raise ValueError
+
+    run_folder = os.path.join(log_folder, run_folder_name(datetime.fromtimestamp(first.timestamp_ns/1e9)))
+    if os.path.exists(run_folder):
+        print("run folder", run_folder, "already exists")
+        raise RuntimeError
+    print("writing", run_folder)
+
+    def records():
+        yield first
+        yield from datagrams
+
+    stats = reassemble_datagrams(records(), json_config_file, run_folder, frame_sizes, local_system)
+    stats["capture"] = {"records": capture.records, "datagrams": capture.matched,
+                        "fragments_dropped": capture.fragments_dropped}
+    return run_folder, stats
+
+if __name__ == "__main__":
+    args = sys.argv[1:]
+    options = {}
+    for option in ("--address", "--port"):
+        if option in args:
+            k = args.index(option)
+            options[option[2:]] = args[k + 1]
+            del args[k:k + 2]
+    if len(args) < 3:
+        print("usage: python FoGSE/capture_to_log.py <capture> <systems.json> <log folder> "
+              "[--address <address>] [--port <port>] [<log>=<frame size> ...]")
+        sys.exit(1)
+    sizes = {}
+    for arg in args[3:]:
+        name, size = arg.split("=")
+        sizes[name] = int(size, 0)
+    start = time.monotonic()
+    folder, result = convert_capture(args[0], args[1], args[2], sizes, address=options.get("address"),
+                                     port=int(options["port"]) if "port" in options else None)
+    elapsed = time.monotonic() - start
+    capture = result.pop("capture")
+    unrouted = result.pop("unrouted")
+    for name, s in sorted(result.items()):
+        print(name, "frames:", s["frames_completed"], "dumped:", s["frames_dumped"],
+              "missing packets:", s["missing_packets"])
+    print("unrouted packets:", unrouted)
+    print("datagrams:", capture["datagrams"], "of", capture["records"], "captured packets;",
+          capture["fragments_dropped"], "dropped for missing fragments")
+    print("converted", "{:.1f}".format(os.path.getsize(args[0])/1e6), "MB in", "{:.2f}".format(elapsed),
+          "s ({:.0f} MB/s)".format(os.path.getsize(args[0])/1e6/max(elapsed, 1e-9)))
@@ -70,7 +70,9 @@ class GSEDataDisplay(QWidget):
         self.f3.clear_cdte_image_button.clicked.connect(self.clear_cdte_images)
         self.f3.clear_cmos_image_button.clicked.connect(self.clear_cmos_images)
 
-        self.f4 = catch_view(data_file=os.path.join(newest_folder, get_det_file("catch.log", instruments)))
+        # newer runs keep a binary catch log, older ones a text one
+        catch_file = "catch.bin" if os.path.isfile(os.path.join(newest_folder, "catch.bin")) else get_det_file("catch.log", instruments)
+        self.f4 = catch_view(data_file=os.path.join(newest_folder, catch_file))
         
 
         lay = QGridLayout()
@@ -204,10 +206,19 @@ class GSEDataDisplay(QWidget):
 
 if __name__=="__main__":
     import time
+    from FoGSE.readers.BaseReader import BaseReader
+    from FoGSE.readers.ReaderWorker import MainThreadJitter
     app = QApplication([])
     icon_path = os.path.join(os.path.dirname(__file__), '..', 'assets', 'FOXSI4_32.png')
     print(icon_path)
     app.setWindowIcon(QtGui.QIcon(icon_path))
+    if "--threaded-readers" in sys.argv:
+        # parse on worker threads, leaving this one to draw
+        BaseReader.threaded = True
+    if "--jitter" in sys.argv:
+        # print how far behind the GUI thread runs every 5 s
+        jitter = MainThreadJitter(report_s=5)
+
     w = GSEDataDisplay(window_alert=True)
 
     _s = 122
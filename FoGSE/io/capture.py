@@ -0,0 +1,343 @@
+"""
+Stream UDP datagrams out of packet captures (pcap or pcapng), without
+loading the capture into memory.
+
+`read_capture()` walks the capture's records one at a time through a
+large read buffer, and decodes only the headers needed to find IPv4
+packets: Ethernet (with 802.1Q tags), Linux cooked capture (SLL and
+SLL2), BSD loopback and raw IP. `CaptureReader.datagrams()` picks out
+the UDP datagrams sent to one address and port, reassembling
+fragmented IPv4 datagrams with bounded memory: at most
+`max_fragmented` datagrams are held partly reassembled, and a datagram
+whose fragments stop arriving for `fragment_timeout_s` (of capture
+time) is dropped.
+
+Example
+-------
+>>> capture = CaptureReader("downlink.pcapng", "224.1.1.118", 9999)
+>>> for datagram in capture.datagrams():
+...     datagram.timestamp_ns, datagram.data
+>>> capture.fragments_dropped # datagrams lost for want of a fragment
+
+See `FoGSE.capture_to_log` to write log files from a capture.
+"""
+import collections
+import socket
+import struct
+
+PCAP_HEADER = struct.Struct("IHHiIII")
+PCAP_RECORD = struct.Struct("IIII")
+PCAPNG_BLOCK = struct.Struct("II")
+
+PCAP_MAGIC_US = 0xa1b2c3d4
+PCAP_MAGIC_NS = 0xa1b23c4d
+PCAPNG_SHB = 0x0a0d0d0a
+PCAPNG_BYTE_ORDER = 0x1a2b3c4d
+# pcapng block types
+PCAPNG_IDB = 0x00000001
+PCAPNG_PB = 0x00000002
+PCAPNG_SPB = 0x00000003
+PCAPNG_EPB = 0x00000006
+
+# link-layer header types (https://www.tcpdump.org/linktypes.html)
+LINKTYPE_NULL = 0
+LINKTYPE_ETHERNET = 1
+LINKTYPE_RAW = 101
+LINKTYPE_LINUX_SLL = 113
+LINKTYPE_IPV4 = 228
+LINKTYPE_LINUX_SLL2 = 276
+
+# version and header length, total length, ID, flags and fragment
+# offset, protocol, source, destination
+IPV4_HEADER = struct.Struct(">BxHHHxB2x4s4s")
+# destination port, length
+UDP_HEADER = struct.Struct(">2xHH2x")
+IP_PROTOCOL_UDP = 17
+
+DEFAULT_MAX_FRAGMENTED = 64
+DEFAULT_FRAGMENT_TIMEOUT_S = 2.0
+
+CaptureRecord = collections.namedtuple("CaptureRecord", ["timestamp_ns", "link_type", "data"])
+Datagram = collections.namedtuple("Datagram", ["timestamp_ns", "data"])
+
+def read_capture(path, buffer_bytes: int=1 << 22):
+    """
+    Iterate over the records of a pcap or pcapng capture.
+
+    Parameters
+    ----------
+    path : `str`
+        The capture file.
+
+    buffer_bytes : `int`
+        Size of the file read buffer.
+
+    Yields
+    ------
+    `CaptureRecord` :
+        Each captured packet, with its timestamp (nanoseconds since the
+        Unix epoch) and link-layer header type. A truncated last record
+        is skipped.
+
+    Raises
+    ------
+    ValueError : if the file is neither pcap nor pcapng.
+    """
+    with open(path, "rb", buffering=buffer_bytes) as f:
+        magic = f.read(4)
+        if len(magic) == 4 and struct.unpack("<I", magic)[0] == PCAPNG_SHB:
+            yield from _read_pcapng(f, magic)
+        else:
+            yield from _read_pcap(f, magic, path)
+
+def _read_pcap(f, magic, path):
+    header = magic + f.read(PCAP_HEADER.size - len(magic))
+    for order in "<>":
+        if len(header) == PCAP_HEADER.size and struct.unpack(order + "I", magic)[0] in (PCAP_MAGIC_US, PCAP_MAGIC_NS):
+            break
+    else:
+        print(path, "is not a pcap or pcapng capture")
+        raise ValueError
+    fields = struct.unpack(order + PCAP_HEADER.format, header)
+    scale = 1 if fields[0] == PCAP_MAGIC_NS else 1000
+    link_type = fields[6] & 0xffff
+    record = struct.Struct(order + PCAP_RECORD.format)
+    while True:
+        head = f.read(record.size)
+        if len(head) < record.size:
+            return
+        seconds, fraction, length, _ = record.unpack(head)
+        data = f.read(length)
+        if len(data) < length:
+            return
+        yield CaptureRecord(seconds*1_000_000_000 + fraction*scale, link_type, data)
+
+def _read_pcapng(f, magic):
+    order = "<"
+    # (link type, nanoseconds per timestamp unit) for each interface of
+    # the current section:
+    interfaces = []
+    last_ns = 0
+    while True:
+        head = magic + f.read(PCAPNG_BLOCK.size - len(magic))
+        magic = b""
+        if len(head) < PCAPNG_BLOCK.size:
+            return
+        block_type = struct.unpack(order + "I", head[:4])[0]
+        if block_type == PCAPNG_SHB:
+            # a new section, possibly of the other byte order
+            body_start = f.read(4)
+            if len(body_start) < 4:
+                return
+            order = "<" if struct.unpack("<I", body_start)[0] == PCAPNG_BYTE_ORDER else ">"
+            length = struct.unpack(order + "I", head[4:])[0]
+            body = body_start + f.read(length - PCAPNG_BLOCK.size - 4)
+            interfaces = []
+            continue
+        length = struct.unpack(order + "I", head[4:])[0]
+        body = f.read(length - PCAPNG_BLOCK.size)
+        if len(body) < length - PCAPNG_BLOCK.size or length < 12:
+            return
+        if block_type == PCAPNG_EPB:
+            interface, high, low, captured = struct.unpack_from(order + "IIII", body)
+            link_type, unit_ns = interfaces[interface]
+            last_ns = int(((high << 32) | low)*unit_ns)
+            yield CaptureRecord(last_ns, link_type, body[20:20 + captured])
+        elif block_type == PCAPNG_IDB:
+            link_type = struct.unpack_from(order + "H", body)[0]
+            interfaces.append((link_type, _pcapng_unit_ns(body[8:-4], order)))
+        elif block_type == PCAPNG_SPB:
+            # no timestamp: take the previous packet's
+            link_type, _ = interfaces[0]
+            original = struct.unpack_from(order + "I", body)[0]
+            yield CaptureRecord(last_ns, link_type, body[4:4 + min(original, len(body) - 8)])
+        elif block_type == PCAPNG_PB:
+            interface, _, high, low, captured = struct.unpack_from(order + "HHIII", body)
+            link_type, unit_ns = interfaces[interface]
+            last_ns = int(((high << 32) | low)*unit_ns)
+            yield CaptureRecord(last_ns, link_type, body[20:20 + captured])
+
+def _pcapng_unit_ns(options, order):
+    """ Nanoseconds per timestamp unit, from an interface's `if_tsresol` option. """
+    position = 0
+    while position + 4 <= len(options):
+        code, length = struct.unpack_from(order + "HH", options, position)
+        if code == 0:
+            break
+        if code == 9 and length >= 1:
+            resolution = options[position + 4]
+            if resolution & 0x80:
+                return 1e9/(1 << (resolution & 0x7f))
+            return 10**(9 - resolution) if resolution <= 9 else 10.0**(9 - resolution)
+        position += 4 + (length + 3)//4*4
+    # microseconds, by default
+    return 1000
+
+def ipv4_offset(link_type: int, data):
+    """
+    Return where the IPv4 packet starts in the captured link-layer frame
+    `data`, or `None` if it doesn't hold one.
+    """
+    if link_type == LINKTYPE_ETHERNET:
+        position = 12
+        ethertype = data[12:14]
+        while ethertype in (b"\x81\x00", b"\x88\xa8"):
+            # 802.1Q (or 802.1ad) tag
+            position += 4
+            ethertype = data[position:position + 2]
+        ipv4 = ethertype == b"\x08\x00"
+        position += 2
+    elif link_type == LINKTYPE_LINUX_SLL:
+        ipv4 = data[14:16] == b"\x08\x00"
+        position = 16
+    elif link_type == LINKTYPE_LINUX_SLL2:
+        ipv4 = data[0:2] == b"\x08\x00"
+        position = 20
+    elif link_type == LINKTYPE_NULL:
+        # address family, in the capturing host's byte order
+        ipv4 = data[0:4] in (b"\x02\x00\x00\x00", b"\x00\x00\x00\x02")
+        position = 4
+    elif link_type in (LINKTYPE_RAW, LINKTYPE_IPV4):
+        ipv4 = True
+        position = 0
+    else:
+        return None
+    if not ipv4 or len(data) < position + IPV4_HEADER.size or data[position] >> 4 != 4:
+        return None
+    return position
+
+class CaptureReader:
+    """
+    Reads the UDP datagrams sent to one address and port out of a
+    capture, reassembling fragmented IPv4 datagrams.
+
+    Counters (`records` read, datagrams `matched` and
+    `fragments_dropped`) are kept as plain attributes.
+    """
+
+    def __init__(self, path, address: str=None, port: int=None,
+                 max_fragmented: int=DEFAULT_MAX_FRAGMENTED,
+                 fragment_timeout_s: float=DEFAULT_FRAGMENT_TIMEOUT_S):
+        """
+        Parameters
+        ----------
+        path : `str`
+            The pcap or pcapng capture.
+
+        address : `str`
+            Destination IPv4 address (e.g. the downlink multicast group)
+            of the datagrams to read. `None` for any.
+
+        port : `int`
+            Destination UDP port of the datagrams to read. `None` for any.
+
+        max_fragmented : `int`
+            Maximum number of fragmented datagrams to hold partly
+            reassembled at once. Starting another drops the oldest.
+
+        fragment_timeout_s : `float`
+            A partly reassembled datagram is dropped if no fragment of it
+            arrives for this many seconds (of capture time).
+        """
+        if max_fragmented < 1:
+            print("must allow at least one fragmented datagram")
+            raise ValueError
+        self.path = path
+        self.address = None if address is None else socket.inet_aton(address)
+        self.port = port
+        self.max_fragmented = max_fragmented
+        self.fragment_timeout_ns = int(fragment_timeout_s*1e9)
+        self.records = 0
+        self.matched = 0
+        self.fragments_dropped = 0
+        # partly reassembled datagrams, oldest first, keyed by (source,
+        # destination, IP ID), each [last fragment time, {offset:
+        # fragment}, total length (once known), bytes held]:
+        self._fragmented = collections.OrderedDict()
+
+    def datagrams(self):
+        """
+        Iterate over the matching datagrams in the capture.
+
+        Yields
+        ------
+        `Datagram` :
+            Each UDP payload, with the capture time (nanoseconds since
+            the Unix epoch) of its last fragment, in capture order.
+        """
+        address = self.address
+        port = self.port
+        for timestamp_ns, link_type, data in read_capture(self.path):
+            self.records += 1
+            if link_type == LINKTYPE_ETHERNET and data[12:14] == b"\x08\x00" and len(data) >= 34:
+                # the usual case, untagged Ethernet
+                position = 14
+            else:
+                position = ipv4_offset(link_type, data)
+                if position is None:
+                    continue
+            version_ihl, total_len, ident, fragment, protocol, source, destination = \
+                IPV4_HEADER.unpack_from(data, position)
+            if protocol != IP_PROTOCOL_UDP or version_ihl >> 4 != 4 or \
+                    (address is not None and destination != address):
+                continue
+            start = position + (version_ihl & 0x0f)*4
+            end = min(position + total_len, len(data))
+            if fragment & 0x3fff != 0:
+                # a fragment (more fragments flag set, or an offset)
+                data = self._add_fragment(timestamp_ns, (source, destination, ident),
+                                          data[start:end], fragment)
+                if data is None:
+                    continue
+                start, end = 0, len(data)
+            if end - start < UDP_HEADER.size:
+                continue
+            dport, length = UDP_HEADER.unpack_from(data, start)
+            if port is not None and dport != port:
+                continue
+            self.matched += 1
+            yield Datagram(timestamp_ns, data[start + UDP_HEADER.size:min(start + length, end)])
+        self.fragments_dropped += len(self._fragmented)
+        self._fragmented.clear()
+
+    def _add_fragment(self, timestamp_ns, key, data, fragment):
+        """
+        Hold the fragment `data`; return the reassembled IP payload once
+        every fragment of its datagram has arrived, else `None`.
+        """
+        self._expire_fragments(timestamp_ns)
+        entry = self._fragmented.get(key)
+        if entry is None:
+            if len(self._fragmented) >= self.max_fragmented:
+                self._fragmented.popitem(last=False)
+                self.fragments_dropped += 1
+            entry = [timestamp_ns, {}, None, 0]
+            self._fragmented[key] = entry
+        entry[0] = timestamp_ns
+        self._fragmented.move_to_end(key)
+        offset = (fragment & 0x1fff)*8
+        entry[3] += len(data) - len(entry[1].get(offset, b""))
+        entry[1][offset] = data
+        if fragment & 0x2000 == 0:
+            # the last fragment gives the datagram's length
+            entry[2] = offset + len(data)
+        if entry[2] is None or entry[3] < entry[2]:
+            return None
+        payload = bytearray()
+        for offset in sorted(entry[1]):
+            if offset > len(payload):
+                # a gap, despite the byte count (fragments overlap)
+                return None
+            payload[offset:] = entry[1][offset]
+        if len(payload) < entry[2]:
+            return None
+        del self._fragmented[key]
+        return bytes(payload[:entry[2]])
+
+    def _expire_fragments(self, now_ns):
+        while len(self._fragmented) > 0:
+            key, entry = next(iter(self._fragmented.items()))
+            if now_ns - entry[0] < self.fragment_timeout_ns:
+                return
+            del self._fragmented[key]
+            self.fragments_dropped += 1
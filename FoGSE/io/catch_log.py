@@ -0,0 +1,320 @@
+"""
+Binary catch log for downlink packets that have no matching log file.
+
+`listening.Listener` appends every datagram it can't route to
+`catch.bin` through a buffered `CatchLogWriter`, rather than writing
+one hex text line (and a console message) per packet. The file holds:
+    - `CATCH_HEADER`: magic, version and the Listener's start time
+      (nanoseconds since the Unix epoch),
+    - one record per packet: `CATCH_RECORD` (nanoseconds since the
+      start time, packet length), the raw packet, then `CATCH_TRAILER`
+      (the packet length's ones' complement, so zeros left by a torn
+      write don't pass for a record), so the log can be walked
+      backwards from its end.
+
+Logs of version 1 have no trailers. They can still be read, and are
+appended to in the same format.
+
+The text view of the old `catch.log` (`[<time since start>] <hex>` per
+line) is produced by `format_record()`, `CatchLogReader.tail_text()` and
+`convert_catch_log()`. From a shell:
+    python -m FoGSE.io.catch_log catch.bin catch.log
+"""
+import collections
+import os
+import struct
+import sys
+import time
+from datetime import timedelta
+
+# magic, version, start time (ns since the Unix epoch)
+CATCH_HEADER = struct.Struct("<4sIQ")
+# time since start (ns), packet length
+CATCH_RECORD = struct.Struct("<QH")
+# ones' complement of the packet length
+CATCH_TRAILER = struct.Struct("<H")
+
+CATCH_MAGIC = b"FGCT"
+CATCH_VERSION = 2
+
+CatchRecord = collections.namedtuple("CatchRecord", ["time_ns", "data"])
+
+def is_binary_catch_log(filepath):
+    """ Return True if `filepath` starts with a binary catch log header. """
+    try:
+        with open(filepath, "rb") as f:
+            return f.read(len(CATCH_MAGIC)) == CATCH_MAGIC
+    except OSError:
+        return False
+
+def _trailer_size(version: int):
+    """ Size of the length trailer after each record in a log of `version`. """
+    return CATCH_TRAILER.size if version >= 2 else 0
+
+def _record_before(f, end: int):
+    """
+    Return the start of the version 2 record ending at `end` in the open
+    log `f` and its `CatchRecord`, or `None` if there isn't a whole
+    record there.
+    """
+    if end - CATCH_TRAILER.size - CATCH_RECORD.size < CATCH_HEADER.size:
+        return None
+    f.seek(end - CATCH_TRAILER.size)
+    length, = CATCH_TRAILER.unpack(f.read(CATCH_TRAILER.size))
+    length ^= 0xffff
+    start = end - CATCH_TRAILER.size - length - CATCH_RECORD.size
+    if start < CATCH_HEADER.size:
+        return None
+    f.seek(start)
+    data = f.read(CATCH_RECORD.size + length)
+    time_ns, recorded = CATCH_RECORD.unpack_from(data)
+    if recorded != length:
+        return None
+    return start, CatchRecord(time_ns, data[CATCH_RECORD.size:])
+
+def _complete_length(filepath, version: int=CATCH_VERSION):
+    """
+    Return the length of the binary catch log `filepath` up to the end
+    of its last complete record.
+
+    Records are written whole, so the end of the file is normally the
+    end of a record: for a version 2 log, only the last two records are
+    checked. The log is scanned from the start if they don't check out
+    (e.g. the last write was cut short), or if it is version 1.
+    """
+    size = os.path.getsize(filepath)
+    with open(filepath, "rb") as f:
+        if version >= 2:
+            last = _record_before(f, size)
+            if last is not None and (last[0] == CATCH_HEADER.size or _record_before(f, last[0]) is not None):
+                return size
+        trailer = _trailer_size(version)
+        position = CATCH_HEADER.size
+        while position + CATCH_RECORD.size <= size:
+            f.seek(position)
+            _, length = CATCH_RECORD.unpack(f.read(CATCH_RECORD.size))
+            if position + CATCH_RECORD.size + length + trailer > size:
+                break
+            position += CATCH_RECORD.size + length + trailer
+    return min(position, size)
+
+def format_record(record):
+    """ Return the `catch.log` text line for a `CatchRecord`. """
+    return "[" + str(timedelta(microseconds=record.time_ns//1000)) + "] " + record.data.hex() + "\n"
+
+class CatchLogWriter:
+    """
+    Appends unroutable packets to a binary catch log, and summarises them
+    on the console at most once every `summary_interval` seconds.
+
+    Writes go through a file buffer of `buffer_bytes`; `report()` (called
+    periodically by the Listener) flushes it.
+    """
+
+    def __init__(self, filepath, start_ns: int=None, buffer_bytes: int=1 << 16,
+                 summary_interval: float=5.0, append: bool=False):
+        """
+        Parameters
+        ----------
+        filepath : `str`
+            The catch log to create. An existing file is overwritten,
+            unless `append` is set.
+
+        start_ns : `int`
+            Time that record times are measured from, in nanoseconds
+            since the Unix epoch. Default is now.
+
+        buffer_bytes : `int`
+            Size of the write buffer.
+
+        summary_interval : `float`
+            Minimum number of seconds between console summaries.
+
+        append : `bool`
+            Continue an existing binary catch log at `filepath` (keeping
+            its start time and version, and cutting off a partly written
+            last record) instead of overwriting it.
+        """
+        self.filepath = filepath
+        self.start_ns = time.time_ns() if start_ns is None else start_ns
+        self.summary_interval = summary_interval
+        if append and is_binary_catch_log(filepath):
+            existing = CatchLogReader(filepath)
+            self.start_ns, self.version = existing.start_ns, existing.version
+            os.truncate(filepath, _complete_length(filepath, self.version))
+            self.file = open(filepath, "ab", buffering=buffer_bytes)
+        else:
+            self.version = CATCH_VERSION
+            self.file = open(filepath, "wb", buffering=buffer_bytes)
+            self.file.write(CATCH_HEADER.pack(CATCH_MAGIC, CATCH_VERSION, self.start_ns))
+            self.file.flush()
+        self._trailer = self.version >= 2
+        self.packets = 0
+        self.bytes = 0
+        # packets caught since the last summary, by (system, data type):
+        self._unreported = collections.Counter()
+        self._last_report = time.monotonic()
+
+    def write(self, data):
+        """ Append one packet (including its header). """
+        # one write per record, so the buffer is only ever flushed between records
+        record = (CATCH_RECORD.pack(time.time_ns() - self.start_ns, len(data)), data)
+        if self._trailer:
+            record += (CATCH_TRAILER.pack(len(data) ^ 0xffff),)
+        self.file.write(b"".join(record))
+        self.packets += 1
+        self.bytes += len(data)
+        if len(data) > 5:
+            self._unreported[(data[0], data[5])] += 1
+        else:
+            self._unreported[None] += 1
+
+    def report(self, now: float=None):
+        """
+        Flush the file and, if `summary_interval` has passed since the
+        last summary, print how many packets were caught in the meantime.
+
+        Parameters
+        ----------
+        now : `float`
+            Current `time.monotonic()` value, if the caller already has
+            it.
+
+        Returns
+        -------
+        `int` :
+            Number of packets in the printed summary (0 if none was
+            printed).
+        """
+        self.file.flush()
+        if now is None:
+            now = time.monotonic()
+        if now - self._last_report < self.summary_interval or len(self._unreported) == 0:
+            return 0
+        total = sum(self._unreported.values())
+        sources = ", ".join(("bad header" if key is None else "system 0x{:02x} type 0x{:02x}".format(*key))
+                            + " x" + str(count)
+                            for key, count in self._unreported.most_common(4))
+        print("caught", total, "packets with no log file in the last",
+              "{:.1f}".format(now - self._last_report), "s (" + sources + ") in", self.filepath)
+        self._unreported.clear()
+        self._last_report = now
+        return total
+
+    def close(self):
+        self.file.close()
+
+class CatchLogReader:
+    """
+    Reads records from a binary catch log as it grows.
+
+    Example
+    -------
+    >>> catch = CatchLogReader("catch.bin")
+    >>> catch.read_new() # every record so far
+    >>> catch.read_new() # only records appended since the last call
+    """
+
+    def __init__(self, filepath):
+        """
+        Parameters
+        ----------
+        filepath : `str`
+            Path to the binary catch log.
+
+        Raises
+        ------
+        FileNotFoundError : if the file doesn't exist.
+        ValueError : if the file is not a binary catch log.
+        """
+        self.filepath = filepath
+        with open(filepath, "rb") as f:
+            header = f.read(CATCH_HEADER.size)
+        if len(header) < CATCH_HEADER.size or header[:len(CATCH_MAGIC)] != CATCH_MAGIC:
+            print(filepath, "is not a binary catch log")
+            raise ValueError
+        _, self.version, self.start_ns = CATCH_HEADER.unpack(header)
+        self._offset = CATCH_HEADER.size
+        self._trailer = _trailer_size(self.version)
+        # the last `tail_text()`: (end of the log, `nbytes`) and its text
+        self._tail = None
+        self._text = b""
+
+    def read_new(self):
+        """ Return every complete `CatchRecord` appended since the last call. """
+        with open(self.filepath, "rb") as f:
+            f.seek(self._offset)
+            data = f.read()
+        records = []
+        position = 0
+        while position + CATCH_RECORD.size <= len(data):
+            time_ns, length = CATCH_RECORD.unpack_from(data, position)
+            end = position + CATCH_RECORD.size + length
+            if end + self._trailer > len(data):
+                # the rest of this record hasn't been written yet
+                break
+            records.append(CatchRecord(time_ns, data[position + CATCH_RECORD.size:end]))
+            position = end + self._trailer
+        self._offset += position
+        return records
+
+    def tail_text(self, nbytes: int):
+        """
+        Return the last `nbytes` of the text view of the log (as `bytes`,
+        the same as the end of the old text `catch.log`), or all of it if
+        `nbytes` is less than 1.
+
+        Records are read back from the end of the log, and only those
+        needed for the last `nbytes` are formatted, however fast packets
+        are being caught. A log that hasn't grown since the last call
+        costs one `stat`.
+        """
+        if self._trailer == 0:
+            # version 1: no way back from the end, so format forwards
+            new = b"".join(format_record(r).encode("utf-8") for r in self.read_new())
+            self._text = (self._text + new)[-nbytes:] if nbytes > 0 else self._text + new
+            return self._text
+        size = os.path.getsize(self.filepath)
+        if self._tail is not None and self._tail == (size, nbytes):
+            return self._text
+        end = _complete_length(self.filepath, self.version)
+        lines = []
+        total = 0
+        with open(self.filepath, "rb") as f:
+            while nbytes < 1 or total < nbytes:
+                previous = _record_before(f, end)
+                if previous is None:
+                    break
+                end, record = previous
+                lines.append(format_record(record).encode("utf-8"))
+                total += len(lines[-1])
+        text = b"".join(reversed(lines))
+        self._text = text[-nbytes:] if nbytes > 0 else text
+        self._tail = (size, nbytes)
+        return self._text
+
+def catch_log_text(filepath):
+    """ Return the whole text view of a binary catch log as `bytes`. """
+    return b"".join(format_record(r).encode("utf-8") for r in CatchLogReader(filepath).read_new())
+
+def convert_catch_log(bin_path, text_path):
+    """
+    Write the text view of the binary catch log `bin_path` to
+    `text_path`.
+
+    Returns
+    -------
+    `int` :
+        Number of records converted.
+    """
+    records = CatchLogReader(bin_path).read_new()
+    with open(text_path, "w") as f:
+        for record in records:
+            f.write(format_record(record))
+    return len(records)
+
+if __name__ == "__main__":
+    if len(sys.argv) != 3:
+        print("usage: python -m FoGSE.io.catch_log <catch.bin> <catch.log>")
+        sys.exit(1)
+    print("converted", convert_catch_log(sys.argv[1], sys.argv[2]), "records")
@@ -0,0 +1,154 @@
+"""
+"Frame written" notifications from `listening.Listener` to log readers.
+
+A reader subscribes to one log file by sending `SUBSCRIBE` followed by
+the log file's path to the Listener's Unix datagram socket (from its own
+bound Unix datagram socket). Every time a frame has been written to that
+log file, the Listener sends the subscriber a `FRAME_EVENT` datagram
+holding the frame's system and data type codes, byte offset, length and
+frame counter. Readers can then read new data straight away instead of
+polling the file for changes.
+"""
+import collections
+import os
+import shutil
+import socket
+import struct
+import tempfile
+import threading
+
+# system, data type, offset, length, frame counter
+FRAME_EVENT = struct.Struct("<BBQIH")
+
+# control messages understood by the Listener's Unix socket
+SUBSCRIBE = b"\x00\xe1"
+UNSUBSCRIBE = b"\x00\xe2"
+
+FrameEvent = collections.namedtuple("FrameEvent", ["system", "data", "offset", "length", "counter"])
+
+class FrameEventPublisher:
+    """
+    Sends `FRAME_EVENT`s to subscribed Unix datagram sockets.
+
+    Used by the Listener. `publish()` may be called from a different
+    thread to `subscribe()` and `unsubscribe()`.
+    """
+
+    def __init__(self):
+        self._socket = socket.socket(socket.AF_UNIX, socket.SOCK_DGRAM)
+        self._socket.setblocking(False)
+        self._lock = threading.Lock()
+        # (system, data) -> tuple of subscriber addresses. Replaced, not
+        # modified, so `publish()` can read it without the lock.
+        self._subscribers = {}
+
+    def subscribe(self, address, system: int, data: int):
+        """ Send events for frames of `system` and `data` to `address`. """
+        with self._lock:
+            subscribers = dict(self._subscribers)
+            current = subscribers.get((system, data), ())
+            if address not in current:
+                subscribers[(system, data)] = current + (address,)
+            self._subscribers = subscribers
+
+    def unsubscribe(self, address):
+        """ Stop sending any events to `address`. """
+        with self._lock:
+            subscribers = {}
+            for key, addresses in self._subscribers.items():
+                remaining = tuple(a for a in addresses if a != address)
+                if len(remaining) > 0:
+                    subscribers[key] = remaining
+            self._subscribers = subscribers
+
+    def publish(self, system: int, data: int, offset: int, length: int, counter: int):
+        """
+        Notify subscribers that a frame has been written. Subscribers
+        whose socket has gone away are dropped; if a subscriber is not
+        keeping up, the event is skipped.
+        """
+        addresses = self._subscribers.get((system, data))
+        if addresses is None:
+            return
+        message = FRAME_EVENT.pack(system, data, offset, length, counter)
+        for address in addresses:
+            try:
+                self._socket.sendto(message, address)
+            except BlockingIOError:
+                continue
+            except OSError:
+                self.unsubscribe(address)
+
+    def close(self):
+        self._socket.close()
+
+class FrameEventSubscriber:
+    """
+    Receives `FRAME_EVENT`s from the Listener for one log file.
+
+    Example
+    -------
+    >>> events = FrameEventSubscriber("/tmp/listener.sock", "logs/received/.../cdte1_pc.log")
+    >>> events.read_events() # [] until a frame is written
+    """
+
+    def __init__(self, listener_socket_path, log_path):
+        """
+        Parameters
+        ----------
+        listener_socket_path : `str`
+            Path to the Listener's Unix datagram socket.
+
+        log_path : `str`
+            The log file to get events for.
+
+        Raises
+        ------
+        OSError : if the Listener's socket can't be reached.
+        """
+        request = SUBSCRIBE + os.path.realpath(log_path).encode("utf-8")
+        self._dir = tempfile.mkdtemp(prefix="fogse-")
+        self.path = os.path.join(self._dir, "events.sock")
+        self.listener_socket_path = listener_socket_path
+        self._socket = socket.socket(socket.AF_UNIX, socket.SOCK_DGRAM)
+        try:
+            self._socket.bind(self.path)
+            self._socket.setblocking(False)
+            self._socket.sendto(request, listener_socket_path)
+        except OSError:
+            self._cleanup()
+            raise
+
+    def fileno(self):
+        """ File descriptor to wait on (e.g. with `QSocketNotifier`). """
+        return self._socket.fileno()
+
+    def read_events(self):
+        """ Return every `FrameEvent` received since the last call. """
+        events = []
+        while True:
+            try:
+                message = self._socket.recv(FRAME_EVENT.size)
+            except (BlockingIOError, OSError):
+                return events
+            if len(message) == FRAME_EVENT.size:
+                events.append(FrameEvent(*FRAME_EVENT.unpack(message)))
+
+    def close(self):
+        """ Unsubscribe from the Listener and remove the socket (again does nothing). """
+        if self._socket.fileno() == -1:
+            return
+        try:
+            self._socket.sendto(UNSUBSCRIBE, self.listener_socket_path)
+        except OSError:
+            pass
+        self._cleanup()
+
+    def __del__(self):
+        # the socket's temporary directory would otherwise be left behind
+        if hasattr(self, "_socket"):
+            self.close()
+
+    def _cleanup(self):
+        self._socket.close()
+        shutil.rmtree(self._dir, ignore_errors=True)
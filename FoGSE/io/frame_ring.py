@@ -0,0 +1,270 @@
+"""
+Latest-frame rings in shared memory, published by `listening.Listener`.
+
+For each log file whose readers only want the newest frames (see
+`listening.RING_DATA_TYPES`, by default the RTDs), the Listener keeps
+the last few frames it wrote in a `multiprocessing.shared_memory`
+segment, so readers in other processes (the GUI) can get them without
+reading the log file. Readers that collect every frame read the log
+instead. The log file stays the durable record.
+
+Segment layout (little-endian):
+    - `RING_HEADER`: magic, version, number of slots, frame length, a
+      "closed" flag, the time the ring was made (its generation) and
+      the number of frames published so far.
+    - `slots` slots, each a `SLOT_HEADER` (sequence number, receive
+      timestamp in nanoseconds, frame length and frame counter) followed
+      by the frame bytes.
+
+Each slot is guarded by a sequence lock: the writer makes the slot's
+sequence number odd, copies the frame in, then makes it even again. A
+reader copies the frame out and only keeps it if the sequence number was
+the same even value before and after. Frame `n` (counting from 0) always
+goes in slot `n % slots` with sequence number `2*(n//slots + 1)`, so
+readers can also tell when a slot has been overwritten by a newer frame.
+
+A Listener that restarts (or resumes a run) makes a new ring with the
+same name and removes the old one, which readers still attached to it
+would go on seeing. So a ring is flagged closed before it is removed,
+both by the Listener that made it and by one that finds it left behind,
+and readers check `FrameRingReader.closed` to know when to reattach.
+"""
+import collections
+import os
+import struct
+import time
+import zlib
+from multiprocessing import shared_memory
+
+# magic, version, slots, frame length, closed, generation, frames published
+RING_HEADER = struct.Struct("<4sIIII4xQQ")
+# offset of the "closed" flag in `RING_HEADER`
+_CLOSED_OFFSET = 16
+# sequence, timestamp_ns, frame length, frame counter
+SLOT_HEADER = struct.Struct("<QQIH2x")
+
+RING_MAGIC = b"FGRG"
+RING_VERSION = 2
+
+# slot headers (and the ring header) start on cache-line boundaries
+_ALIGN = 64
+_HEADER_SIZE = _ALIGN
+
+# rings created by this process (see `_attach()`)
+_created = set()
+
+RingFrame = collections.namedtuple("RingFrame", ["index", "counter", "timestamp_ns", "data"])
+
+def ring_name(log_path):
+    """
+    Return the shared memory name of the ring for the log file
+    `log_path`. Kept short for platforms that limit name length.
+    """
+    # the log itself may be a link to its current segment, so only its
+    # folder is resolved
+    folder, name = os.path.split(os.path.abspath(log_path))
+    path = os.path.join(os.path.realpath(folder), name)
+    return "fogse_{:08x}".format(zlib.crc32(path.encode("utf-8")))
+
+def _slot_stride(frame_len):
+    size = SLOT_HEADER.size + frame_len
+    return (size + _ALIGN - 1)//_ALIGN*_ALIGN
+
+class FrameRing:
+    """
+    Writes frames for one log file into a shared memory ring.
+
+    Used by `listening.LogFileManager` (from the `LogWriter` thread, once
+    a frame has been written). Only one process should write to a ring.
+    """
+
+    def __init__(self, log_path, frame_len: int, slots: int=4):
+        """
+        Parameters
+        ----------
+        log_path : `str`
+            The log file the frames are written to. Readers find the ring
+            from this path.
+
+        frame_len : `int`
+            Size of every frame in bytes.
+
+        slots : `int`
+            Number of frames to keep.
+
+        Raises
+        ------
+        ValueError : if `slots` is less than 1.
+        OSError : if the shared memory can't be created.
+        """
+        if slots < 1:
+            print("frame ring needs at least one slot")
+            raise ValueError
+        self.name = ring_name(log_path)
+        self.frame_len = frame_len
+        self.slots = slots
+        self._stride = _slot_stride(frame_len)
+        size = _HEADER_SIZE + slots*self._stride
+        try:
+            self._shm = shared_memory.SharedMemory(self.name, create=True, size=size)
+        except FileExistsError:
+            # left behind by a Listener that didn't exit cleanly
+            stale = shared_memory.SharedMemory(self.name)
+            _mark_closed(stale.buf)
+            stale.close()
+            stale.unlink()
+            self._shm = shared_memory.SharedMemory(self.name, create=True, size=size)
+        _created.add(self.name)
+        self._buf = self._shm.buf
+        self._buf[:size] = bytes(size)
+        self.published = 0
+        self.generation = time.time_ns()
+        RING_HEADER.pack_into(self._buf, 0, RING_MAGIC, RING_VERSION, slots, frame_len, 0,
+                              self.generation, 0)
+
+    def publish(self, data, counter: int):
+        """ Copy the frame `data` into the next slot. """
+        n = self.published
+        base = _HEADER_SIZE + (n % self.slots)*self._stride
+        sequence = 2*(n//self.slots + 1)
+        length = min(len(data), self.frame_len)
+
+        struct.pack_into("<Q", self._buf, base, sequence - 1)
+        start = base + SLOT_HEADER.size
+        self._buf[start:start + length] = memoryview(data)[:length]
+        SLOT_HEADER.pack_into(self._buf, base, sequence - 1, time.time_ns(), length, counter & 0xffff)
+        struct.pack_into("<Q", self._buf, base, sequence)
+
+        self.published = n + 1
+        struct.pack_into("<Q", self._buf, RING_HEADER.size - 8, self.published)
+
+    def close(self):
+        """ Flag the ring closed for its readers, then release and remove the shared memory. """
+        _mark_closed(self._buf)
+        self._buf = None
+        self._shm.close()
+        _created.discard(self.name)
+        try:
+            self._shm.unlink()
+        except FileNotFoundError:
+            pass
+
+class FrameRingReader:
+    """
+    Reads frames from the `FrameRing` for one log file.
+
+    Example
+    -------
+    >>> ring = FrameRingReader("logs/received/.../housekeeping_rtd.log")
+    >>> ring.latest() # newest frame, or None if nothing is published yet
+    >>> ring.frames_since(index) # frames published after frame `index`
+    """
+
+    def __init__(self, log_path):
+        """
+        Parameters
+        ----------
+        log_path : `str`
+            The log file whose ring to read.
+
+        Raises
+        ------
+        FileNotFoundError : if no ring exists for `log_path`.
+        ValueError : if the shared memory is not a frame ring.
+        """
+        self.name = ring_name(log_path)
+        self._shm = _attach(self.name)
+        self._buf = self._shm.buf
+        magic, version, self.slots, self.frame_len, _, self.generation, _ = RING_HEADER.unpack_from(self._buf, 0)
+        if magic != RING_MAGIC or version != RING_VERSION:
+            self.close()
+            print("shared memory", self.name, "is not a frame ring")
+            raise ValueError
+        self._stride = _slot_stride(self.frame_len)
+
+    @property
+    def closed(self):
+        """
+        True once the Listener has closed (or replaced) the ring. Make a
+        new `FrameRingReader` to read its replacement.
+        """
+        return struct.unpack_from("<I", self._buf, _CLOSED_OFFSET)[0] != 0
+
+    @property
+    def published(self):
+        """ Number of frames published to the ring so far. """
+        return struct.unpack_from("<Q", self._buf, RING_HEADER.size - 8)[0]
+
+    def read(self, n: int, retries: int=4):
+        """
+        Return frame `n` (counting from the first frame published) as a
+        `RingFrame`, or `None` if it hasn't been published yet or has
+        already been overwritten.
+        """
+        if n < 0 or n >= self.published:
+            return None
+        base = _HEADER_SIZE + (n % self.slots)*self._stride
+        expected = 2*(n//self.slots + 1)
+        for _ in range(retries):
+            before, timestamp_ns, length, counter = SLOT_HEADER.unpack_from(self._buf, base)
+            if before > expected:
+                return None
+            if before != expected:
+                continue
+            start = base + SLOT_HEADER.size
+            data = bytes(self._buf[start:start + length])
+            if struct.unpack_from("<Q", self._buf, base)[0] == before:
+                return RingFrame(n, counter, timestamp_ns, data)
+        return None
+
+    def latest(self):
+        """ Return the newest frame as a `RingFrame`, or `None`. """
+        for _ in range(self.slots):
+            frame = self.read(self.published - 1)
+            if frame is not None:
+                return frame
+        return None
+
+    def frames_since(self, index: int):
+        """
+        Return every frame still in the ring that was published after
+        frame `index`, oldest first. Pass -1 for every frame in the ring.
+        """
+        published = self.published
+        start = max(index + 1, published - self.slots)
+        frames = []
+        for n in range(start, published):
+            frame = self.read(n)
+            if frame is not None:
+                frames.append(frame)
+        return frames
+
+    def close(self):
+        """ Stop reading the ring (the ring itself is left in place). """
+        self._buf = None
+        self._shm.close()
+
+def _mark_closed(buf):
+    """ Flag the ring in `buf` closed, if it is a frame ring. """
+    if len(buf) >= RING_HEADER.size and bytes(buf[:4]) == RING_MAGIC:
+        struct.pack_into("<I", buf, _CLOSED_OFFSET, 1)
+
+def _attach(name):
+    """
+    Attach to existing shared memory without letting this process's
+    resource tracker remove it on exit (it belongs to the Listener).
+    """
+    try:
+        return shared_memory.SharedMemory(name, track=False)
+    except TypeError:
+        # Python < 3.13 has no `track` argument
+        shm = shared_memory.SharedMemory(name)
+        if name in _created:
+            # the ring's own registration is shared with this reader
+            return shm
+        try:
+            from multiprocessing import resource_tracker
+            resource_tracker.unregister(shm._name, "shared_memory")
+        except (ImportError, AttributeError):
+            pass
+        return shm
@@ -0,0 +1,45 @@
+"""
+Decode frames from the downlink logs into NumPy arrays of words, without
+copying.
+
+`frame_words()` gives a read-only `np.frombuffer` view onto the bytes
+read from a log (e.g. 32-bit little-endian words for the CdTe), so
+decoding a frame costs nothing however big it is. Parsers that walk a
+frame one word at a time are faster over Python `int`s than NumPy
+scalars, so they should take `word_list()` of the view, which converts
+the whole frame in one call.
+"""
+import numpy as np
+
+# the CdTe canisters send 32-bit little-endian words
+CDTE_WORD = np.dtype("<u4")
+
+def frame_words(data, dtype=CDTE_WORD):
+    """
+    View `data` as an array of words.
+
+    Parameters
+    ----------
+    data : `bytes`, `bytearray` or `memoryview`
+        Data read from a log. Any bytes after the last whole word are
+        left out.
+
+    dtype : `numpy.dtype` or `str`
+        The words' type, with explicit byte order (e.g. `"<u4"`).
+
+    Returns
+    -------
+    `numpy.ndarray` :
+        A view onto `data` (read-only if `data` is `bytes`).
+    """
+    dtype = np.dtype(dtype)
+    return np.frombuffer(data, dtype=dtype, count=len(data)//dtype.itemsize)
+
+def word_list(words):
+    """
+    Return `words` as a `list` of Python `int`s for the word-by-word
+    parsers. Lists are returned as they are.
+    """
+    if isinstance(words, np.ndarray):
+        return words.tolist()
+    return words
@@ -0,0 +1,81 @@
+"""
+Query the Listener's ingest statistics over its Unix datagram socket.
+
+Sending `STATS_REQUEST` to the Listener's socket (from a bound Unix
+datagram socket) gets a JSON reply holding, for each log file, the
+packets and bytes received (totals and per-second rates), frames
+completed and dumped, missing, out-of-order and duplicate packets. The
+reply also holds Listener-wide numbers: kernel drops on the downlink
+socket, packets sent to the catch log and the `LogWriter` queue state,
+and, for a `listening_sharded.ShardedListener`, the state of each worker.
+
+From a shell:
+    python -m FoGSE.io.ingest_stats /tmp/listener.sock
+"""
+import json
+import os
+import shutil
+import socket
+import sys
+import tempfile
+
+# control message understood by the Listener's Unix socket
+STATS_REQUEST = b"\x00\xe3"
+
+def request_stats(listener_socket_path, timeout: float=1.0):
+    """
+    Ask the Listener for its ingest statistics.
+
+    Parameters
+    ----------
+    listener_socket_path : `str`
+        Path to the Listener's Unix datagram socket.
+
+    timeout : `float`
+        Seconds to wait for the reply.
+
+    Returns
+    -------
+    `dict` :
+        The statistics (see `listening.Listener.get_stats()`).
+
+    Raises
+    ------
+    OSError : if the Listener's socket can't be reached or doesn't
+    reply in time.
+    """
+    tmp = tempfile.mkdtemp(prefix="fogse-")
+    sock = socket.socket(socket.AF_UNIX, socket.SOCK_DGRAM)
+    try:
+        sock.bind(os.path.join(tmp, "stats.sock"))
+        sock.settimeout(timeout)
+        sock.sendto(STATS_REQUEST, listener_socket_path)
+        reply = sock.recv(1 << 16)
+    finally:
+        sock.close()
+        shutil.rmtree(tmp, ignore_errors=True)
+    return json.loads(reply.decode("utf-8"))
+
+def format_stats(stats):
+    """ Lay out the output of `request_stats()` as a text table. """
+    columns = ["packets_per_s", "bytes_per_s", "frames_completed", "frames_dumped",
+               "missing_packets", "out_of_order", "duplicates"]
+    lines = ["{:<20}".format("log") + "".join("{:>17}".format(c) for c in columns)]
+    for name, log in sorted(stats["logs"].items()):
+        lines.append("{:<20}".format(name) + "".join("{:>17.6g}".format(log[c]) for c in columns))
+    listener = stats["listener"]
+    lines.append("kernel drops: {}, catch packets: {}, writer depth: {}/{} (high-water {}, dropped {})".format(
+        listener["kernel_drops"], listener["catch_packets"], listener["writer"]["depth"],
+        listener["writer"]["max_frames"], listener["writer"]["high_water"], listener["writer"]["dropped"]))
+    # workers of a `listening_sharded.ShardedListener`
+    for shard in listener.get("shards", []):
+        lines.append("shard {} (pid {}, {}): {}, forwarded {}, kernel drops {}, writer dropped {}".format(
+            shard["index"], shard["pid"], ", ".join(shard["systems"]), shard["state"],
+            shard["forwarded"], shard["kernel_drops"], shard["writer_dropped"]))
+    return "\n".join(lines)
+
+if __name__ == "__main__":
+    if len(sys.argv) != 2:
+        print("usage: python -m FoGSE.io.ingest_stats <listener unix socket>")
+        sys.exit(1)
+    print(format_stats(request_stats(sys.argv[1])))
@@ -0,0 +1,139 @@
+"""
+Read and write the per-frame index files that sit next to downlink logs.
+
+For every frame `listening.LogFileManager` writes to `<system>_<type>.log`
+(or to `dump/<system>_<type>.log`), it appends one fixed-size record to
+`<system>_<type>.idx`. Each record holds:
+    - the frame's byte offset in the file it was written to,
+    - the receive timestamp (nanoseconds since the Unix epoch),
+    - the frame counter,
+    - the number of packets missing from the frame,
+    - where the frame went (`DEST_LOG` or `DEST_DUMP`).
+
+Because records are fixed width, record N is found in O(1), and because
+they are written in time order, the frame nearest a time is found by
+binary search.
+"""
+import collections
+import os
+import struct
+
+# offset, timestamp_ns, frame counter, missing packets, destination
+INDEX_RECORD = struct.Struct("<QQHHB3x")
+
+DEST_LOG = 0
+DEST_DUMP = 1
+
+IndexRecord = collections.namedtuple("IndexRecord",
+                                     ["offset", "timestamp_ns", "counter", "missing", "destination"])
+
+def index_path(log_path):
+    """ Return the index file path that belongs to the log file `log_path`. """
+    root, _ = os.path.splitext(log_path)
+    return root + ".idx"
+
+def pack_record(offset, timestamp_ns, counter, missing, destination):
+    """ Pack one index record into bytes. """
+    return INDEX_RECORD.pack(offset, timestamp_ns, counter, missing, destination)
+
+class LogIndex:
+    """
+    Random access to the records in a `.idx` file.
+
+    Example
+    -------
+    >>> idx = LogIndex("cdte1_pc.idx")
+    >>> idx.record(10).offset # where the 11th frame starts
+    >>> idx.nearest_time(1_700_000_000_000_000_000) # frame closest to a time
+    """
+
+    def __init__(self, filepath):
+        """
+        Parameters
+        ----------
+        filepath : `str`
+            Path to the `.idx` file (or to its `.log` file).
+        """
+        if filepath.endswith(".log"):
+            filepath = index_path(filepath)
+        self.filepath = filepath
+        self._data = b""
+        self.refresh()
+
+    def refresh(self):
+        """ Re-read the index file to pick up newly appended records. """
+        try:
+            with open(self.filepath, "rb") as f:
+                data = f.read()
+        except FileNotFoundError:
+            data = b""
+        # ignore a partially written trailing record
+        self._data = data[:len(data) - len(data)%INDEX_RECORD.size]
+
+    def __len__(self):
+        return len(self._data)//INDEX_RECORD.size
+
+    def record(self, n):
+        """
+        Return record `n` (negative values count from the end) as an
+        `IndexRecord`.
+        """
+        if n < 0:
+            n += len(self)
+        if n < 0 or n >= len(self):
+            raise IndexError("index record out of range")
+        return IndexRecord(*INDEX_RECORD.unpack_from(self._data, n*INDEX_RECORD.size))
+
+    def records(self, destination=None):
+        """
+        Return every record in the index, optionally only those with the
+        given `destination` (`DEST_LOG` or `DEST_DUMP`).
+        """
+        out = [IndexRecord(*r) for r in INDEX_RECORD.iter_unpack(self._data)]
+        if destination is None:
+            return out
+        return [r for r in out if r.destination==destination]
+
+    def nearest_time(self, timestamp_ns, destination=DEST_LOG):
+        """
+        Find the record with the timestamp closest to `timestamp_ns`.
+
+        Parameters
+        ----------
+        timestamp_ns : `int`
+            Time of interest, in nanoseconds since the Unix epoch.
+
+        destination : `int` or `None`
+            Only consider frames written to this destination. `None`
+            considers all frames.
+
+        Returns
+        -------
+        `IndexRecord` or `None` :
+            The closest record, or `None` if there are no matching
+            records.
+        """
+        # binary search for the first record at or after `timestamp_ns`
+        lo, hi = 0, len(self)
+        while lo < hi:
+            mid = (lo + hi)//2
+            if self.record(mid).timestamp_ns < timestamp_ns:
+                lo = mid + 1
+            else:
+                hi = mid
+
+        # then look either side for the closest matching destination
+        before, after = lo - 1, lo
+        while before >= 0 and destination is not None and self.record(before).destination!=destination:
+            before -= 1
+        while after < len(self) and destination is not None and self.record(after).destination!=destination:
+            after += 1
+
+        candidates = []
+        if before >= 0:
+            candidates.append(self.record(before))
+        if after < len(self):
+            candidates.append(self.record(after))
+        if len(candidates)==0:
+            return None
+        return min(candidates, key=lambda r: abs(r.timestamp_ns - timestamp_ns))
@@ -0,0 +1,190 @@
+"""
+Segmented downlink logs: numbered segment files, a manifest, and reading
+the segments back as one continuous stream.
+
+If a data type sets `segment_bytes` or `segment_s` in systems.json,
+`listening.LogFileManager` writes its log as a series of segments,
+starting a new one (on a frame boundary) once the current one would
+pass `segment_bytes`, or has been open for `segment_s` seconds:
+    - `<system>_<type>_00000.log`, `<system>_<type>_00001.log`, ...: the
+      segments, which concatenate to the frames of the whole run,
+    - `<system>_<type>.manifest`: JSON listing each segment's file name,
+      its offset in the stream, creation time and (once it is closed)
+      length,
+    - `<system>_<type>.log`: a symbolic link to the segment being
+      written, so readers of the newest frames work unchanged.
+Offsets in the `.idx` file and in frame events are offsets in the whole
+stream, not in a segment.
+
+Space for a log can also be reserved ahead of the data, `preallocate_bytes`
+at a time, with `preallocate()`. This uses Linux `fallocate()` with
+`FALLOC_FL_KEEP_SIZE` rather than `posix_fallocate()`: the file's size
+stays at the end of the data written, so readers of the end of the log
+don't see zeros. Reserved space past the data is given back when the
+file (or segment) is closed.
+
+`LogSegments` reads a log the same way whether or not it is segmented.
+"""
+import ctypes
+import ctypes.util
+import json
+import os
+
+MANIFEST_VERSION = 1
+
+# from linux/falloc.h
+FALLOC_FL_KEEP_SIZE = 0x01
+
+try:
+    _fallocate = ctypes.CDLL(ctypes.util.find_library("c"), use_errno=True).fallocate
+    _fallocate.argtypes = [ctypes.c_int, ctypes.c_int, ctypes.c_int64, ctypes.c_int64]
+    _fallocate.restype = ctypes.c_int
+except (OSError, AttributeError, TypeError):
+    # not Linux (or no C library found): no preallocation
+    _fallocate = None
+
+def preallocate(fd: int, offset: int, length: int):
+    """
+    Reserve `length` bytes of disk space from `offset` in the open file
+    `fd`, without changing the file's size.
+
+    Returns
+    -------
+    `bool` :
+        `True` if the space was reserved, `False` if the platform or
+        filesystem doesn't support it.
+    """
+    if _fallocate is None:
+        return False
+    return _fallocate(fd, FALLOC_FL_KEEP_SIZE, offset, length) == 0
+
+def segment_name(log_path, segment: int):
+    """ Return the file name of segment number `segment` of the log `log_path`. """
+    root, ext = os.path.splitext(os.path.basename(log_path))
+    return root + "_{:05d}".format(segment) + ext
+
+def manifest_path(log_path):
+    """ Return the manifest path that belongs to the log `log_path`. """
+    root, _ = os.path.splitext(log_path)
+    return root + ".manifest"
+
+def write_manifest(log_path, frame_len: int, segments: list):
+    """
+    (Re)write the manifest of the log `log_path`, replacing the old one
+    in a single step so readers never see a partial manifest.
+
+    Parameters
+    ----------
+    log_path : `str`
+        The log file (the link to the current segment).
+
+    frame_len : `int`
+        Size of every frame in the log.
+
+    segments : `list`
+        A `dict` per segment, oldest first, with `"file"` (name, in the
+        log's folder), `"offset"` (of its first byte in the stream),
+        `"start_ns"` (creation time, nanoseconds since the Unix epoch)
+        and, once closed, `"bytes"`.
+    """
+    path = manifest_path(log_path)
+    manifest = {
+        "version": MANIFEST_VERSION,
+        "log": os.path.basename(log_path),
+        "frame_len": frame_len,
+        "segments": segments
+    }
+    with open(path + ".tmp", "w") as f:
+        json.dump(manifest, f)
+    os.replace(path + ".tmp", path)
+
+def point_link(log_path, target: str):
+    """
+    Make `log_path` a symbolic link to `target` (a file name in the same
+    folder), replacing any existing file or link in a single step.
+
+    Returns
+    -------
+    `bool` :
+        `True` if the link was made.
+    """
+    tmp = log_path + ".tmp"
+    try:
+        if os.path.lexists(tmp):
+            os.remove(tmp)
+        os.symlink(target, tmp)
+        os.replace(tmp, log_path)
+    except OSError as e:
+        print("couldn't link", log_path, "to", target, ":", e)
+        return False
+    return True
+
+class LogSegments:
+    """
+    A log file, segmented or not, as one continuous stream.
+
+    Example
+    -------
+    >>> log = LogSegments("logs/received/.../cmos1_pc.log")
+    >>> log.size() # bytes in the whole stream
+    >>> log.read(offset, length) # bytes, across segment boundaries
+    """
+
+    def __init__(self, log_path):
+        """
+        Parameters
+        ----------
+        log_path : `str`
+            The log file (for a segmented log, the link to the current
+            segment). Its manifest is read if there is one.
+        """
+        self.log_path = log_path
+        self.refresh()
+
+    def refresh(self):
+        """ Re-read the manifest, to pick up new segments. """
+        folder = os.path.dirname(self.log_path)
+        self.frame_len = None
+        try:
+            with open(manifest_path(self.log_path), "r") as f:
+                manifest = json.load(f)
+        except FileNotFoundError:
+            self.segmented = False
+            self.segments = [(self.log_path, 0, None)]
+            return
+        self.segmented = True
+        self.frame_len = manifest.get("frame_len")
+        # (path, stream offset, length if closed):
+        self.segments = [(os.path.join(folder, s["file"]), s["offset"], s.get("bytes"))
+                         for s in manifest["segments"]]
+
+    def _length(self, segment):
+        path, _, length = segment
+        if length is not None:
+            return length
+        try:
+            return os.path.getsize(path)
+        except FileNotFoundError:
+            return 0
+
+    def size(self):
+        """ Number of bytes in the stream so far. """
+        _, offset, _ = self.segments[-1]
+        return offset + self._length(self.segments[-1])
+
+    def read(self, offset: int, length: int):
+        """
+        Return up to `length` bytes of the stream from `offset` (fewer if
+        the stream ends first).
+        """
+        chunks = []
+        end = offset + length
+        for segment in self.segments:
+            path, start, _ = segment
+            stop = start + self._length(segment)
+            if stop <= offset or start >= end:
+                continue
+            with open(path, "rb") as f:
+                f.seek(max(offset, start) - start)
+                chunks.append(f.read(min(end, stop) - max(offset, start)))
+        return b"".join(chunks)
@@ -0,0 +1,89 @@
+"""
+Read the frames appended to a growing log file, in order, without
+re-reading what has already been read.
+
+A `LogTail` remembers the offset (in the log's stream, see
+`FoGSE.io.log_segments`) of the first frame it hasn't returned yet. Each
+`read_new()` reads only the complete frames written since then (from a
+`FoGSE.io.log_view.LogView`), so every frame is returned exactly once,
+however far the writer has got ahead of the reader, and nothing is read
+when the log hasn't grown.
+"""
+from FoGSE.io.log_view import LogView
+
+class LogTail:
+    """
+    Follows a log file of fixed-size frames as it grows.
+
+    Example
+    -------
+    >>> tail = LogTail("logs/received/.../cdte1_pc.log", 0x800c)
+    >>> tail.read_new() # the newest complete frame
+    >>> tail.read_new() # every frame completed since the last call
+    """
+
+    def __init__(self, log_path, frame_len: int, from_start: bool=False):
+        """
+        Parameters
+        ----------
+        log_path : `str`
+            The log file (segmented or not). It need not exist yet.
+
+        frame_len : `int`
+            Size of every frame in the log.
+
+        from_start : `bool`
+            Start with the first frame in the log, rather than the
+            newest one.
+        """
+        if frame_len < 1:
+            print("frame length must be at least 1 byte")
+            raise ValueError
+        self.log_path = log_path
+        self.frame_len = frame_len
+        self.from_start = from_start
+        # stream offset of the next frame to return (set on the first read):
+        self.offset = None
+        # complete frames left unread by the last `read_new()` (because
+        # of its `max_frames`)
+        self.frames_behind = 0
+        self._view = LogView(log_path, frame_len)
+
+    def complete_bytes(self):
+        """ Length of the log, up to the end of its last complete frame. """
+        # picks up new segments, and a log that has become segmented
+        size = self._view.refresh()
+        return size - size % self.frame_len
+
+    def read_new(self, max_frames: int=None):
+        """
+        Return the complete frames written since the last call, oldest
+        first. The first call returns the newest frame (or, if the log
+        is empty or doesn't exist yet, nothing, and later calls return
+        every frame from the start).
+
+        Parameters
+        ----------
+        max_frames : `int`
+            Return at most this many frames; the rest are returned by
+            later calls. `None` for no limit.
+
+        Returns
+        -------
+        `list` :
+            The frames, as `bytes`.
+        """
+        complete = self.complete_bytes()
+        if self.offset is None or complete < self.offset:
+            # first read, or the log was replaced or cut back
+            self.offset = 0 if self.from_start and self.offset is None else max(complete - self.frame_len, 0)
+        available = (complete - self.offset)//self.frame_len
+        count = available if max_frames is None else min(available, max_frames)
+        if count <= 0:
+            self.frames_behind = 0
+            return []
+        data = self._view.read(self.offset, count*self.frame_len)
+        count = len(data)//self.frame_len
+        self.offset += count*self.frame_len
+        self.frames_behind = available - count
+        return [data[k*self.frame_len:(k + 1)*self.frame_len] for k in range(count)]
@@ -0,0 +1,209 @@
+"""
+Memory-mapped, read-only access to the frames in a growing downlink log.
+
+A `LogView` maps each file of a log (each segment, if it is segmented,
+see `FoGSE.io.log_segments`) into memory, and gives frame N, or the
+last K frames, as NumPy arrays that are views onto the mapping: nothing
+is read or copied until the array is used, and every reader of a log
+(the GUI's readers, playback, offline tools) shares the same page cache
+pages. `refresh()` picks up frames written since the last call; a file
+is only remapped when it has grown (or shrunk).
+
+Offsets are offsets in the whole stream, as in the `.idx` files (see
+`FoGSE.io.log_index`), so `view.read(record.offset, view.frame_len)`
+gives the frame an index record describes.
+
+The writer only ever appends, except that resuming a run (see
+`listening.LogFileManager`) cuts a torn frame off the end of the log.
+Only complete frames are given out, and a file that has shrunk is
+remapped on the next `refresh()`, so arrays never point past the end of
+a file.
+"""
+import mmap
+import os
+
+import numpy as np
+
+from FoGSE.io.log_segments import LogSegments
+
+class LogView:
+    """
+    A log file of fixed-size frames, memory-mapped.
+
+    Example
+    -------
+    >>> view = LogView("logs/received/.../cdte1_pc.log", 0x800c, "<u4")
+    >>> len(view) # complete frames in the log
+    >>> view.frame(-1) # the newest frame, as 32-bit words
+    >>> view.last(10) # the last 10 frames, one per row
+    """
+
+    def __init__(self, log_path, frame_len: int, dtype="u1"):
+        """
+        Parameters
+        ----------
+        log_path : `str`
+            The log file (segmented or not). It need not exist yet.
+
+        frame_len : `int`
+            Size of every frame in the log, in bytes.
+
+        dtype : `numpy.dtype` or `str`
+            The type of the frames' elements, with explicit byte order
+            for multi-byte types (e.g. `"<u4"`). Default is bytes.
+        """
+        self.dtype = np.dtype(dtype)
+        if frame_len < 1 or frame_len%self.dtype.itemsize != 0:
+            print("frame length must be a whole number of", self.dtype, "elements")
+            raise ValueError
+        self.log_path = log_path
+        self.frame_len = frame_len
+        self._log = LogSegments(log_path)
+        # path -> mapping of the file, for every file mapped
+        self._maps = {}
+        # (stream offset, length, mapping or `None`) per file, oldest first
+        self._files = []
+        self._size = 0
+        self.exists = False
+        self.refresh()
+
+    def _map(self, path, length):
+        """
+        Return a mapping of the first `length` bytes of `path`, reusing
+        the current one if it is the same length.
+        """
+        mapping = self._maps.get(path)
+        if mapping is not None and len(mapping)==length:
+            return mapping
+        # arrays handed out keep the old mapping alive until they go
+        self._maps.pop(path, None)
+        if length==0:
+            return None
+        with open(path, "rb") as f:
+            mapping = mmap.mmap(f.fileno(), length, access=mmap.ACCESS_READ)
+        self._maps[path] = mapping
+        return mapping
+
+    def refresh(self):
+        """
+        Pick up data (and segments) written since the last call.
+
+        Returns
+        -------
+        `int` :
+            The number of bytes in the log.
+        """
+        self._log.refresh()
+        self.exists = self._log.segmented
+        files = []
+        for path, offset, length in self._log.segments:
+            if length is None:
+                # the file being written
+                try:
+                    length = os.path.getsize(path)
+                    self.exists = True
+                except FileNotFoundError:
+                    length = 0
+            try:
+                files.append((offset, length, self._map(path, length)))
+            except FileNotFoundError:
+                files.append((offset, 0, None))
+        paths = {path for path, _, _ in self._log.segments}
+        for path in list(self._maps):
+            if path not in paths:
+                del self._maps[path]
+        self._files = files
+        _, offset, _ = self._log.segments[-1]
+        self._size = offset + files[-1][1]
+        return self._size
+
+    def size(self):
+        """ Number of bytes in the log, as of the last `refresh()`. """
+        return self._size
+
+    def __len__(self):
+        """ Number of complete frames in the log, as of the last `refresh()`. """
+        return self._size//self.frame_len
+
+    def _file_at(self, offset):
+        """ Return the file holding stream offset `offset`. """
+        for start, length, mapping in reversed(self._files):
+            if start <= offset:
+                return start, length, mapping
+        return self._files[0]
+
+    def frames(self, start: int, stop: int):
+        """
+        Return frames `start` up to (not including) `stop` as a 2D
+        array, one frame per row. The array is a view onto the log if
+        the frames are all in one file, and a copy if they cross files.
+        """
+        count = max(min(stop, len(self)) - start, 0)
+        shape = (count, self.frame_len//self.dtype.itemsize)
+        if start < 0 or count==0:
+            return np.empty((0, shape[1]), dtype=self.dtype)
+        offset = start*self.frame_len
+        file_start, length, mapping = self._file_at(offset)
+        if mapping is not None and offset + count*self.frame_len <= file_start + length:
+            return np.frombuffer(mapping, dtype=self.dtype, count=shape[0]*shape[1],
+                                 offset=offset - file_start).reshape(shape)
+        return np.frombuffer(self.read(offset, count*self.frame_len), dtype=self.dtype).reshape(shape)
+
+    def frame(self, n: int):
+        """
+        Return frame `n` (negative values count from the end) as a 1D
+        array.
+
+        Raises
+        ------
+        IndexError : if there is no complete frame `n`.
+        """
+        if n < 0:
+            n += len(self)
+        if n < 0 or n >= len(self):
+            raise IndexError("frame out of range")
+        return self.frames(n, n + 1)[0]
+
+    def last(self, k: int=1):
+        """ Return the last `k` complete frames (fewer if there aren't `k`) as a 2D array. """
+        return self.frames(max(len(self) - k, 0), len(self))
+
+    def read(self, offset: int, length: int):
+        """
+        Return up to `length` bytes of the log from stream offset
+        `offset` (fewer if the log ends first), as `bytes`.
+        """
+        chunks = []
+        end = min(offset + length, self._size)
+        for start, file_length, mapping in self._files:
+            stop = start + file_length
+            if mapping is None or stop <= offset or start >= end:
+                continue
+            chunks.append(mapping[max(offset, start) - start:min(end, stop) - start])
+        return b"".join(chunks)
+
+    def tail(self, nbytes: int):
+        """
+        Return the last `nbytes` of the log, or all of it if `nbytes` is
+        less than 1 or more than the log holds.
+
+        Raises
+        ------
+        FileNotFoundError : if the log doesn't exist.
+        """
+        if not self.exists:
+            raise FileNotFoundError(self.log_path)
+        if nbytes < 1 or nbytes > self._size:
+            return self.read(0, self._size)
+        return self.read(self._size - nbytes, nbytes)
+
+    def close(self):
+        """ Unmap the log (mappings still used by arrays go when the arrays do). """
+        for mapping in self._maps.values():
+            try:
+                mapping.close()
+            except BufferError:
+                pass
+        self._maps = {}
+        self._files = [(0, 0, None)]
+        self._size = 0
@@ -5,17 +5,54 @@ import datetime
 import os
 import re
 
-import numpy as np
-
 FILE_DIR = os.path.dirname(os.path.realpath(__file__))
 
+RUN_FOLDER_PATTERN = r"\d+\-\d+\-\d+\_\d+\-\d+\-\d+"
+RUN_FOLDER_FORMAT = "%d-%m-%Y_%H-%M-%S"
+
+def run_folder_name(now):
+    """
+    Return the run folder name for a run started at `now` (a
+    `datetime`), e.g. `"17-10-2026_1-45-4"`.
+    """
+    return str(now.day) + "-" + str(now.month) + "-" + str(now.year) + \
+        "_" + str(now.hour) + "-" + str(now.minute) + \
+        "-" + str(now.second)
+
+def run_folder_time(name):
+    """
+    Return the start time encoded in the run folder name `name` (e.g.
+    `"17-10-2026_1-45-4"`) as a `datetime`, or `None` if it isn't one.
+    """
+    try:
+        return datetime.datetime.strptime(name, RUN_FOLDER_FORMAT)
+    except ValueError:
+        return None
+
+def newest_run_folder(log_folder):
+    """
+    Return the name of the newest run folder in `log_folder`, or `None`
+    if there is none.
+    """
+    try:
+        names = os.listdir(log_folder)
+    except FileNotFoundError:
+        return None
+    _folders = [re.findall(RUN_FOLDER_PATTERN, f) for f in names]
+    _time_folders = [tf[0] for tf in _folders if len(tf)==1]
+    runs = [(run_folder_time(ts), ts) for ts in _time_folders]
+    runs = [run for run in runs if run[0] is not None]
+    if len(runs) == 0:
+        return None
+    return max(runs)[1]
+
 def newest_data_dir():
     """ Return the directory of the newest folder containg data. """
     _log_files = FILE_DIR+"/../../logs/received/"
 
-    _folders = [re.findall("\d+\-\d+\-\d+\_\d+\-\d+\-\d+", f) for f in os.listdir(_log_files)]
-    _time_folders = [tf[0] for tf in _folders if len(tf)==1]
-    
-    dts = [datetime.datetime.strptime(ts, "%d-%m-%Y_%H-%M-%S") for ts in _time_folders]
+    newest = newest_run_folder(_log_files)
+    if newest is None:
+        print("no run folders in", _log_files)
+        raise ValueError
 
-    return _log_files+_time_folders[np.argmax(dts)]
\ No newline at end of file
+    return _log_files+newest
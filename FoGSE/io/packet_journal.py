@@ -0,0 +1,297 @@
+"""
+Raw packet journal: every downlink datagram, as received, with its
+arrival time.
+
+When journaling is enabled, `listening.Listener` appends each datagram
+it receives (before reassembly, including ones sent to the catch log)
+to a `PacketJournal`. Records are packed straight into a preallocated
+buffer and written in batches, through the Listener's `LogWriter`
+thread when one is given, so the receive loop neither allocates nor
+makes a write call per packet. Buffers are reused once written.
+Datagrams read with `receive()` share one arrival time per batch of
+reads (taken by `stamp()`, which the Listener calls once per wakeup),
+so the clock isn't read per packet either. The journal is split into
+segments of about `segment_bytes` each:
+`journal/journal_00000.bin`, `journal/journal_00001.bin`, ...
+
+Each segment holds:
+    - `JOURNAL_HEADER`: magic, version, segment number and creation
+      time (nanoseconds since the Unix epoch),
+    - one record per datagram: `JOURNAL_RECORD` (arrival time in
+      nanoseconds since the Unix epoch, datagram length) followed by the
+      raw datagram.
+
+Journaling is off unless the systems.json asks for it, as it is not
+free: `tests/network/benchmark_journal.py` measured the Listener's
+receive throughput about 10 % lower with it on (about 1.3 us more CPU
+per packet, on top of about 8 us), mostly in writing every datagram a
+second time.
+
+`read_journal()` iterates over the records of a journal (or of one
+segment) in order. See `FoGSE.reassemble_journal` to rebuild log files
+from a journal.
+"""
+import collections
+import glob
+import os
+import struct
+import time
+
+# magic, version, segment number, creation time (ns since the Unix epoch)
+JOURNAL_HEADER = struct.Struct("<4sIIQ")
+# arrival time (ns since the Unix epoch), datagram length
+JOURNAL_RECORD = struct.Struct("<QH")
+
+JOURNAL_MAGIC = b"FGPJ"
+JOURNAL_VERSION = 1
+
+DEFAULT_SEGMENT_BYTES = 256*1024*1024
+DEFAULT_BATCH_BYTES = 1024*1024
+# longest datagram a record can hold (its length is 16 bits)
+MAX_RECORD_DATA = 0xffff
+
+# (looked up once, for the per-datagram calls)
+_pack_record = JOURNAL_RECORD.pack_into
+_RECORD_SIZE = JOURNAL_RECORD.size
+_time_ns = time.time_ns
+
+JournalRecord = collections.namedtuple("JournalRecord", ["timestamp_ns", "data"])
+
+def segment_path(folder, segment: int):
+    """ Return the path of journal segment number `segment` in `folder`. """
+    return os.path.join(folder, "journal_{:05d}.bin".format(segment))
+
+class PacketJournal:
+    """
+    Appends datagrams to a segmented journal in `folder`.
+
+    `append()` or `receive()` is meant to be called from the receive
+    loop, with `stamp()` called before each batch of `receive()`s; `flush()`
+    should be called periodically (the Listener does so once a second)
+    so quiet periods still reach the disk.
+    """
+
+    def __init__(self, folder, writer=None, segment_bytes: int=DEFAULT_SEGMENT_BYTES,
+                 batch_bytes: int=DEFAULT_BATCH_BYTES):
+        """
+        Parameters
+        ----------
+        folder : `str`
+            Folder for the journal segments. Created if needed. If it
+            already holds segments (e.g. the Listener is resuming a
+            run), new segments are numbered after them.
+
+        writer : `listening.LogWriter`
+            Optional writer thread to hand batches to. If `None`,
+            batches are written in the calling thread.
+
+        segment_bytes : `int`
+            A new segment is started once a segment holds this many
+            bytes.
+
+        batch_bytes : `int`
+            Records are written once this many bytes are waiting.
+
+        Raises
+        ------
+        OSError : if the folder or first segment can't be created.
+        """
+        self.folder = folder
+        self.writer = writer
+        self.segment_bytes = segment_bytes
+        self.batch_bytes = batch_bytes
+        self.packets = 0
+        self.dropped_bytes = 0
+        # arrival time of the datagrams read by `receive()`
+        self.timestamp_ns = time.time_ns()
+        # written batch buffers, ready for reuse (released from the
+        # writer thread)
+        self._free = collections.deque()
+        self._batch = self._take_buffer()
+        self._view = memoryview(self._batch)
+        self._length = 0
+        os.makedirs(folder, exist_ok=True)
+        self.segment = -1
+        existing = journal_segments(folder)
+        if len(existing) > 0:
+            self.segment = int(os.path.basename(existing[-1])[len("journal_"):-len(".bin")])
+        self._open_segment()
+
+    def _open_segment(self):
+        self.segment += 1
+        self.file = open(segment_path(self.folder, self.segment), "wb")
+        self._segment_written = 0
+        JOURNAL_HEADER.pack_into(self._batch, self._length, JOURNAL_MAGIC, JOURNAL_VERSION,
+                                 self.segment, time.time_ns())
+        self._length += JOURNAL_HEADER.size
+
+    def _take_buffer(self):
+        """ Return a batch buffer, reusing a written one if possible. """
+        try:
+            return self._free.pop()
+        except IndexError:
+            # room for a whole batch plus the record that fills it
+            return bytearray(self.batch_bytes + JOURNAL_HEADER.size + JOURNAL_RECORD.size + MAX_RECORD_DATA)
+
+    def stamp(self):
+        """
+        Take the arrival time for the datagrams `receive()` reads next:
+        the current time, in nanoseconds since the Unix epoch (also
+        returned).
+        """
+        self.timestamp_ns = _time_ns()
+        return self.timestamp_ns
+
+    def append(self, data, timestamp_ns: int=None):
+        """
+        Add one datagram (any bytes-like object), stamped with
+        `timestamp_ns` (nanoseconds since the Unix epoch), or the
+        current time if it is `None`.
+        """
+        offset = self._length
+        start = offset + _RECORD_SIZE
+        end = start + len(data)
+        if timestamp_ns is None:
+            timestamp_ns = _time_ns()
+        _pack_record(self._batch, offset, timestamp_ns, len(data))
+        self._batch[start:end] = data
+        self._length = end
+        self.packets += 1
+        if end >= self.batch_bytes:
+            self.flush()
+
+    def receive(self, sock, max_bytes: int=MAX_RECORD_DATA):
+        """
+        Receive one datagram from `sock` straight into the journal
+        (saving `append()`'s copy), stamped with the time taken by the
+        last `stamp()`.
+
+        Parameters
+        ----------
+        sock : `socket.socket`
+            The socket to read.
+
+        max_bytes : `int`
+            Longest datagram to read (longer ones are cut short, as by
+            `recv_into()`). At most `MAX_RECORD_DATA`.
+
+        Returns
+        -------
+        `memoryview` :
+            The datagram. It stays valid until the next `append()`,
+            `receive()` or `flush()`.
+
+        Raises
+        ------
+        Whatever `sock.recv_into()` raises, e.g. `BlockingIOError` if
+        no datagram is waiting on a non-blocking socket.
+        """
+        offset = self._length
+        start = offset + _RECORD_SIZE
+        view = self._view
+        nbytes = sock.recv_into(view[start:], max_bytes)
+        end = start + nbytes
+        _pack_record(self._batch, offset, self.timestamp_ns, nbytes)
+        self._length = end
+        self.packets += 1
+        if end >= self.batch_bytes:
+            self.flush()
+        return view[start:end]
+
+    def flush(self, last: bool=False):
+        """
+        Hand the waiting records to be written, and move on to a new
+        segment if this one is full.
+
+        Parameters
+        ----------
+        last : `bool`
+            Close the current segment after this write, without opening
+            another (used by `close()`).
+        """
+        batch, length = self._batch, self._length
+        file = self.file
+        if length == 0:
+            if last:
+                # nothing to write, just close the segment (after any
+                # writes still queued for it)
+                if self.writer is None:
+                    file.close()
+                else:
+                    self.writer.close_file(file)
+            return
+        self._segment_written += length
+        roll = last or self._segment_written >= self.segment_bytes
+        self._batch, self._length = self._take_buffer(), 0
+        self._view = memoryview(self._batch)
+        free = self._free
+
+        def release():
+            free.append(batch)
+            if roll:
+                file.close()
+
+        self._write(file, memoryview(batch)[:length], release)
+        if roll and not last:
+            self._open_segment()
+
+    def _write(self, file, data, release):
+        if self.writer is None:
+            file.write(data)
+            file.flush()
+            release()
+        elif not self.writer.submit(file, data, release=release):
+            # (the writer calls `release` itself when it drops data)
+            self.dropped_bytes += len(data)
+            print("writer queue full, dropped", len(data), "journal bytes")
+
+    def close(self):
+        """ Write out any waiting records and close the last segment. """
+        self.flush(last=True)
+
+def journal_segments(path):
+    """
+    Return the segment files of the journal at `path` (a journal folder
+    or a single segment), in order.
+    """
+    if os.path.isdir(path):
+        return sorted(glob.glob(os.path.join(path, "journal_*.bin")))
+    return [path]
+
+def read_journal(path):
+    """
+    Iterate over the records of a journal.
+
+    Parameters
+    ----------
+    path : `str`
+        A journal folder, or a single segment.
+
+    Yields
+    ------
+    `JournalRecord` :
+        Each datagram and its arrival time, in the order received. A
+        partially written record at the end of a segment is skipped.
+
+    Raises
+    ------
+    ValueError : if a file is not a journal segment.
+    """
+    for segment in journal_segments(path):
+        with open(segment, "rb", buffering=1 << 20) as f:
+            header = f.read(JOURNAL_HEADER.size)
+            if len(header) == 0:
+                # created, but nothing written before the Listener stopped
+                continue
+            if len(header) < JOURNAL_HEADER.size or header[:len(JOURNAL_MAGIC)] != JOURNAL_MAGIC:
+                print(segment, "is not a packet journal segment")
+                raise ValueError
+            while True:
+                head = f.read(JOURNAL_RECORD.size)
+                if len(head) < JOURNAL_RECORD.size:
+                    break
+                timestamp_ns, length = JOURNAL_RECORD.unpack(head)
+                data = f.read(length)
+                if len(data) < length:
+                    break
+                yield JournalRecord(timestamp_ns, data)
@@ -7,9 +7,20 @@ import queue
 import math
 import time
 import struct
+import selectors
+import threading
+import collections
 from datetime import datetime
 
 from FoGSE.utils import get_system_dict, get_ring_buffer_interface
+from FoGSE.io.log_index import index_path, pack_record, INDEX_RECORD, DEST_LOG, DEST_DUMP
+from FoGSE.io.frame_events import FrameEventPublisher, SUBSCRIBE, UNSUBSCRIBE
+from FoGSE.io.frame_ring import FrameRing
+from FoGSE.io.ingest_stats import STATS_REQUEST
+from FoGSE.io.catch_log import CatchLogWriter
+from FoGSE.io.packet_journal import PacketJournal, DEFAULT_SEGMENT_BYTES, DEFAULT_BATCH_BYTES
+from FoGSE.io.newest_data import newest_run_folder, run_folder_name, run_folder_time
+from FoGSE.io.log_segments import preallocate, segment_name, manifest_path, write_manifest, point_link
 
 # todo: migrate this inside systems.json
 
@@ -29,6 +40,531 @@ DOWNLINK_TYPE_ENUM = {
     "none": 0xff
 }
 
+# the 8-byte downlink packet header: sending system, number of packets
+# in frame, this packet's (one-indexed) position, data type, frame
+# counter. See `LogFileManager`.
+PACKET_HEADER = struct.Struct(">BHHBH")
+
+# most datagrams read from one socket per wakeup of the receive loop,
+# so a sustained downlink can't starve the control socket and the
+# housekeeping timers
+MAX_DATAGRAMS_PER_WAKEUP = 128
+
+# default group-commit policy for downlink logs. Override per data type
+# with `flush_bytes` and `flush_ms` fields next to `ring_frame_size_bytes`
+# in systems.json (`flush_ms` of 0 writes every frame immediately).
+DEFAULT_FLUSH_BYTES = 0x40000
+DEFAULT_FLUSH_MS = 50
+
+# default bounds on partially received frames held per data type.
+# Override with `max_frames_in_flight` and `frame_timeout_ms` fields in
+# systems.json, alongside the flush policy.
+DEFAULT_MAX_FRAMES_IN_FLIGHT = 8
+DEFAULT_FRAME_TIMEOUT_MS = 5000
+
+# default number of recent frames kept per data type in shared memory
+# for readers (see `FoGSE.io.frame_ring`). Override with a
+# `shared_ring_slots` field in systems.json; 0 disables the ring.
+DEFAULT_RING_SLOTS = 4
+# data types whose readers take the newest frames from the ring (the
+# others read every frame from the log, see
+# `BaseReader.read_every_frame`), so only these get a ring by default
+RING_DATA_TYPES = ("rtd",)
+
+# marker queued by `LogWriter.join()` to write out all pending frames:
+_FLUSH_PENDING = object()
+# marker queued (in place of data) by `LogWriter.close_file()`:
+_CLOSE_FILE = object()
+
+class LogWriter:
+    """
+    `LogWriter` moves log file writes out of the receive loop.
+
+    Completed frames are handed to a dedicated writer thread over a
+    bounded queue, so a slow disk (USB drive, network filesystem, etc.)
+    stalls the writer thread instead of the socket reads. If the queue
+    fills up, `overflow` decides what happens to the next frame:
+        - `"block"`: the caller waits for space. Datagrams back up in
+          the kernel receive buffer in the meantime.
+        - `"drop"`: the frame is discarded and counted in
+          `self.dropped`.
+
+    Frames are group-committed per file. Each submitted frame carries a
+    flush policy: pending frames for a file are written out together
+    (with one vectored `os.writev` call where available) once they add
+    up to `flush_bytes`, or `flush_ms` milliseconds after the oldest
+    one was queued, whichever comes first. A `flush_ms` of 0 writes
+    every frame immediately. So a reader of the file sees each frame at
+    most `flush_ms` after it was completed. Once a frame has been
+    written, its optional `on_written` callback is called, then its
+    optional `release` callback (both from the writer thread) so its
+    buffer can be reused. A frame that is dropped, or that fails to
+    write, is only released.
+
+    Attributes
+    ----------
+
+    high_water: int
+        The deepest the queue has been since construction.
+
+    dropped: int
+        Number of frames discarded because the queue was full.
+
+    write_calls: int
+        Number of write system calls made so far.
+    """
+
+    def __init__(self, max_frames: int=1024, overflow: str="block"):
+        """
+        Construct a new `LogWriter` and start its writer thread.
+
+        Parameters
+        ----------
+        max_frames : int
+            Maximum number of frames waiting to be written.
+
+        overflow : str
+            Policy when the queue is full, either `"block"` or
+            `"drop"`.
+
+        Raises
+        ------
+        ValueError : if `overflow` is not a known policy.
+        """
+        if overflow not in ("block", "drop"):
+            print("unknown LogWriter overflow policy:", overflow)
+            raise ValueError
+
+        self.max_frames = max_frames
+        self.overflow = overflow
+        self.high_water = 0
+        self.dropped = 0
+        self.write_calls = 0
+        self._queue = queue.Queue(maxsize=max_frames)
+        try:
+            self._iov_max = os.sysconf("SC_IOV_MAX")
+        except (AttributeError, ValueError, OSError):
+            self._iov_max = 1024
+
+        self._thread = threading.Thread(target=self._run, name="LogWriter", daemon=True)
+        self._thread.start()
+
+    @property
+    def depth(self):
+        """ Number of frames currently waiting to be written. """
+        return self._queue.qsize()
+
+    def submit(self, file, data, flush_bytes: int=0, flush_ms: float=0, release=None,
+               on_written=None):
+        """
+        Queue `data` to be written to `file`.
+
+        Parameters
+        ----------
+        file : file object
+            Open binary file to write to. Once a file has been handed
+            to a `LogWriter`, all writes to it should go through the
+            `LogWriter`.
+
+        data : bytes or bytearray
+            The data to write. It must not be modified after
+            submission.
+
+        flush_bytes : int
+            Write out pending data for `file` once at least this many
+            bytes are waiting. 0 disables the size limit.
+
+        flush_ms : float
+            Write out pending data for `file` at most this many
+            milliseconds after it was submitted. 0 writes immediately.
+
+        release : callable
+            Optional function (taking no arguments) to call once `data`
+            has been written, or straight away if it is dropped.
+
+        on_written : callable
+            Optional function (taking no arguments) to call once `data`
+            has been written, before `release`. Not called if `data` is
+            dropped or can't be written.
+
+        Returns
+        -------
+        Bool
+            `True` if the data was queued, `False` if it was dropped
+            because the queue was full.
+        """
+        item = (file, data, flush_bytes, flush_ms, release, on_written)
+        if self.overflow == "block":
+            self._queue.put(item)
+        else:
+            try:
+                self._queue.put_nowait(item)
+            except queue.Full:
+                self.dropped += 1
+                if release is not None:
+                    release()
+                return False
+
+        depth = self._queue.qsize()
+        if depth > self.high_water:
+            self.high_water = depth
+        return True
+
+    def close_file(self, file, size: int=None):
+        """
+        Close `file` once everything queued for it has been written,
+        first truncating it to `size` bytes if given (to give back
+        space reserved past the data). Never dropped, whatever the
+        overflow policy.
+        """
+        self._queue.put((file, _CLOSE_FILE, size, 0, None, None))
+
+    def join(self):
+        """ Block until every queued frame has been written to disk. """
+        self._queue.put(_FLUSH_PENDING)
+        self._queue.join()
+
+    def stop(self):
+        """ Write out anything still queued, then end the writer thread. """
+        if self._thread.is_alive():
+            self._queue.put(None)
+            self._thread.join()
+
+    def _run(self):
+        # pending frames per file, as [buffers, byte count, deadline,
+        # release callbacks, on_written callbacks]:
+        pending = {}
+        while True:
+            timeout = None
+            if len(pending) > 0:
+                timeout = max(0, min(entry[2] for entry in pending.values()) - time.monotonic())
+            try:
+                item = self._queue.get(timeout=timeout)
+            except queue.Empty:
+                self._write_due(pending)
+                continue
+
+            if item is None or item is _FLUSH_PENDING:
+                for file in list(pending.keys()):
+                    self._write_pending(file, pending.pop(file))
+                self._queue.task_done()
+                if item is None:
+                    return
+                continue
+
+            file, data, flush_bytes, flush_ms, release, on_written = item
+            if data is _CLOSE_FILE:
+                # (the size to truncate to is in place of `flush_bytes`)
+                entry = pending.pop(file, None)
+                if entry is not None:
+                    self._write_pending(file, entry)
+                _close_file(file, flush_bytes)
+                self._queue.task_done()
+                continue
+            entry = pending.get(file)
+            if entry is None:
+                entry = pending[file] = [[], 0, time.monotonic() + flush_ms/1000, [], []]
+            entry[0].append(data)
+            entry[1] += len(data)
+            if release is not None:
+                entry[3].append(release)
+            if on_written is not None:
+                entry[4].append(on_written)
+            if flush_ms <= 0 or (flush_bytes > 0 and entry[1] >= flush_bytes):
+                self._write_pending(file, pending.pop(file))
+            self._queue.task_done()
+            self._write_due(pending)
+
+    def _write_due(self, pending):
+        now = time.monotonic()
+        for file in [f for f, entry in pending.items() if entry[2] <= now]:
+            self._write_pending(file, pending.pop(file))
+
+    def _write_pending(self, file, entry):
+        if self._write_vectored(file, entry[0]):
+            for on_written in entry[4]:
+                on_written()
+        for release in entry[3]:
+            release()
+
+    def _write_vectored(self, file, buffers):
+        try:
+            if not hasattr(os, "writev"):
+                file.write(b"".join(buffers))
+                file.flush()
+                self.write_calls += 1
+                return True
+
+            fd = file.fileno()
+            i = 0
+            while i < len(buffers):
+                written = os.writev(fd, buffers[i:i + self._iov_max])
+                self.write_calls += 1
+                # skip past whatever was written (and empty buffers),
+                # trimming a partial buffer:
+                while i < len(buffers) and written >= len(buffers[i]):
+                    written -= len(buffers[i])
+                    i += 1
+                if written > 0:
+                    buffers[i] = memoryview(buffers[i])[written:]
+        except (OSError, ValueError) as e:
+            print("LogWriter couldn't write to", file.name, ":", e)
+            return False
+        return True
+
+def _close_file(file, size: int=None):
+    try:
+        if size is not None:
+            os.ftruncate(file.fileno(), size)
+        file.close()
+    except (OSError, ValueError) as e:
+        print("couldn't close", file.name, ":", e)
+
+def _reopen_frames(path, frame_len: int):
+    """
+    Open the file `path` (a log of `frame_len`-byte frames) to append
+    to, first cutting off any partly written frame at its end. The file
+    is created if it doesn't exist.
+
+    Returns
+    -------
+    file, int, int :
+        The open file, its length and the number of bytes cut off.
+    """
+    size = os.path.getsize(path) if os.path.exists(path) else 0
+    torn = size % frame_len
+    if torn > 0:
+        os.truncate(path, size - torn)
+    return open(path, "ab"), size - torn, torn
+
+def _reopen_index(path, log_size: int, dump_size: int, frame_len: int):
+    """
+    Open the index file `path` to append to, first removing a partly
+    written last record and any record for a frame past the end of the
+    log (`log_size`) or dump (`dump_size`).
+
+    Returns
+    -------
+    file, int :
+        The open file and the number of records removed.
+    """
+    try:
+        with open(path, "rb") as f:
+            data = f.read()
+    except FileNotFoundError:
+        data = b""
+    kept = bytearray()
+    count = len(data)//INDEX_RECORD.size
+    for record in INDEX_RECORD.iter_unpack(data[:count*INDEX_RECORD.size]):
+        offset, destination = record[0], record[4]
+        if offset + frame_len <= (dump_size if destination == DEST_DUMP else log_size):
+            kept += INDEX_RECORD.pack(*record)
+    if len(kept) < len(data):
+        with open(path + ".tmp", "wb") as f:
+            f.write(kept)
+        os.replace(path + ".tmp", path)
+    return open(path, "ab"), count - len(kept)//INDEX_RECORD.size
+
+class UplinkCommand:
+    """
+    An uplink command queued on an `UplinkSender`.
+
+    Attributes
+    ----------
+
+    command: bytes
+        The raw command.
+
+    queued_ns: int
+        `time.time_ns()` when the command was queued.
+
+    sent_ns: int
+        `time.time_ns()` when sending finished (`None` until then).
+
+    success: bool
+        Whether the command was sent (`None` until it has been tried).
+    """
+
+    def __init__(self, command: bytes, on_complete=None):
+        self.command = command
+        self.on_complete = on_complete
+        self.queued_ns = time.time_ns()
+        self.sent_ns = None
+        self.success = None
+
+    @property
+    def latency_ms(self):
+        """ Milliseconds from queueing to sending, or `None`. """
+        if self.sent_ns is None:
+            return None
+        return (self.sent_ns - self.queued_ns)/1e6
+
+class UplinkSender:
+    """
+    `UplinkSender` moves uplink command I/O out of the receive loop.
+
+    Commands are queued with `submit()` and sent, in order, by a
+    dedicated thread calling `send` (e.g. `Listener.send_command`), so a
+    slow or missing serial device only holds up later commands, not
+    downlink reception. Each command's send time and result are
+    recorded on its `UplinkCommand`, and its optional `on_complete`
+    callback is then called with it (from the sender thread).
+
+    Attributes
+    ----------
+
+    sent: int
+        Number of commands sent successfully.
+
+    failed: int
+        Number of commands that could not be sent.
+
+    last_command: UplinkCommand
+        The most recently completed command (or `None`).
+    """
+
+    def __init__(self, send):
+        """
+        Construct a new `UplinkSender` and start its thread.
+
+        Parameters
+        ----------
+        send : callable
+            Function taking the raw command (`bytes`) and returning
+            `True` if it was sent.
+        """
+        self.send = send
+        self.sent = 0
+        self.failed = 0
+        self.last_command = None
+        self._queue = queue.Queue()
+        self._thread = threading.Thread(target=self._run, name="UplinkSender", daemon=True)
+        self._thread.start()
+
+    @property
+    def depth(self):
+        """ Number of commands waiting to be sent. """
+        return self._queue.qsize()
+
+    def submit(self, command: bytes, on_complete=None):
+        """
+        Queue `command` to be sent.
+
+        Parameters
+        ----------
+        command : bytes
+            The raw command.
+
+        on_complete : callable
+            Optional function to call with the `UplinkCommand` once it
+            has been sent (or has failed).
+
+        Returns
+        -------
+        UplinkCommand
+            The queued command.
+        """
+        item = UplinkCommand(bytes(command), on_complete)
+        self._queue.put(item)
+        return item
+
+    def join(self):
+        """ Block until every queued command has been tried. """
+        self._queue.join()
+
+    def stop(self):
+        """ Send anything still queued, then end the sender thread. """
+        if self._thread.is_alive():
+            self._queue.put(None)
+            self._thread.join()
+
+    def _run(self):
+        while True:
+            item = self._queue.get()
+            if item is None:
+                self._queue.task_done()
+                return
+            try:
+                item.success = bool(self.send(item.command))
+            except Exception as e:
+                print("couldn't send uplink command! ignoring.")
+                print("\tException:",e)
+                item.success = False
+            item.sent_ns = time.time_ns()
+            if item.success:
+                self.sent += 1
+            else:
+                self.failed += 1
+            self.last_command = item
+            if item.on_complete is not None:
+                try:
+                    item.on_complete(item)
+                except Exception as e:
+                    print("uplink completion callback failed:", e)
+            self._queue.task_done()
+
+class FramePool:
+    """
+    `FramePool` recycles `CurrentFrame` objects (and their frame buffers
+    and packet bitmaps) for one `LogFileManager`.
+
+    Frames are checked out when a new frame counter is seen and released
+    once the frame has been written to disk, so in steady state no new
+    buffers are allocated. `self.allocated` counts frames built from
+    scratch and `self.reused` counts frames taken from the pool.
+    Releasing is safe from the `LogWriter` thread.
+    """
+
+    def __init__(self, frame_len: int, packet_count: int, payload_len: int, 
+                 max_free: int=16):
+        """
+        Construct a new, empty `FramePool`.
+
+        Parameters
+        ----------
+        frame_len : int
+            Length, in bytes, of each frame.
+
+        packet_count : int
+            The number of packets in each frame.
+
+        payload_len : int
+            Length, in bytes, of each packet's payload.
+
+        max_free : int
+            Maximum number of released frames to keep for reuse. Frames
+            released beyond this are left to the garbage collector.
+        """
+        self.frame_len = frame_len
+        self.packet_count = packet_count
+        self.payload_len = payload_len
+        self.max_free = max_free
+        self.allocated = 0
+        self.reused = 0
+        self._free = collections.deque()
+
+    def checkout(self, frame_counter: int):
+        """
+        Get an empty `CurrentFrame` for `frame_counter`, reusing a
+        released one if possible.
+        """
+        try:
+            frame = self._free.pop()
+        except IndexError:
+            self.allocated += 1
+            return CurrentFrame(self.frame_len, self.packet_count, self.payload_len, 
+                                frame_counter, pool=self)
+        self.reused += 1
+        frame.reset(frame_counter)
+        return frame
+
+    def release(self, frame):
+        """
+        Return `frame` to the pool. Its buffers must no longer be in use.
+        """
+        if len(self._free) < self.max_free:
+            self._free.append(frame)
+
 class LogFileManager:
     """
     `LogFileManager` is an interface between a raw data stream and its
@@ -50,10 +586,45 @@ class LogFileManager:
 
     Because this is a raw binary file, each data frame is assumed to be
     fixed width. 
+
+    Data types whose frames fit in a single packet skip reassembly:
+    each packet's payload is written straight out as a frame.
+
+    Every frame written (to the log or to `dump/`) also gets a record in
+    the `.idx` file next to the log, with its offset, receive time,
+    frame counter and number of missing packets. See
+    `FoGSE.io.log_index`.
+
+    After a frame has been written to the log, it is also published to
+    `self.ring` (a `FoGSE.io.frame_ring.FrameRing`), if set, and
+    `self.on_frame_written` is called, if set.
+
+    Frames that never complete (because a packet was lost) are evicted
+    to the `dump/` log, either when more than `max_frames` are in
+    flight (oldest first) or when `evict_stale()` finds they have not
+    received a packet in `frame_timeout_ms`. Evictions are counted in
+    `self.evicted_full` and `self.evicted_stale` respectively.
+
+    Ingest counters (packets, bytes, frames completed and dumped,
+    missing, out-of-order and duplicate packets) are kept as plain
+    attributes and reported by `get_stats()`. Packet and byte rates
+    are sampled by `update_rates()`.
+
+    If `segment_bytes` or `segment_s` is set, the log is written as
+    numbered segments with a manifest, and `filepath` becomes a link to
+    the current segment (see `FoGSE.io.log_segments`). If
+    `preallocate_bytes` is set, disk space for the log (or segment) is
+    reserved that many bytes at a time, ahead of the frames written.
+
+    If `resume` is set, the log, dump and index files of an earlier run
+    are appended to rather than overwritten (see `_resume()`).
     """
 
     def __init__(self, filepath: str, system: int, data: int, frame_len: int,
-                 payload_len: int):
+                 payload_len: int, writer: LogWriter=None, flush_bytes: int=0,
+                 flush_ms: float=0, max_frames: int=DEFAULT_MAX_FRAMES_IN_FLIGHT,
+                 frame_timeout_ms: float=DEFAULT_FRAME_TIMEOUT_MS, segment_bytes: int=0,
+                 segment_s: float=0, preallocate_bytes: int=0, resume: bool=False):
         """
         Construct a new instance of `LogFileManager`.
 
@@ -61,7 +632,7 @@ class LogFileManager:
         ----------
         filepath : str
             Path to the log file to be used for storage. Provided file
-            WILL BE OVERWRITTEN.
+            WILL BE OVERWRITTEN, unless `resume` is set.
 
         system : int
             The system ID code (one byte) this `LogFileManager` will
@@ -79,6 +650,44 @@ class LogFileManager:
             The length of the payload portion of the packet, i.e. the
             total packet length minus header length (8 bytes).
 
+        writer : LogWriter
+            Optional `LogWriter` to hand completed frames to. If `None`,
+            frames are written and flushed in the calling thread.
+
+        flush_bytes : int
+            Group-commit size for `writer`: pending frames are written
+            out once this many bytes are waiting. 0 disables the limit.
+
+        flush_ms : float
+            Group-commit latency for `writer`: pending frames are
+            written out at most this many milliseconds after they are
+            completed. 0 writes every frame immediately.
+
+        max_frames : int
+            Maximum number of partially received frames to hold at
+            once. Adding another evicts the oldest one to `dump/`.
+
+        frame_timeout_ms : float
+            Partially received frames that have had no new packet for
+            this long are evicted to `dump/` by `evict_stale()`.
+
+        segment_bytes : int
+            Start a new log segment rather than let one grow past this
+            many bytes. 0 disables the limit.
+
+        segment_s : float
+            Start a new log segment once one has been open this many
+            seconds. 0 disables the limit.
+
+        preallocate_bytes : int
+            Reserve disk space for the log this many bytes at a time. 0
+            disables preallocation.
+
+        resume : bool
+            Append to the files already at `filepath` (e.g. left by a
+            Listener that stopped mid-run), after cutting them back to
+            their last whole frame.
+
         Raises
         ------
         RuntimeError : if arguments are out-of-bounds, or if provided
@@ -86,11 +695,29 @@ class LogFileManager:
             log file cannot be opened.
         """
         self.filepath = filepath
+        self.frame_len = frame_len
+        self.segment_bytes = segment_bytes
+        self.segment_s = segment_s
+        self.preallocate_bytes = preallocate_bytes
+        # bytes written so far to `self.file` and `self.dumpfile`:
+        self._log_offset = 0
+        self._dump_offset = 0
+        # one `dict` per log segment (see `log_segments.write_manifest()`),
+        # empty if the log isn't segmented:
+        self.segments = []
         try:
-            self.file = open(filepath, "wb")
             p = Path(filepath)
             print(os.path.join(p.parents[0], "dump", p.name))
-            self.dumpfile = open(os.path.join(p.parents[0], "dump", p.name), "wb")
+            if resume:
+                self._resume(os.path.join(p.parents[0], "dump", p.name))
+            else:
+                if segment_bytes > 0 or segment_s > 0:
+                    self.file = self._open_segment()
+                else:
+                    self.file = open(filepath, "wb")
+                    self._start_segment()
+                self.dumpfile = open(os.path.join(p.parents[0], "dump", p.name), "wb")
+                self.indexfile = open(index_path(filepath), "wb")
         except:
             print("can't open log file at ", self.filepath)
             raise RuntimeError
@@ -101,49 +728,81 @@ class LogFileManager:
         if data > 255:
             print("data ID must be 1 byte wide")
             raise RuntimeError
+        if max_frames < 1:
+            print("must allow at least one frame in flight")
+            raise RuntimeError
 
         self.system = system
         self.data = data
-        self.frame_len = frame_len
         self.payload_len = payload_len
+        self.writer = writer
+        self.flush_bytes = flush_bytes
+        self.flush_ms = flush_ms
         self.packets_per_frame = math.ceil(self.frame_len/self.payload_len)
-        self.frames = []
+        self.single_packet = self.packets_per_frame == 1
+        self.on_frame_written = None
+        self.ring = None
+        # in-flight frames, keyed by frame counter (oldest first):
+        self.frames = {}
+        self.max_frames = max_frames
+        self.frame_timeout_ms = frame_timeout_ms
+        self.evicted_full = 0
+        self.evicted_stale = 0
+        # ingest counters (see `get_stats()`):
+        self.packets = 0
+        self.bytes = 0
+        self.frames_completed = 0
+        self.frames_dumped = 0
+        self.missing_packets = 0
+        self.out_of_order = 0
+        self.duplicates = 0
+        # (frame counter, packet index) of the last packet received:
+        self._last_packet = (None, 0)
+        # rates, and the counters they were last sampled from:
+        self.packet_rate = 0.0
+        self.byte_rate = 0.0
+        self._rate_sample = (time.monotonic(), 0, 0)
+        self.pool = FramePool(self.frame_len, self.packets_per_frame, self.payload_len,
+                              max_free=2*max_frames)
 
         print("payload len:\t", self.payload_len)
         print("frame len:\t", self.frame_len)
 
-    def add_frame(self, frame_counter:int):
+    def add_frame(self, frame_counter:int, timestamp_ns: int=None):
         """
-        Add a `CurrentFrame` to the `self.frames` list with the provided
+        Add a `CurrentFrame` to the `self.frames` dict with the provided
         `frame_counter` value.
 
         This method will add a new, blank `CurrentFrame` object to
         `self.frames`, keyed to the provided `frame_counter` (and return
         `True`), unless a `CurrentFrame` already exists with the same
-        `frame_counter` value (in which case `False` is returned). 
+        `frame_counter` value (in which case `False` is returned). If
+        `self.max_frames` frames are already in flight, the oldest is
+        dumped to make room.
 
         Parameters
         ----------
         
         frame_counter: int
             A 2-byte counter or identifier for this frame.
+
+        timestamp_ns: int
+            Time to index a frame dumped to make room at (see
+            `enqueue()`), or `None` for the current time.
         """
-        for frame in self.frames: # check that there is no frame with this frame_counter already in the list of frames
-            if frame.get_frame_counter() == frame_counter:
-                return False
-        self.frames.append(CurrentFrame(
-            self.frame_len, 
-            self.packets_per_frame,
-            self.payload_len,
-            frame_counter
-        ))
+        if frame_counter in self.frames: # check that there is no frame with this frame_counter already in flight
+            return False
+        if len(self.frames) >= self.max_frames:
+            self.dump(next(iter(self.frames)), timestamp_ns)
+            self.evicted_full += 1
+        self.frames[frame_counter] = self.pool.checkout(frame_counter)
 
         return True
     
     def delete_frame(self, frame_counter:int):
         """
         Delete the `CurrentFrame` with matching `frame_counter` from the
-        `self.frames` list.
+        `self.frames` dict.
 
         If there are no items in `self.frames` for which
         `CurrentFrame.frame_counter` matches the provided argument,
@@ -155,20 +814,17 @@ class LogFileManager:
         frame_counter: int
             A 2-byte counter or identifier for this frame.
         """
-        index = None
-        for i, frame in enumerate(self.frames):
-            if frame.get_frame_counter() == frame_counter:
-                index = i
-        if index is not None:
-            del self.frames[index]
+        frame = self.frames.pop(frame_counter, None)
+        if frame is not None:
+            frame.release()
 
     def pop_frame(self, frame_counter:int):
         """
         Pop the `CurrentFrame` with matching `frame_counter` from the
-        `self.frames` list.
+        `self.frames` dict.
 
-        "Pop" means return a copy of the `CurrentFrame` object and
-        delete it from the list. If there are no items in `self.frames`
+        "Pop" means return the `CurrentFrame` object and delete it from
+        the dict. If there are no items in `self.frames`
         for which `CurrentFrame.frame_counter` matches the provided
         argument, nothing will happen (and `None` will be returned).
 
@@ -178,16 +834,9 @@ class LogFileManager:
         frame_counter: int
             A 2-byte counter or identifier for this frame.
         """
-        index = None
-        for i, frame in enumerate(self.frames):
-            if frame.get_frame_counter() == frame_counter:
-                index = i
-                break;
-        if index is not None:
-            out = self.frames.pop(index)
-            return out
-        
-    def enqueue(self, raw_data: bytearray):
+        return self.frames.pop(frame_counter, None)
+
+    def enqueue(self, raw_data: bytearray, timestamp_ns: int=None):
         """
         Adds raw data to queue for file write.
 
@@ -207,9 +856,19 @@ class LogFileManager:
 
         Parameters
         ----------
-        raw_data : bytearray
+        raw_data : bytes-like
             Raw packet (e.g. received on socket) to add to queue. Should
-            include a valid 8-byte header.
+            include a valid 8-byte header. May be a `memoryview` into a
+            reused receive buffer: the payload is copied into the frame
+            before this method returns.
+
+        timestamp_ns : int
+            When the packet arrived, in nanoseconds since the Unix
+            epoch, for a packet received earlier (e.g. replayed from a
+            journal). Frames this call writes are indexed at this time,
+            and the frame it goes into is timed by it for
+            `evict_stale()` (which must then be given `now` on the same
+            clock: `timestamp_ns/1e9`). If `None`, the current time.
 
         Raises
         ------
@@ -219,11 +878,12 @@ class LogFileManager:
         """
 
         # unpack the header:
-        system = raw_data[0]
-        datatype = raw_data[5]
-        npackets = int.from_bytes(raw_data[1:3], byteorder='big')
-        ipacket = int.from_bytes(raw_data[3:5], byteorder='big')
-        iframe = raw_data[7]
+        system, npackets, ipacket, datatype, iframe = PACKET_HEADER.unpack_from(raw_data)
+        # only the frame counter LSB is used to identify frames
+        iframe &= 0xff
+        payload = memoryview(raw_data)[8:]
+        self.packets += 1
+        self.bytes += len(raw_data)
 
         if system != self.system:
             print("Log queue got bad system code!")
@@ -231,62 +891,326 @@ class LogFileManager:
         if datatype != self.data:
             print("Log queue got bad data code!")
             raise KeyError
+
+        if self.single_packet and npackets == 1 and ipacket == 1:
+            self._write_payload(payload, iframe, timestamp_ns)
+            return True
         
-        frame = None
-        for f in self.frames:
-            if f.get_frame_counter() == iframe:
-                frame = f
-                break;
+        frame = self.frames.get(iframe)
+
+        # a packet is out of order if it belongs to an older frame than
+        # the newest in flight, or comes before the previous packet of
+        # its frame:
+        if frame is not None:
+            last_frame, last_packet = self._last_packet
+            if iframe != next(reversed(self.frames)) or (iframe == last_frame and ipacket < last_packet):
+                self.out_of_order += 1
+        self._last_packet = (iframe, ipacket)
         
         if frame is not None: # the received frame counter exists in our list already. Try to insert packet.
-            p_success = frame.insert(ipacket, raw_data[8:])
+            p_success = frame.insert(ipacket, payload)
             if not p_success:
+                if 1 <= ipacket <= frame.packet_count and frame.is_queued(ipacket):
+                    self.duplicates += 1
                 print("failed to add packet to frame!")
-                print("\tfor",system,"overwritten by",ipacket,"queued:",frame.queued)
+                print("\tfor",system,"overwritten by",ipacket,"received:",frame.received,"of",frame.packet_count)
 
-                self.write(iframe) # dump current frame (which presumably contains some errors)
-                f_success = self.add_frame(iframe)
+                self.write(iframe, timestamp_ns) # dump current frame (which presumably contains some errors)
+                f_success = self.add_frame(iframe, timestamp_ns)
                 if not f_success:   # shouldn't happen, we just removed this frame and created a new one
                     print("failed to add new frame!")
                     # raise BufferError
 
-                p_success = frame.insert(ipacket, raw_data[8:])
+                frame = self.frames[iframe]
+                p_success = frame.insert(ipacket, payload)
                 if not p_success:   # shouldn't happen, this is a brand new frame; shouldn't be any conflicts.
                     print("failed to add packet to new frame!")
                     # raise BufferError
 
         else: # the received frame counter doesn't exist in our list. Create it and try to insert packet.
-            f_success = self.add_frame(iframe)
+            f_success = self.add_frame(iframe, timestamp_ns)
             if not f_success:   # shouldn't happen, we already checked if the frame exists.
                 print("failed to add new frame!")
                 # raise BufferError
-            frame = self.frames[-1]
-            p_success = frame.insert(ipacket, raw_data[8:])
+            frame = self.frames[iframe]
+            p_success = frame.insert(ipacket, payload)
             if not p_success:   # shouldn't happen, this is a brand new frame; shouldn't be any conflicts.
                 print("failed to add packet to new frame!")
                 # raise BufferError
             
         if frame.done:
-            self.write(iframe)
+            self.write(iframe, timestamp_ns)
             return True
-        else:
-            return False
+        elif timestamp_ns is not None:
+            frame.last_insert = timestamp_ns/1e9
+        return False
                 
-    def write(self, frame_counter:int):
+    def write(self, frame_counter:int, timestamp_ns: int=None):
         """
         Writes data in `self.queue` to `self.file`, then refreshes
-        queue.
+        queue. The frame is indexed at `timestamp_ns` (nanoseconds
+        since the Unix epoch), or the current time if it is `None`.
         """
         outframe = self.pop_frame(frame_counter)
-        self.file.write(outframe.data)
-        self.file.flush()
+        # (a frame cut short by a repeated packet is written too)
+        if outframe.done:
+            self.frames_completed += 1
+        self._write_out(self.file, outframe, timestamp_ns)
         # print("wrote frame count " + str(frame_counter) + " to " + self.filepath)
     
-    def dump(self, frame_counter:int):
+    def dump(self, frame_counter:int, timestamp_ns: int=None):
         # for f in self.frames: 
         outframe = self.pop_frame(frame_counter)
-        self.dumpfile.write(outframe.data)
-        self.dumpfile.flush()
+        self.frames_dumped += 1
+        self._write_out(self.dumpfile, outframe, timestamp_ns)
+
+    def evict_stale(self, now: float=None, timestamp_ns: int=None):
+        """
+        Dump every in-flight frame that has not received a packet in
+        the last `self.frame_timeout_ms`.
+
+        Parameters
+        ----------
+        now : float
+            Current `time.monotonic()` value, if the caller already has
+            it (or, for packets given to `enqueue()` with their
+            `timestamp_ns`, the time of the latest in seconds).
+
+        timestamp_ns : int
+            Time to index the evicted frames at, in nanoseconds since
+            the Unix epoch, or `None` for the current time.
+
+        Returns
+        -------
+        int
+            The number of frames evicted.
+        """
+        if now is None:
+            now = time.monotonic()
+        cutoff = now - self.frame_timeout_ms/1000
+        stale = [counter for counter, frame in self.frames.items() if frame.last_insert < cutoff]
+        for counter in stale:
+            self.dump(counter, timestamp_ns)
+        self.evicted_stale += len(stale)
+        return len(stale)
+
+    def _write_payload(self, payload, frame_counter, timestamp_ns=None):
+        # copy out of the (reused) receive buffer, padded to fixed width:
+        data = bytes(payload[:self.frame_len])
+        if len(data) < self.frame_len:
+            data += bytes(self.frame_len - len(data))
+        self.frames_completed += 1
+        self._write_frame(self.file, data, frame_counter, 0, timestamp_ns=timestamp_ns)
+
+    def update_rates(self, now: float=None):
+        """
+        Update `self.packet_rate` and `self.byte_rate` (per second)
+        from the packets and bytes received since the last call.
+
+        Parameters
+        ----------
+        now : float
+            Current `time.monotonic()` value, if the caller already has
+            it.
+        """
+        if now is None:
+            now = time.monotonic()
+        then, packets, nbytes = self._rate_sample
+        if now > then:
+            self.packet_rate = (self.packets - packets)/(now - then)
+            self.byte_rate = (self.bytes - nbytes)/(now - then)
+        self._rate_sample = (now, self.packets, self.bytes)
+
+    def get_stats(self):
+        """
+        Report the ingest counters for this log file.
+
+        Returns
+        -------
+        dict
+            Packet and byte totals and rates (as of the last
+            `update_rates()`), frames completed and dumped, packets
+            missing from written frames, out-of-order and duplicate
+            packets, evictions and frames currently in flight.
+        """
+        return {
+            "system": self.system,
+            "data": self.data,
+            "packets": self.packets,
+            "bytes": self.bytes,
+            "packets_per_s": self.packet_rate,
+            "bytes_per_s": self.byte_rate,
+            "frames_completed": self.frames_completed,
+            "frames_dumped": self.frames_dumped,
+            "missing_packets": self.missing_packets,
+            "out_of_order": self.out_of_order,
+            "duplicates": self.duplicates,
+            "evicted_full": self.evicted_full,
+            "evicted_stale": self.evicted_stale,
+            "frames_in_flight": len(self.frames)
+        }
+
+    def _write_out(self, file, frame, timestamp_ns=None):
+        if not frame.done:
+            frame.zero_missing()
+            self.missing_packets += frame.packet_count - frame.received
+        self._write_frame(file, frame.data, frame.get_frame_counter(), 
+                          frame.packet_count - frame.received, frame.release, timestamp_ns)
+
+    def _write_frame(self, file, data, frame_counter, missing, release=None, timestamp_ns=None):
+        length = len(data)
+        if file is self.dumpfile:
+            destination, offset = DEST_DUMP, self._dump_offset
+        else:
+            if len(self.segments) > 0 and self._segment_due(length):
+                self._roll_segment()
+            if self.preallocate_bytes > 0:
+                self._reserve(length)
+            file = self.file
+            destination, offset = DEST_LOG, self._log_offset
+
+        written = None
+        notify = self.on_frame_written
+        ring = self.ring
+        if destination == DEST_LOG and (notify is not None or ring is not None):
+            def written():
+                # (called before `release()` hands the buffer back to the pool)
+                if ring is not None:
+                    ring.publish(data, frame_counter)
+                if notify is not None:
+                    notify(self.system, self.data, offset, length, frame_counter)
+
+        if not self._write_bytes(file, data, release, written):
+            return
+        if destination == DEST_DUMP:
+            self._dump_offset += length
+        else:
+            self._log_offset += length
+        if timestamp_ns is None:
+            timestamp_ns = time.time_ns()
+        self._write_bytes(self.indexfile, 
+                          pack_record(offset, timestamp_ns, frame_counter, missing, destination))
+
+    def _resume(self, dump_path):
+        """
+        Reopen the log (or its last segment), dump and index files of an
+        earlier run to append to. A partly written frame at the end of
+        the log or dump is cut off, as are index records for frames that
+        didn't reach the disk. A segmented log stays segmented; an
+        unsegmented one stays unsegmented.
+        """
+        folder = os.path.dirname(self.filepath)
+        torn = 0
+        if os.path.exists(manifest_path(self.filepath)):
+            with open(manifest_path(self.filepath), "r") as f:
+                self.segments = json.load(f)["segments"]
+            last = self.segments[-1]
+            last.pop("bytes", None)
+            self._log_offset = last["offset"]
+            self.file, size, torn = _reopen_frames(os.path.join(folder, last["file"]), self.frame_len)
+            write_manifest(self.filepath, self.frame_len, self.segments)
+            point_link(self.filepath, last["file"])
+            self._start_segment()
+            self._segment_opened -= (time.time_ns() - last["start_ns"])/1e9
+        elif (self.segment_bytes > 0 or self.segment_s > 0) and not os.path.lexists(self.filepath):
+            self.file, size = self._open_segment(), 0
+        else:
+            if self.segment_bytes > 0 or self.segment_s > 0:
+                print(self.filepath, "was started unsegmented; resuming it unsegmented")
+                self.segment_bytes, self.segment_s = 0, 0
+            self.file, size, torn = _reopen_frames(self.filepath, self.frame_len)
+            self._start_segment()
+        self._log_offset += size
+        # the data already written needs no more space reserving
+        self._reserved = size
+
+        self.dumpfile, self._dump_offset, dump_torn = _reopen_frames(dump_path, self.frame_len)
+        self.indexfile, dropped = _reopen_index(index_path(self.filepath), self._log_offset,
+                                                self._dump_offset, self.frame_len)
+        print("resuming", self.filepath, "after", self._log_offset//self.frame_len, "frames")
+        if torn > 0 or dump_torn > 0 or dropped > 0:
+            print("\tcut off", torn + dump_torn, "bytes of partly written frames and",
+                  dropped, "index records")
+
+    def _start_segment(self):
+        # the current log file (or segment) starts at this stream offset:
+        self._segment_offset = self._log_offset
+        self._segment_opened = time.monotonic()
+        # bytes of disk space reserved for it so far:
+        self._reserved = 0
+
+    def _open_segment(self):
+        """ Open the next log segment, and point the manifest and `self.filepath` at it. """
+        name = segment_name(self.filepath, len(self.segments))
+        file = open(os.path.join(os.path.dirname(self.filepath), name), "wb")
+        self.segments.append({"file": name, "offset": self._log_offset, "start_ns": time.time_ns()})
+        write_manifest(self.filepath, self.frame_len, self.segments)
+        point_link(self.filepath, name)
+        self._start_segment()
+        return file
+
+    def _segment_due(self, length: int):
+        written = self._log_offset - self._segment_offset
+        if written == 0:
+            return False
+        return (self.segment_bytes > 0 and written + length > self.segment_bytes) or \
+            (self.segment_s > 0 and time.monotonic() - self._segment_opened >= self.segment_s)
+
+    def _roll_segment(self):
+        """ Close the current log segment (once its frames are written) and start the next. """
+        size = self._log_offset - self._segment_offset
+        self.segments[-1]["bytes"] = size
+        self._close_log(self.file, size)
+        self.file = self._open_segment()
+
+    def _close_log(self, file, size: int):
+        # truncating gives back any space reserved past the data
+        size = size if self._reserved > size else None
+        if self.writer is None:
+            _close_file(file, size)
+        else:
+            self.writer.close_file(file, size)
+
+    def _reserve(self, length: int):
+        written = self._log_offset - self._segment_offset
+        if written + length <= self._reserved:
+            return
+        if preallocate(self.file.fileno(), self._reserved, self.preallocate_bytes):
+            self._reserved += self.preallocate_bytes
+        else:
+            print("can't preallocate space for", self.filepath, "; writing without")
+            self.preallocate_bytes = 0
+
+    def close(self):
+        """
+        Close the log (or its last segment), dump and index files, and
+        the frame ring. Call once nothing more is queued for them (e.g.
+        after `LogWriter.stop()`). Does nothing if already closed.
+        """
+        if self.indexfile.closed:
+            return
+        size = self._log_offset - self._segment_offset
+        if len(self.segments) > 0:
+            self.segments[-1]["bytes"] = size
+            write_manifest(self.filepath, self.frame_len, self.segments)
+        _close_file(self.file, size if self._reserved > size else None)
+        self.dumpfile.close()
+        self.indexfile.close()
+        if self.ring is not None:
+            self.ring.close()
+
+    def _write_bytes(self, file, data, release=None, on_written=None):
+        if self.writer is None:
+            file.write(data)
+            file.flush()
+            if on_written is not None:
+                on_written()
+            if release is not None:
+                release()
+        elif not self.writer.submit(file, data, self.flush_bytes, self.flush_ms, release, on_written):
+            print("writer queue full, dropped frame for", self.filepath)
+            return False
+        return True
     
 class CurrentFrame():
     """
@@ -325,8 +1249,21 @@ class CurrentFrame():
         the packets that reconstitute this frame to share the same
         `frame_counter` value in their header. Maximum value is Maximum
         value is 0xffff.
+
+    received: int
+        The number of distinct packets inserted so far. The frame is
+        done when this reaches `packet_count`.
+
+    queued: bytearray
+        Bitmap of received packets, one bit per packet (bit `i % 8` of
+        byte `i // 8` is set once zero-indexed packet `i` is inserted).
+
+    last_insert: float
+        `time.monotonic()` when the frame was created or last had a
+        packet inserted.
     """
-    def __init__(self, frame_len:int, packet_count:int, payload_len:int, frame_counter:int):
+    def __init__(self, frame_len:int, packet_count:int, payload_len:int, frame_counter:int,
+                 pool: FramePool=None):
         self.done = False   # flag indicating frame is complete
 
         if packet_count > 0xffff:
@@ -340,21 +1277,59 @@ class CurrentFrame():
         self._frame_counter = frame_counter
         self.packet_count = packet_count
         self.payload_len = payload_len
+        self._pool = pool
 
         self.data = bytearray(frame_len)
-        self.queued = [False]*packet_count
+        self._view = memoryview(self.data)
+        self.queued = bytearray((packet_count + 7) // 8)
+        self._empty_bitmap = bytes(len(self.queued))
+        self.received = 0
+        self.last_insert = time.monotonic()
+
+    def reset(self, frame_counter:int):
+        """
+        Empty this frame so it can be reused for `frame_counter`.
+
+        Only the packet bitmap is cleared: stale bytes are left in
+        `self.data`, and any that are not overwritten by new packets are
+        cleared by `zero_missing()` before the frame is written.
+        """
+        self._frame_counter = frame_counter
+        self.queued[:] = self._empty_bitmap
+        self.received = 0
+        self.done = False
+        self.last_insert = time.monotonic()
+
+    def zero_missing(self):
+        """
+        Zero the parts of `self.data` belonging to packets that were
+        never received.
+        """
+        for i in range(self.packet_count):
+            if not self.queued[i >> 3] & (1 << (i & 7)):
+                start = i*self.payload_len
+                end = min(start + self.payload_len, self.frame_len)
+                self._view[start:end] = bytes(end - start)
+
+    def release(self):
+        """
+        Return this frame to the `FramePool` it came from, if any. The
+        frame must not be used after this.
+        """
+        if self._pool is not None:
+            self._pool.release(self)
 
     def insert(self, ipacket:int, payload:bytearray):
         """
         Put the payload of a packet (header has been removed) into the
         `CurrentFrame`. 
 
-        This method will search `self.queued` for the provided
+        This method will check the `self.queued` bitmap for the provided
         `ipacket`. If no packet in that index has been queued yet, this
-        one will be added to the frame and its `self.queued` flag will
-        be set. If this is the packet that completes the `CurrentFrame`
-        (such that `all(self.queued) == True`), the `self.done` flag
-        will be set.
+        one will be added to the frame, its bit in `self.queued` will be
+        set and `self.received` incremented. If this is the packet that
+        completes the `CurrentFrame` (such that `self.received ==
+        self.packet_count`), the `self.done` flag will be set.
 
         Returns
         -------
@@ -362,7 +1337,7 @@ class CurrentFrame():
             The return value is `True` if there is no packet yet in this
             position in `self.queued`, and `False` otherwise; i.e. if
             this packet *would* overwrite an existing packet in the
-            frame.
+            frame (or lies outside the frame).
 
         Parameters
         ----------
@@ -370,31 +1345,77 @@ class CurrentFrame():
             A ONE-INDEXED (not zero-index) packet number, locating this
             packet in the frame it belongs to.
 
-        payload: bytearray
+        payload: bytes-like
             The beheaded packet contents that were sent by the formatter
             to the ground. The universal 8-byte header should have been
             removed.
         """
+        if ipacket < 1 or ipacket > self.packet_count:
+            return False
         
-        if self.queued[ipacket - 1] == True: # indicate to caller that this packet has already been received for this frame
+        byte_index = (ipacket - 1) >> 3
+        bit = 1 << ((ipacket - 1) & 7)
+        if self.queued[byte_index] & bit: # indicate to caller that this packet has already been received for this frame
             return False
         
         # find byte position in overall frame
         frame_byte_index = (ipacket - 1)*self.payload_len
-        # length to write in overall frame. If the payload is bigger
-        # than the frame, truncate it.
-        distance = min(len(payload), self.frame_len)
-        self.data[frame_byte_index:(frame_byte_index + distance)] = payload
-
-        self.queued[ipacket - 1] = True
-        if all(self.queued):
+        # length to write in overall frame. If the payload runs past
+        # the end of the frame, truncate it.
+        distance = min(len(payload), self.frame_len - frame_byte_index)
+        self._view[frame_byte_index:(frame_byte_index + distance)] = payload[:distance]
+        # a short packet leaves the rest of its slot empty (this buffer
+        # may hold bytes from a previous frame)
+        slot_end = min(frame_byte_index + self.payload_len, self.frame_len)
+        if frame_byte_index + distance < slot_end:
+            self._view[(frame_byte_index + distance):slot_end] = bytes(slot_end - frame_byte_index - distance)
+
+        self.queued[byte_index] |= bit
+        self.received += 1
+        self.last_insert = time.monotonic()
+        if self.received == self.packet_count:
             self.done = True
         
         return True
 
+    def is_queued(self, ipacket:int):
+        """
+        Check whether the ONE-INDEXED packet `ipacket` has already been
+        inserted into this frame.
+        """
+        return bool(self.queued[(ipacket - 1) >> 3] & (1 << ((ipacket - 1) & 7)))
+
     def get_frame_counter(self):
         return self._frame_counter
 
+def read_udp_socket_drops(sock: socket.socket):
+    """
+    Look up the kernel drop counter for a UDP socket.
+
+    Parameters
+    ----------
+    sock : socket.socket
+        A bound IPv4 UDP socket.
+
+    Returns
+    -------
+    None or int
+        The `drops` column of `/proc/net/udp` for the row whose inode
+        matches `sock`, or `None` if it cannot be found (e.g. on
+        non-Linux platforms).
+    """
+    try:
+        inode = str(os.fstat(sock.fileno()).st_ino)
+        with open("/proc/net/udp", "r") as udp_table:
+            next(udp_table) # skip column names
+            for line in udp_table:
+                fields = line.split()
+                if len(fields) > 12 and fields[9] == inode:
+                    return int(fields[12])
+    except (OSError, ValueError, StopIteration):
+        return None
+    return None
+
 class Listener():
     """
     `Listener` provides a logging interface between the local machine
@@ -419,9 +1440,16 @@ class Listener():
             logs--raw frames-->gse
             
     """
+
+    # appended to the names of this Listener's catch log, uplink log,
+    # journal folder and Unix socket (so several Listeners, e.g. the
+    # workers of a `listening_sharded.ShardedListener`, can share one
+    # run folder):
+    instance_name = ""
+
     def __init__(self, json_config_file=os.path.join(__file__, "..", "..", "foxsi4-commands", "systems.json"),
                  command_interface="uplink", local_system="gse", 
-                 remote_system="formatter"):
+                 remote_system="formatter", resume=False):
         """
         Creates a `Listener` instance.
 
@@ -444,6 +1472,48 @@ class Listener():
             The `name` key to search for in `json_config_file` to define
             and set up the remote system.
 
+        resume : bool
+            Continue the newest run in `log_received_folder` (e.g. after
+            the Listener stopped mid-run) instead of starting a new run
+            folder: its logs are cut back to their last whole frame and
+            appended to, so the run stays one contiguous dataset. If
+            there is no run to continue, a new one is started.
+
+        The optional `recv_buffer_bytes` field in the local system's
+        `ethernet_interface` sets the kernel receive buffer size
+        (`SO_RCVBUF`) for the downlink socket. Larger buffers absorb
+        bursts (e.g. CMOS frames) while the Listener is busy writing.
+
+        Completed frames are written to disk by a `LogWriter` thread.
+        The optional `writer_queue_frames` and `writer_overflow` fields
+        in the local system's `logger_interface` set its queue depth
+        and overflow policy (see `LogWriter`). Each data type in a
+        `ring_buffer_interface` may set `flush_bytes` and `flush_ms` to
+        control how writes to its log are batched (see
+        `DEFAULT_FLUSH_BYTES` and `DEFAULT_FLUSH_MS`), and
+        `max_frames_in_flight` and `frame_timeout_ms` to bound how many
+        incomplete frames are held, and for how long (see
+        `DEFAULT_MAX_FRAMES_IN_FLIGHT` and `DEFAULT_FRAME_TIMEOUT_MS`).
+        `shared_ring_slots` sets how many recent frames of that type
+        are kept in shared memory for readers (by default
+        `DEFAULT_RING_SLOTS` for the `RING_DATA_TYPES`, none for others).
+        `segment_bytes` and `segment_s` split its log into segments of
+        at most that size or duration, and `preallocate_bytes` reserves
+        disk space for it that many bytes at a time (see
+        `LogFileManager` and `FoGSE.io.log_segments`).
+
+        Packets with no matching log file go to the binary `catch.bin`
+        (see `FoGSE.io.catch_log`). The optional `catch_summary_s` field
+        in `logger_interface` sets how often (in seconds) caught packets
+        are summarised on the console.
+
+        If `logger_interface` has `"packet_journal": true`, every
+        received datagram is also journaled, with its arrival time, to
+        the run's `journal/` folder (see `FoGSE.io.packet_journal`).
+        `journal_segment_bytes` and `journal_batch_bytes` set the
+        segment and write batch sizes. It is off by default, as it
+        costs about a tenth of the receive throughput.
+
         Raises
         ------
         RuntimeError : if required JSON fields cannot be found, or log
@@ -471,16 +1541,16 @@ class Listener():
                 raise RuntimeError
 
             # constant header size for packets.
-            self.header_size = 8
+            self.header_size = PACKET_HEADER.size
             self.max_receive_size = (self.local_system_config
                                      ["ethernet_interface"]
                                      ["max_payload_bytes"] - self.header_size)
+            self.resume = resume
             try:
                 now = datetime.now()
-                now_str = str(now.day) + "-" + str(now.month) + "-" + str(now.year) + \
-                    "_" + str(now.hour) + "-" + str(now.minute) + \
-                    "-" + str(now.second)
-                self.start = now
+                now_str = self.run_folder_name(now)
+                # times in the uplink log count from the run's start
+                self.start = (run_folder_time(now_str) if self.resume else None) or now
                 self.log_in_folder = os.path.join(
                     self.local_system_config["logger_interface"]["log_received_folder"], now_str)
                 self.log_in_dump_folder = os.path.join(self.log_in_folder, "dump")
@@ -497,18 +1567,32 @@ class Listener():
                     print("created uplink log folder:\t", self.log_out_folder)
 
                 self.log_out_file = os.path.join(
-                    self.log_out_folder, "uplink.log")
-                self.log_out = open(self.log_out_file, "w")
+                    self.log_out_folder, "uplink" + self.instance_name + ".log")
+                self.log_out = open(self.log_out_file, "a" if self.resume else "w")
+
+                logger_interface = self.local_system_config["logger_interface"]
                 self.downlink_catch_file = os.path.join(
-                    self.log_in_folder, "catch.log")
-                self.downlink_catch = open(self.downlink_catch_file, "w")
+                    self.log_in_folder, "catch" + self.instance_name + ".bin")
+                self.downlink_catch = CatchLogWriter(
+                    self.downlink_catch_file,
+                    int(now.timestamp()*1e9),
+                    summary_interval=logger_interface.get("catch_summary_s", 5.0),
+                    append=self.resume
+                )
+                self.writer = LogWriter(
+                    logger_interface.get("writer_queue_frames", 1024),
+                    logger_interface.get("writer_overflow", "block")
+                )
+                self._writer_dropped = 0
+                self.journal = self.open_journal(logger_interface)
+                self.frame_events = FrameEventPublisher()
                 self.downlink_lookup = self.make_log_dict(json_dict)
 
             except KeyError:
                 print("can't create log files!")
                 raise RuntimeError
 
-            self.unix_socket_path = self.local_system_config["logger_interface"]["unix_listen_socket"]
+            self.unix_socket_path = self.local_system_config["logger_interface"]["unix_listen_socket"] + self.instance_name
 
             try:
                 os.unlink(self.unix_socket_path)
@@ -526,6 +1610,15 @@ class Listener():
                 self.mcast_group = self.local_system_config["ethernet_interface"]["mcast_group"]
             except KeyError:
                 self.mcast_group = None
+            try:
+                self.recv_buffer_size = self.local_system_config["ethernet_interface"]["recv_buffer_bytes"]
+            except KeyError:
+                self.recv_buffer_size = None
+            # kernel-side datagram drops on the downlink socket, as of
+            # the last call to `self.check_kernel_drops()`:
+            self.kernel_drops = 0
+            self._drop_check_interval = 1.0
+
             self.local_recv_address = self.local_system_config["ethernet_interface"]["address"]
             
             self.local_recv_port = self.local_system_config["ethernet_interface"]["port"]
@@ -535,17 +1628,21 @@ class Listener():
             self.remote_address = self.remote_system_config["ethernet_interface"]["address"]
             self.remote_port = self.local_recv_port
             self.remote_endpoint = (self.remote_address, self.remote_port)
+
+            # downlink datagrams are received into this reused buffer:
+            self._recv_buffer = bytearray(2048)
+            self._recv_view = memoryview(self._recv_buffer)
             
             self.unix_socket = socket.socket(socket.AF_UNIX, socket.SOCK_DGRAM)
             self.unix_socket.bind(self.unix_socket_path)
-            self.unix_socket.settimeout(0.001)
+            self.unix_socket.setblocking(False)
 
             self.set_command_interface(command_interface)
 
             print("listening for command (to forward) on Unix datagram socket at:\t",
                   self.unix_socket_path)
             
-            self._uplink_message_queue = queue.Queue()
+            self.uplink = UplinkSender(self.send_command)
             # self.print()
 
             try:
@@ -554,17 +1651,26 @@ class Listener():
                 self.__del__()
 
     def __del__(self):
+        # send any commands still queued
+        self.uplink.stop()
+
         # close sockets
         self.unix_socket.close()
         self.local_recv_socket.close()
         # remove the unix socket file os.remove(self.unix_socket_path)
 
+        # finish queued writes before closing the files underneath them
+        if self.journal is not None:
+            self.journal.close()
+        self.writer.stop()
+        self.frame_events.close()
+
         # close all log files
         self.log_out.close()
         self.downlink_catch.close()
         for system in self.downlink_lookup.keys():
             for data in self.downlink_lookup[system].keys():
-                self.downlink_lookup[system][data].file.close()
+                self.downlink_lookup[system][data].close()
 
     def set_command_interface(self, interface:str):
         success = False
@@ -592,7 +1698,16 @@ class Listener():
             print("ERROR: can only use uplink interface for commanding")
             raise RuntimeError
 
-        # setup UDP interface
+        self.open_downlink_socket()
+        return True
+
+    def open_downlink_socket(self):
+        """
+        Opens `self.local_recv_socket`, the non-blocking downlink socket:
+        joined to `self.mcast_group` if that is a multicast address,
+        otherwise bound to `self.local_recv_endpoint` and connected to
+        `self.remote_endpoint`.
+        """
         if self.mcast_group is not None and ipaddress.IPv4Address(self.mcast_group).is_multicast:
             print("got multicast address")
             # open the socket for standard use
@@ -612,15 +1727,66 @@ class Listener():
         else:
             # listen on a unicast socket    
             self.local_recv_socket = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
-            self.local_recv_socket.bind((self.local_recv_address, self.local_recv_port))
+            self.local_recv_socket.bind(self.local_recv_endpoint)
             self.local_recv_socket.connect(self.remote_endpoint)
+            bound_address, bound_port = self.local_recv_socket.getsockname()
             print("listening for downlink (to log) on Ethernet datagram socket at:\t",
-                self.local_recv_address + ":" + str(self.local_recv_port))
+                bound_address + ":" + str(bound_port))
+
+        if self.recv_buffer_size is not None:
+            self.local_recv_socket.setsockopt(socket.SOL_SOCKET, socket.SO_RCVBUF, int(self.recv_buffer_size))
+        print("downlink socket receive buffer:\t", 
+              self.local_recv_socket.getsockopt(socket.SOL_SOCKET, socket.SO_RCVBUF), "bytes")
             
-        self.local_recv_socket.settimeout(0.01)
-        return True
+        self.local_recv_socket.setblocking(False)
+
+    def run_folder_name(self, now: datetime):
+        """
+        Name of the folder (under the received and sent log folders) for
+        a run started at `now`, e.g. `"17-10-2026_1-45-4"`. When
+        resuming, the newest existing run folder instead.
+        """
+        if self.resume:
+            folder = self.local_system_config["logger_interface"]["log_received_folder"]
+            newest = newest_run_folder(folder)
+            if newest is not None:
+                print("resuming run:\t", newest)
+                return newest
+            print("no run to resume in", folder, "; starting a new one")
+        return run_folder_name(now)
+
+    def open_journal(self, logger_interface: dict):
+        """
+        Creates the run's `PacketJournal` if `logger_interface` has
+        `"packet_journal": true`.
+
+        Returns
+        -------
+        None or PacketJournal
+        """
+        if not logger_interface.get("packet_journal", False):
+            return None
+        journal = PacketJournal(
+            os.path.join(self.log_in_folder, "journal" + self.instance_name),
+            self.writer,
+            logger_interface.get("journal_segment_bytes", DEFAULT_SEGMENT_BYTES),
+            logger_interface.get("journal_batch_bytes", DEFAULT_BATCH_BYTES)
+        )
+        print("journaling downlink packets to:\t", journal.folder)
+        return journal
     
     def send_command(self, command:bytes):
+        """
+        Writes `command` to the uplink interface and the uplink log.
+
+        Called from the `UplinkSender` thread (see `self.uplink`), so
+        a slow serial device does not hold up downlink reception.
+
+        Returns
+        -------
+        Bool
+            `True` if the command was sent.
+        """
         try:
             if self.command_interface == "uplink":
                 self.uplink_port.write(command)
@@ -630,127 +1796,380 @@ class Listener():
                 raise "Ethernet-based commanding has been removed!"
             
             self.write_to_uplink_log(command)
+            return True
         except Exception as e:
             print("Got Exception while sending uplink command: ", e)
+            return False
     
     def read_unix_socket_to_queue(self):
         """
-        Checks for available commands in local Unix socket.
+        Checks for available commands in local Unix socket, and hands
+        any to `self.handle_control_message()`.
 
-        If data (of length 2) is available, it is added to the uplink
-        queue for later transmission.
+        Returns
+        -------
+        Bool
+            `True` if a message was read from the socket, `False` if
+            none was waiting.
         """
-        # do not validate, just check length
         try:
-            data, sender = self.unix_socket.recvfrom(4096)
-            print("queueing", len(data), "bytes")
-            if len(data) == 2:
-                # check if this is the "kill Listener" command, or just
-                # a normal command:
-                if data[0] == 0x00 and data[1] == 0xff:
-                    print("received Listener terminate message")
-                    for system in self.downlink_lookup.keys():
-                        for data in self.downlink_lookup[system].keys():
-                            dump_counters = [f.get_frame_counter() for f in self.downlink_lookup[system][data].frames]
-                            for counter in dump_counters:
-                                self.downlink_lookup[system][data].dump(counter)
-                            self.downlink_lookup[system][data].dumpfile.close()
-                    return
-                elif data[0] == 0x00 and data[1] == 0xcb:
-                    # clear frame buffer to log folder, so you can see the results
-                    print("clearing frame buffers to log folder")
-                    for system in self.downlink_lookup.keys():
-                        for data in self.downlink_lookup[system].keys():
-                            pre_clear = len(self.downlink_lookup[system][data].frames)
-                            clear_counters = [f.get_frame_counter() for f in self.downlink_lookup[system][data].frames]
-                            for counter in clear_counters:
-                                self.downlink_lookup[system][data].write(counter)
-                            print("pre:", pre_clear, "post clear:", len(self.downlink_lookup[system][data].frames))
-                    return
-                elif data[0] == 0x00 and data[1] == 0xcd:
-                    # clear frame buffer to dump folder
-                    print("clearing frame buffers to dump folder")
-                    for system in self.downlink_lookup.keys():
-                        for data in self.downlink_lookup[system].keys():
-                            pre_clear = len(self.downlink_lookup[system][data].frames)
-                            dump_counters = [f.get_frame_counter() for f in self.downlink_lookup[system][data].frames]
-                            for counter in dump_counters:
-                                self.downlink_lookup[system][data].dump(counter)
-                            print("pre:", pre_clear, "post clear:", len(self.downlink_lookup[system][data].frames))
-                    return
-                else:
-                    self._uplink_message_queue.put([data[0], data[1]])
-            else:
-                print("ignored bad-length uplink command: ", data)
-        except socket.timeout:
+            data, sender = self.unix_socket.recvfrom(1 << 16)
+        except (BlockingIOError, socket.timeout):
+            return False
+        self.handle_control_message(data, sender)
+        return True
+
+    def handle_control_message(self, data: bytes, sender):
+        """
+        Acts on one message received on the local Unix socket.
+
+        Commands (of length 2) are queued on `self.uplink` for
+        transmission, apart from the Listener's own 0x00 0xff
+        (terminate), 0x00 0xcb (clear frames to log) and 0x00 0xcd
+        (clear frames to dump). Subscriptions to frame-written events
+        (see `FoGSE.io.frame_events`) and requests for ingest
+        statistics (see `FoGSE.io.ingest_stats`) are also handled here.
+
+        Parameters
+        ----------
+        data : bytes
+            The message.
+
+        sender : str
+            Address of the sending socket (empty if it is unbound).
+        """
+        # do not validate, just check length
+        if data[:2] == SUBSCRIBE and len(data) > 2:
+            self.subscribe_frame_events(sender, data[2:].decode("utf-8", "replace"))
+            return
+        if data == UNSUBSCRIBE:
+            if sender:
+                self.frame_events.unsubscribe(sender)
             return
+        if data == STATS_REQUEST:
+            self.send_stats(sender)
+            return
+        print("queueing", len(data), "bytes")
+        if len(data) == 2:
+            # check if this is the "kill Listener" command, or just
+            # a normal command:
+            if data[0] == 0x00 and data[1] == 0xff:
+                print("received Listener terminate message")
+                for system in self.downlink_lookup.keys():
+                    for data in self.downlink_lookup[system].keys():
+                        dump_counters = list(self.downlink_lookup[system][data].frames.keys())
+                        for counter in dump_counters:
+                            self.downlink_lookup[system][data].dump(counter)
+                if self.journal is not None:
+                    self.journal.flush()
+                self.writer.join()
+                self.downlink_catch.report()
+                for system in self.downlink_lookup.keys():
+                    for data in self.downlink_lookup[system].keys():
+                        self.downlink_lookup[system][data].dumpfile.close()
+                return
+            elif data[0] == 0x00 and data[1] == 0xcb:
+                # clear frame buffer to log folder, so you can see the results
+                print("clearing frame buffers to log folder")
+                for system in self.downlink_lookup.keys():
+                    for data in self.downlink_lookup[system].keys():
+                        pre_clear = len(self.downlink_lookup[system][data].frames)
+                        clear_counters = list(self.downlink_lookup[system][data].frames.keys())
+                        for counter in clear_counters:
+                            self.downlink_lookup[system][data].write(counter)
+                        print("pre:", pre_clear, "post clear:", len(self.downlink_lookup[system][data].frames))
+                return
+            elif data[0] == 0x00 and data[1] == 0xcd:
+                # clear frame buffer to dump folder
+                print("clearing frame buffers to dump folder")
+                for system in self.downlink_lookup.keys():
+                    for data in self.downlink_lookup[system].keys():
+                        pre_clear = len(self.downlink_lookup[system][data].frames)
+                        dump_counters = list(self.downlink_lookup[system][data].frames.keys())
+                        for counter in dump_counters:
+                            self.downlink_lookup[system][data].dump(counter)
+                        print("pre:", pre_clear, "post clear:", len(self.downlink_lookup[system][data].frames))
+                return
+            else:
+                self.uplink.submit(data)
+        else:
+            print("ignored bad-length uplink command: ", data)
+        return
+
+    def subscribe_frame_events(self, sender, log_path: str):
+        """
+        Subscribes `sender` (a bound Unix datagram socket address) to
+        frame-written events for the log file at `log_path`.
+
+        Returns
+        -------
+        Bool
+            `True` if a matching log file was found.
+        """
+        if not sender:
+            print("can't send frame events to an unbound socket")
+            return False
+        log_path = os.path.realpath(log_path)
+        for system in self.downlink_lookup.keys():
+            for data in self.downlink_lookup[system].keys():
+                if os.path.realpath(self.downlink_lookup[system][data].filepath) == log_path:
+                    self.frame_events.subscribe(sender, system, data)
+                    print("subscribed", sender, "to frame events for", log_path)
+                    return True
+        return False
+
+    def get_stats(self):
+        """
+        Collects ingest statistics from every `LogFileManager`, along
+        with Listener-wide counters.
+
+        Returns
+        -------
+        dict
+            `"logs"` maps each log file's name (e.g. `"cdte1_pc"`) to
+            its `LogFileManager.get_stats()`. `"listener"` holds the
+            uptime, kernel drops, catch log and journal packets, and
+            `LogWriter` and `UplinkSender` status.
+        """
+        logs = {}
+        for system in self.downlink_lookup.keys():
+            for data in self.downlink_lookup[system].keys():
+                manager = self.downlink_lookup[system][data]
+                name = os.path.splitext(os.path.basename(manager.filepath))[0]
+                logs[name] = manager.get_stats()
+        return {
+            "logs": logs,
+            "listener": {
+                "uptime_s": (datetime.now() - self.start).total_seconds(),
+                "kernel_drops": self.kernel_drops,
+                "catch_packets": self.downlink_catch.packets,
+                "journal_packets": None if self.journal is None else self.journal.packets,
+                "uplink": {
+                    "queued": self.uplink.depth,
+                    "sent": self.uplink.sent,
+                    "failed": self.uplink.failed,
+                    "last_latency_ms": None if self.uplink.last_command is None else self.uplink.last_command.latency_ms
+                },
+                "writer": self.check_writer()
+            }
+        }
+
+    def send_stats(self, sender):
+        """
+        Sends `self.get_stats()` as JSON to `sender` (a bound Unix
+        datagram socket address).
+
+        Returns
+        -------
+        Bool
+            `True` if the reply was sent.
+        """
+        if not sender:
+            print("can't send stats to an unbound socket")
+            return False
+        try:
+            self.unix_socket.sendto(json.dumps(self.get_stats()).encode("utf-8"), sender)
+        except OSError as e:
+            print("couldn't send stats to", sender, e)
+            return False
+        return True
+
+    def update_rates(self, now: float=None):
+        """
+        Samples packet and byte rates in every `LogFileManager` (see
+        `LogFileManager.update_rates()`).
+        """
+        for system in self.downlink_lookup.keys():
+            for data in self.downlink_lookup[system].keys():
+                self.downlink_lookup[system][data].update_rates(now)
 
     def read_local_socket_to_log(self):
         """
-        Checks for data present in the local Ethernet socket.
+        Checks for data present in the local Ethernet socket, and hands
+        any datagram to `self.log_datagram()`.
+
+        Returns
+        -------
+        Bool
+            `True` if a datagram was read from the socket, `False` if
+            none was waiting.
+        """
+        journal = self.journal
+        try:
+            if journal is None:
+                nbytes = self.local_recv_socket.recv_into(self._recv_buffer)
+                data = self._recv_view[:nbytes]
+            else:
+                # read straight into the journal, saving a copy
+                data = journal.receive(self.local_recv_socket, len(self._recv_buffer))
+        except (BlockingIOError, socket.timeout):
+            # print("read timed out")
+            return False
+        # print("logging", len(data), "bytes")
+        self.log_datagram(data, journaled=journal is not None)
+        return True
+
+    def log_datagram(self, data, journaled: bool=False):
+        """
+        Logs one downlink datagram.
 
-        If data is available, try to log it by looking up a
-        `LogFileManager` to use. If no appropriate log file can be
+        The datagram is journaled (if enabled), then logged by looking
+        up a `LogFileManager` to use. If no appropriate log file can be
         found, it is time-tagged and added (fully in raw form, including
         header) to a catch-all log file.
+
+        Parameters
+        ----------
+        data : bytes-like
+            The datagram, including its 8-byte header. May be a
+            `memoryview` into a reused receive buffer.
+
+        journaled : bool
+            `True` if `data` is already in the journal (read with
+            `PacketJournal.receive()`).
         """
+        if self.journal is not None and not journaled:
+            self.journal.append(data)
+        if len(data) < self.header_size:
+            return
         try:
-            data, sender = self.local_recv_socket.recvfrom(2048)
-            # print("logging", len(data), "bytes")
-            if len(data) < 8:
-                return
-          
             self.downlink_lookup[data[0x00]][data[0x05]].enqueue(data)
-          
-
-            # try:
-            #     self.downlink_lookup[data[0x00]][data[0x05]].enqueue(data)
-            # except KeyError: print("got unloggable packet with header:
-            #     ", data[:8].hex()) self.write_to_catch(data) return
-            #     except Exception as e: print("other error: ", e) #
-            #     todo: dump this in a aggregate log
-        except socket.timeout:
-            # print("read timed out")
-            return
         except KeyError:
             self.write_to_catch(data)
 
+    def check_kernel_drops(self):
+        """
+        Reads the kernel's receive-queue overflow counter for the
+        downlink socket.
+
+        On Linux the per-socket `drops` column of `/proc/net/udp` counts
+        datagrams discarded because the socket receive buffer was full.
+        If the counter has grown since the last call, the increase is
+        printed. On other platforms nothing is reported.
+
+        Returns
+        -------
+        None or int
+            Total datagrams dropped by the kernel on this socket, or
+            `None` if the counter is not available.
+        """
+        drops = read_udp_socket_drops(self.local_recv_socket)
+        if drops is None:
+            return None
+        if drops > self.kernel_drops:
+            print("kernel dropped", drops - self.kernel_drops, 
+                  "downlink datagrams (total", str(drops) + ")")
+        self.kernel_drops = drops
+        return drops
+
+    def check_writer(self):
+        """
+        Reports new frame drops from the `LogWriter` queue, along with
+        its current depth and high-water mark.
+
+        Returns
+        -------
+        dict
+            The writer's `depth`, `high_water`, `max_frames`, `dropped`
+            and `write_calls` values.
+        """
+        status = {
+            "depth": self.writer.depth,
+            "high_water": self.writer.high_water,
+            "max_frames": self.writer.max_frames,
+            "dropped": self.writer.dropped,
+            "write_calls": self.writer.write_calls
+        }
+        if status["dropped"] > self._writer_dropped:
+            print("writer queue dropped", status["dropped"] - self._writer_dropped,
+                  "frames (depth", str(status["depth"]) + ", high-water", 
+                  str(status["high_water"]) + "/" + str(status["max_frames"]) + ")")
+            self._writer_dropped = status["dropped"]
+        return status
+
+    def evict_stale_frames(self, now: float=None):
+        """
+        Dumps incomplete frames that have timed out in every
+        `LogFileManager` (see `LogFileManager.evict_stale()`).
+
+        Returns
+        -------
+        int
+            The total number of frames evicted.
+        """
+        total = 0
+        for system in self.downlink_lookup.keys():
+            for data in self.downlink_lookup[system].keys():
+                manager = self.downlink_lookup[system][data]
+                evicted = manager.evict_stale(now)
+                if evicted > 0:
+                    print("evicted", evicted, "stale frames from", manager.filepath,
+                          "(total stale:", str(manager.evicted_stale) + ", full:", 
+                          str(manager.evicted_full) + ")")
+                total += evicted
+        return total
+
+    def housekeeping(self, now: float=None):
+        """
+        Periodic checks, run about every `self._drop_check_interval`
+        seconds by the receive loop: reports kernel and writer drops,
+        evicts stale frames, samples ingest rates, and flushes the catch
+        log and journal.
+
+        Parameters
+        ----------
+        now : float
+            Current `time.monotonic()` value, if the caller already has
+            it.
+        """
+        if now is None:
+            now = time.monotonic()
+        self.check_kernel_drops()
+        self.check_writer()
+        self.evict_stale_frames(now)
+        self.update_rates(now)
+        self.downlink_catch.report(now)
+        if self.journal is not None:
+            self.journal.flush()
+
     def _run_log(self):
         """
         Main loop that checks for data from both Unix and Ethernet
         sockets.
 
+        Blocks in `select` until either socket is readable, then reads
+        the datagrams queued on it, up to `MAX_DATAGRAMS_PER_WAKEUP`
+        before going back to `select` so the other socket and the
+        housekeeping timers get a turn. A socket with more waiting is
+        still readable, so `select` returns straight away.
+
         Delegates logging of Ethernet raw data to
         `self.read_local_socket_to_log()` and queueing of Unix socket
-        commands to `self.read_unix_socket_to_queue()`.
+        commands to `self.read_unix_socket_to_queue()`. Queued uplink
+        commands are sent by the `self.uplink` thread, so serial I/O
+        never blocks this loop.
         """
+        selector = selectors.DefaultSelector()
+        selector.register(self.unix_socket, selectors.EVENT_READ, self.read_unix_socket_to_queue)
+        selector.register(self.local_recv_socket, selectors.EVENT_READ, self.read_local_socket_to_log)
+        last_drop_check = time.monotonic()
+        journal = self.journal
+
         # with self.unix_socket:
         while True:
-            self.read_unix_socket_to_queue()
-            # handle any queued requests to uplink commands:
-            while self._uplink_message_queue.qsize() > 0:
-                # apparently queues are thread safe.
-
-                # pop command from the front of the list (FIFO):
-                message = []
-                try:
-                    message = self._uplink_message_queue.get(block=False)
-                except queue.Empty:
-                    print("uplink queue already empty!")
-
-                # expect all `command` to be <system> <command> `int`
-                # pairs
-                try:
-                    if len(message) == 2:
-                        self.send_command(bytes(message))
-                    else:
-                        print("found bad uplink command in queue! discarding.")
-                except Exception as e:
-                    print("couldn't send uplink command! ignoring.")
-                    print("\tException:",e)
-                    continue
-            self.read_local_socket_to_log()
-            # time.sleep(0.01)
+            for key, _ in selector.select(timeout=self._drop_check_interval):
+                if journal is not None:
+                    # one arrival time for the datagrams of this burst
+                    journal.stamp()
+                # read a burst of what is queued on this socket:
+                for _ in range(MAX_DATAGRAMS_PER_WAKEUP):
+                    if not key.data():
+                        break
+
+            now = time.monotonic()
+            if now - last_drop_check >= self._drop_check_interval:
+                self.housekeeping(now)
+                last_drop_check = now
 
     def make_log_dict(self, json_dict):
         """
@@ -783,8 +2202,26 @@ class Listener():
                             addr,
                             DOWNLINK_TYPE_ENUM[key],
                             int(rbif[key]["ring_frame_size_bytes"], 16),
-                            self.max_receive_size
+                            self.max_receive_size,
+                            writer=self.writer,
+                            flush_bytes=rbif[key].get("flush_bytes", DEFAULT_FLUSH_BYTES),
+                            flush_ms=rbif[key].get("flush_ms", DEFAULT_FLUSH_MS),
+                            max_frames=rbif[key].get("max_frames_in_flight", DEFAULT_MAX_FRAMES_IN_FLIGHT),
+                            frame_timeout_ms=rbif[key].get("frame_timeout_ms", DEFAULT_FRAME_TIMEOUT_MS),
+                            segment_bytes=rbif[key].get("segment_bytes", 0),
+                            segment_s=rbif[key].get("segment_s", 0),
+                            preallocate_bytes=rbif[key].get("preallocate_bytes", 0),
+                            resume=self.resume
                         )
+                        log_info.on_frame_written = self.frame_events.publish
+                        slots = rbif[key].get("shared_ring_slots", 
+                                              DEFAULT_RING_SLOTS if key in RING_DATA_TYPES else 0)
+                        if slots > 0:
+                            try:
+                                log_info.ring = FrameRing(pathname, log_info.frame_len, slots)
+                            except OSError as e:
+                                print(e)
+                                print("\tcouldn't create shared memory frame ring for ", name, key)
                         lookup[addr][DOWNLINK_TYPE_ENUM[key]] = log_info
                         print("opened downlink log: ", log_info.filepath)
                     except Exception as e:
@@ -815,9 +2252,10 @@ class Listener():
         """
         Writes raw data to catch-all log file.
 
-        To be used if a dedicated log file cannot be found. Raw data
-        bytes will be time-tagged at the start of the line and encoded
-        as UTF-8 for storage. Packets are newline-delimited.
+        To be used if a dedicated log file cannot be found. Packets are
+        time-tagged and appended, in raw form, to the binary catch log
+        through its buffer; a summary is printed periodically instead
+        of a line per packet (see `FoGSE.io.catch_log`).
 
         Parameters
         ----------
@@ -825,13 +2263,7 @@ class Listener():
             The raw data stream to write to the file.
 
         """
-        delta = datetime.now() - self.start
-        header = "[" + str(delta) + "]" + " "
-        content = str(data.hex()) + "\n"
-        self.downlink_catch.write(header + content)
-        self.downlink_catch.flush()
-        print("wrote " + str(len(data)) +
-              " bytes to " + self.downlink_catch_file)
+        self.downlink_catch.write(data)
 
     def print(self):
         for system in self.downlink_lookup.keys():
@@ -844,14 +2276,18 @@ class Listener():
 
 if __name__ == "__main__":
     print("starting listener...")
+    # `--resume` continues the newest run instead of starting a new one
+    resume = "--resume" in sys.argv
+    if resume:
+        sys.argv.remove("--resume")
     config_arg = ""
     interface_arg = ""
     if len(sys.argv) == 3:
         config_arg = sys.argv[1]
         interface_arg = sys.argv[2]
-        log = Listener(config_arg, interface_arg)
+        log = Listener(config_arg, interface_arg, resume=resume)
     if len(sys.argv) == 2:
         config_arg = sys.argv[1]
-        log = Listener(config_arg)
+        log = Listener(config_arg, resume=resume)
     else:
-        Listener()
+        Listener(resume=resume)
@@ -0,0 +1,93 @@
+"""
+`AsyncListener`: the `listening.Listener` on an asyncio event loop.
+
+Set-up (configuration, log files, sockets, multicast membership) and
+packet handling are shared with `Listener`, so both produce the same log
+files. Only the main loop differs: the downlink socket is served by a
+`DatagramProtocol`, the Unix control socket by a Unix datagram endpoint,
+and the periodic checks by an asyncio task. Disk writes stay on the
+`LogWriter` thread, which acts as the loop's write executor: a single
+ordered writer, so frames reach each log in order, and the loop never
+waits on the disk. Uplink commands are sent by the `UplinkSender`
+thread, as in `Listener`. Frame reassembly stays on the loop's thread.
+
+This is not the fast path: asyncio allocates a new `bytes` for every
+datagram and calls back into Python once per datagram, where `Listener`
+reads bursts into a reused buffer. `tests/network/benchmark_listener.py`
+measured 15.2 us of CPU per packet here against 8.7 us for `Listener`.
+Use it where the Listener has to share an event loop with other asyncio
+code; otherwise use `listening.py`.
+
+From a shell, the same as `listening.py`:
+    python FoGSE/listening_async.py <systems.json> [--resume]
+"""
+import asyncio
+import sys
+import time
+
+from FoGSE.listening import Listener
+
+class _DownlinkProtocol(asyncio.DatagramProtocol):
+    """ Passes each downlink datagram to `Listener.log_datagram()`. """
+
+    def __init__(self, listener):
+        self.listener = listener
+
+    def datagram_received(self, data, addr):
+        self.listener.log_datagram(data)
+
+    def error_received(self, exc):
+        print("downlink socket error:", exc)
+
+class _ControlProtocol(asyncio.DatagramProtocol):
+    """ Passes each Unix socket message to `Listener.handle_control_message()`. """
+
+    def __init__(self, listener):
+        self.listener = listener
+
+    def datagram_received(self, data, addr):
+        self.listener.handle_control_message(data, addr)
+
+    def error_received(self, exc):
+        print("control socket error:", exc)
+
+class AsyncListener(Listener):
+    """
+    `Listener` whose main loop runs on asyncio instead of `selectors`.
+
+    Construct it the same way as `Listener`; it starts listening straight
+    away and runs until interrupted.
+    """
+
+    def _run_log(self):
+        """ Run the asyncio event loop until interrupted. """
+        asyncio.run(self._run_async())
+
+    async def _run_async(self):
+        loop = asyncio.get_running_loop()
+        downlink, _ = await loop.create_datagram_endpoint(
+            lambda: _DownlinkProtocol(self), sock=self.local_recv_socket)
+        # the transport otherwise allocates 256 kB for every datagram
+        downlink.max_size = len(self._recv_buffer)
+        control, _ = await loop.create_datagram_endpoint(
+            lambda: _ControlProtocol(self), sock=self.unix_socket)
+        try:
+            while True:
+                await asyncio.sleep(self._drop_check_interval)
+                self.housekeeping(time.monotonic())
+        finally:
+            downlink.close()
+            control.close()
+
+if __name__ == "__main__":
+    print("starting asyncio listener...")
+    # `--resume` continues the newest run instead of starting a new one
+    resume = "--resume" in sys.argv
+    if resume:
+        sys.argv.remove("--resume")
+    if len(sys.argv) == 3:
+        AsyncListener(sys.argv[1], sys.argv[2], resume=resume)
+    elif len(sys.argv) == 2:
+        AsyncListener(sys.argv[1], resume=resume)
+    else:
+        AsyncListener(resume=resume)
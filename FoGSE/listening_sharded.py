@@ -0,0 +1,759 @@
+"""
+`ShardedListener`: a `listening.Listener` split over several processes.
+
+The supervisor (`ShardedListener`) writes no downlink logs itself.
+Instead it starts one worker process (`ShardWorker`) per shard, each
+owning the log files of a subset of systems, and each datagram is
+handled by the worker that owns its system code (`data[0]`). On Linux,
+for a unicast downlink, the workers receive it themselves: the
+supervisor opens one socket per worker on the downlink port
+(`SO_REUSEPORT`) and has the kernel steer each datagram from the
+Formatter to its worker's socket, by system code (see
+`steering_program()`), so the supervisor never touches it. Reassembly
+and log writing then run on as many cores as there are workers.
+Otherwise (a multicast downlink, which is delivered to every socket on
+the port; the packet journal, which must see every datagram; or no
+steering on this platform) the supervisor receives every datagram, as
+the `Listener` does, and forwards it to the owning worker over loopback
+UDP. A shard may also receive straight from the Formatter on its own
+port or multicast group, in which case nothing is steered or forwarded
+to it.
+
+The supervisor keeps the Listener's other jobs: the uplink, the Unix
+control socket, the catch log (packets for systems no shard owns) and
+the packet journal. Control messages that concern logs (terminate,
+clearing frames, frame-event subscriptions) are passed on to the
+workers. All workers write to the supervisor's run folder, so log files
+have the same names and places as with a single `Listener`; each worker
+also has its own `catch_shard<N>.bin` and Unix socket
+(`<unix_listen_socket>_shard<N>`).
+
+Workers report their health (`Listener.get_stats()` and their downlink
+port) to the supervisor once a second. The supervisor's ingest
+statistics (see `FoGSE.io.ingest_stats`) combine the workers' logs, and
+list each shard's state: `"starting"`, `"ok"`, `"stale"` (no report for
+`SHARD_STALE_S` seconds) or `"exited"`.
+
+Shards are set in the local system's `logger_interface`, e.g.
+    "shards": [
+        {"systems": ["cdte1", "cdte2"]},
+        {"systems": ["cmos1", "cmos2"], "port": 10001}
+    ]
+or, without a `shards` field, systems are spread over the number of
+workers given on the command line. From a shell:
+    python FoGSE/listening_sharded.py <systems.json> [workers] [--resume]
+"""
+import ctypes
+import ipaddress
+import json
+import multiprocessing
+import os
+import selectors
+import signal
+import socket
+import struct
+import sys
+import time
+
+from FoGSE.listening import Listener
+from FoGSE.io.frame_events import SUBSCRIBE, UNSUBSCRIBE
+from FoGSE.utils import get_system_dict, get_ring_buffer_interface
+
+# worker -> supervisor: health report (JSON follows)
+SHARD_REPORT = b"\x00\xe4"
+# supervisor -> worker: a control message passed on from another socket.
+# Followed by the length of the original sender's address (one byte),
+# the address, then the original message.
+SHARD_FORWARDED = b"\x00\xe5"
+
+DEFAULT_SHARD_WORKERS = 2
+# seconds without a report before a shard is considered stale:
+SHARD_STALE_S = 5.0
+# seconds to wait for every worker to start:
+SHARD_START_TIMEOUT_S = 20.0
+
+# Linux socket options (not all exported by `socket`): a classic BPF
+# filter on one socket, and one choosing among the sockets sharing a
+# port (`SO_REUSEPORT`)
+SO_ATTACH_FILTER = 26
+SO_ATTACH_REUSEPORT_CBPF = 51
+# classic BPF: load from the network (IP) header rather than the payload
+SKF_NET_OFF = -0x100000
+# classic BPF instruction codes (`linux/filter.h`)
+BPF_LD_W_ABS = 0x20
+BPF_LD_H_ABS = 0x28
+BPF_LD_B_ABS = 0x30
+BPF_JEQ_K = 0x15
+BPF_RET_K = 0x06
+# one classic BPF instruction: code, jump if true, jump if false, constant
+BPF_INSTRUCTION = struct.Struct("HBBI")
+
+def bpf_program(instructions):
+    """
+    Pack classic BPF `instructions` ((code, jt, jf, k) tuples) for
+    `setsockopt()`.
+
+    Returns
+    -------
+    tuple
+        The `struct sock_fprog` bytes to pass, and the buffer holding
+        the instructions, which must be kept until the call returns.
+    """
+    code = ctypes.create_string_buffer(b"".join(BPF_INSTRUCTION.pack(c, jt, jf, k & 0xffffffff)
+                                                for c, jt, jf, k in instructions))
+    return struct.pack("HP", len(instructions), ctypes.addressof(code)), code
+
+def steering_program(source_address: str, index_for_system: dict):
+    """
+    Classic BPF program for `SO_ATTACH_REUSEPORT_CBPF` that picks, for
+    each datagram, which of the sockets sharing a port receives it.
+
+    Datagrams from `source_address` go to the socket numbered
+    `index_for_system[data[0]]` (sockets are numbered in the order they
+    were bound); any other datagram goes to socket 0.
+
+    Parameters
+    ----------
+    source_address : str
+        IPv4 address the downlink comes from.
+
+    index_for_system : dict
+        Socket number for each system code.
+
+    Returns
+    -------
+    list
+        (code, jt, jf, k) instructions, for `bpf_program()`.
+    """
+    source = struct.unpack(">I", socket.inet_aton(source_address))[0]
+    program = [
+        (BPF_LD_W_ABS, 0, 0, SKF_NET_OFF + 12), # IPv4 source address
+        (BPF_JEQ_K, 1, 0, source),
+        (BPF_RET_K, 0, 0, 0),
+        (BPF_LD_B_ABS, 0, 0, 0)                 # system code
+    ]
+    for code, index in sorted(index_for_system.items()):
+        program += [(BPF_JEQ_K, 0, 1, code), (BPF_RET_K, 0, 0, index)]
+    program.append((BPF_RET_K, 0, 0, 0))
+    return program
+
+def source_filter(source_address: str, source_port: int):
+    """
+    Classic BPF program for `SO_ATTACH_FILTER` on a UDP socket that
+    keeps only datagrams from `source_address`:`source_port` (as
+    `connect()` would, for a socket that can't be connected).
+    """
+    source = struct.unpack(">I", socket.inet_aton(source_address))[0]
+    return [
+        (BPF_LD_W_ABS, 0, 0, SKF_NET_OFF + 12), # IPv4 source address
+        (BPF_JEQ_K, 0, 3, source),
+        (BPF_LD_H_ABS, 0, 0, 0),                # UDP source port
+        (BPF_JEQ_K, 0, 1, source_port),
+        (BPF_RET_K, 0, 0, 0xffff),
+        (BPF_RET_K, 0, 0, 0)
+    ]
+
+def plan_shards(json_dict, workers: int=DEFAULT_SHARD_WORKERS, shards=None):
+    """
+    Decides which systems each worker logs.
+
+    Parameters
+    ----------
+    json_dict : list
+        JSON à la foxsi4-commands/systems.json.
+
+    workers : int
+        Number of workers to spread systems over if `shards` is `None`.
+
+    shards : None or list
+        Shards from systems.json (see the module docstring). Systems
+        not listed in any shard are not logged.
+
+    Returns
+    -------
+    list
+        One `dict` per shard, with `"systems"` (system names) and the
+        optional `"port"` and `"mcast_group"`.
+
+    Raises
+    ------
+    ValueError : if two systems that share a `hex` code are given to
+    different shards, or `workers` is less than 1.
+    """
+    # systems with logs, grouped by hex code (packets carry only the
+    # code, so a code's systems must share a worker), with their number
+    # of logs:
+    groups = {}
+    for element in json_dict:
+        rbif = get_ring_buffer_interface(element)
+        if type(rbif) is not dict:
+            continue
+        group = groups.setdefault(int(element["hex"], 16), [[], 0])
+        group[0].append(element["name"])
+        group[1] += len(rbif)
+
+    if shards is None:
+        if workers < 1:
+            print("need at least one shard worker")
+            raise ValueError
+        plan = [{"systems": []} for _ in range(workers)]
+        load = [0]*workers
+        # biggest groups first, each to the least loaded worker
+        for names, logs in sorted(groups.values(), key=lambda g: -g[1]):
+            k = load.index(min(load))
+            plan[k]["systems"].extend(names)
+            load[k] += logs
+        return [shard for shard in plan if len(shard["systems"]) > 0]
+
+    plan = [dict(shard) for shard in shards]
+    owner = {}
+    for k, shard in enumerate(plan):
+        for name in shard["systems"]:
+            owner[name] = k
+    for names, _ in groups.values():
+        owners = set(owner[name] for name in names if name in owner)
+        if len(owners) > 1:
+            print("systems", names, "share a hex code but are in different shards")
+            raise ValueError
+        for name in names:
+            if name not in owner:
+                print("system", name, "is in no shard and won't be logged")
+    return plan
+
+class ShardHandle:
+    """ The supervisor's record of one worker process. """
+
+    def __init__(self, index: int, shard: dict, hexes: list):
+        self.index = index
+        self.systems = list(shard["systems"])
+        self.hexes = hexes
+        self.port = shard.get("port")
+        self.mcast_group = shard.get("mcast_group")
+        self.process = None
+        self.control_path = None
+        # this shard's socket on the downlink port, and its number there,
+        # if the kernel steers datagrams to it:
+        self.socket = None
+        self.steer_index = None
+        # where to forward this shard's datagrams, once it has reported:
+        self.downlink = None
+        self.forwarded = 0
+        self.forward_errors = 0
+        self.report = None
+        self.report_time = None
+        self.state = "starting"
+
+    def get_stats(self, now: float):
+        """ Summary of this shard for `ShardedListener.get_stats()`. """
+        listener = {} if self.report is None else self.report["stats"]["listener"]
+        return {
+            "index": self.index,
+            "systems": self.systems,
+            "pid": None if self.process is None else self.process.pid,
+            "state": self.state,
+            "steered": self.socket is not None,
+            "exitcode": None if self.process is None else self.process.exitcode,
+            "report_age_s": None if self.report_time is None else now - self.report_time,
+            "forwarded": self.forwarded,
+            "forward_errors": self.forward_errors,
+            "kernel_drops": listener.get("kernel_drops"),
+            "writer_dropped": listener.get("writer", {}).get("dropped")
+        }
+
+class ShardedListener(Listener):
+    """
+    Supervisor that spreads the `Listener`'s logging over worker
+    processes (see the module docstring).
+
+    Construct it like a `Listener`; it starts its workers and listens
+    until interrupted.
+    """
+
+    def __init__(self, json_config_file=os.path.join(__file__, "..", "..", "foxsi4-commands", "systems.json"),
+                 workers: int=DEFAULT_SHARD_WORKERS, command_interface="uplink",
+                 local_system="gse", remote_system="formatter", resume=False):
+        """
+        Parameters
+        ----------
+        json_config_file : str
+            As for `Listener`. Shards are read from the optional
+            `shards` field of the local system's `logger_interface`.
+
+        workers : int
+            Number of workers if systems.json sets no `shards`.
+
+        command_interface, local_system, remote_system : str
+            As for `Listener`.
+
+        resume : bool
+            As for `Listener`; the workers resume their logs in the
+            resumed run folder.
+
+        Raises
+        ------
+        RuntimeError : as for `Listener`.
+        ValueError : if the shards are not valid (see `plan_shards()`).
+        """
+        self.json_config_file = os.path.realpath(json_config_file)
+        self.local_system = local_system
+        self.remote_system = remote_system
+        with open(self.json_config_file, "r") as json_config:
+            json_dict = json.load(json_config)
+        local_system_config = get_system_dict(local_system, json_dict)
+        if local_system_config is None:
+            print("can't access system in provided JSON!")
+            raise RuntimeError
+        plan = plan_shards(json_dict, workers, local_system_config.get("logger_interface", {}).get("shards"))
+        codes = dict((element["name"], int(element["hex"], 16)) for element in json_dict)
+
+        self.shards = []
+        # shard owning each system code, for forwarding:
+        self._shard_for_system = [None]*256
+        for k, shard in enumerate(plan):
+            handle = ShardHandle(k, shard, [codes[name] for name in shard["systems"]])
+            self.shards.append(handle)
+            if handle.port is None:
+                for code in handle.hexes:
+                    self._shard_for_system[code] = handle
+        self._forward_socket = None
+        super().__init__(self.json_config_file, command_interface, local_system, remote_system, resume)
+
+    def __del__(self):
+        self.stop_shards()
+        if self._forward_socket is not None:
+            self._forward_socket.close()
+        for shard in self.shards:
+            if shard.socket is not None:
+                shard.socket.close()
+        super().__del__()
+
+    def open_downlink_socket(self):
+        """
+        Opens the downlink socket, and, where the kernel can steer
+        datagrams to the workers (see the module docstring), a socket
+        on the same port for each worker that would otherwise be
+        forwarded to.
+        """
+        steered = [shard for shard in self.shards if shard.port is None]
+        multicast = self.mcast_group is not None and ipaddress.IPv4Address(self.mcast_group).is_multicast
+        if len(steered) == 0 or multicast or self.journal is not None or not sys.platform.startswith("linux"):
+            super().open_downlink_socket()
+            return
+        try:
+            self.open_steered_sockets(steered)
+        except OSError as e:
+            print("can't steer downlink datagrams to shard workers, forwarding them instead:", e)
+            super().open_downlink_socket()
+
+    def open_steered_sockets(self, steered: list):
+        """
+        Opens the supervisor's downlink socket and one for each shard
+        in `steered`, all on the downlink port, and has the kernel
+        steer each datagram to the one owning its system.
+
+        The supervisor's socket is first on the port (socket 0 of
+        `steering_program()`), taking datagrams no worker owns. It
+        can't be connected (the kernel doesn't steer among connected
+        sockets), so it filters out datagrams from anywhere but the
+        Formatter itself. The supervisor keeps the workers' sockets
+        open, so the sockets keep their numbers if a worker exits.
+
+        Raises
+        ------
+        OSError : if the sockets can't be opened or steered (the
+        supervisor's socket is then closed too).
+        """
+        sockets = []
+        try:
+            for k in range(len(steered) + 1):
+                sock = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
+                sockets.append(sock)
+                sock.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEPORT, 1)
+                if self.recv_buffer_size is not None:
+                    sock.setsockopt(socket.SOL_SOCKET, socket.SO_RCVBUF, int(self.recv_buffer_size))
+                if k == 0:
+                    # until every socket is bound, everything comes here
+                    # (rather than to whichever worker's socket the
+                    # kernel would pick)
+                    program, code = bpf_program([(BPF_RET_K, 0, 0, 0)])
+                    sock.setsockopt(socket.SOL_SOCKET, SO_ATTACH_REUSEPORT_CBPF, program)
+                    program, code = bpf_program(source_filter(*self.remote_endpoint))
+                    sock.setsockopt(socket.SOL_SOCKET, SO_ATTACH_FILTER, program)
+                    sock.bind(self.local_recv_endpoint)
+                else:
+                    sock.bind(sockets[0].getsockname())
+            for k, shard in enumerate(steered):
+                shard.socket = sockets[k + 1]
+                shard.steer_index = k + 1
+            self.local_recv_socket = sockets[0]
+            self.steer()
+        except OSError:
+            for shard in steered:
+                shard.socket = shard.steer_index = None
+            for sock in sockets:
+                sock.close()
+            raise
+        bound_address, bound_port = self.local_recv_socket.getsockname()
+        print("listening for downlink (to log) on Ethernet datagram socket at:\t",
+              bound_address + ":" + str(bound_port), "steered to", len(steered), "shard workers")
+        print("downlink socket receive buffer:\t",
+              self.local_recv_socket.getsockopt(socket.SOL_SOCKET, socket.SO_RCVBUF), "bytes")
+        self.local_recv_socket.setblocking(False)
+
+    def steer(self):
+        """
+        Steers each system's datagrams to the socket of the shard that
+        owns it, unless that shard's worker has exited (its systems then
+        come to the supervisor, which writes them to the catch log).
+
+        Raises
+        ------
+        OSError : if the steering program can't be attached.
+        """
+        index_for_system = {}
+        for shard in self.shards:
+            if shard.socket is not None and shard.state != "exited":
+                for code in shard.hexes:
+                    index_for_system[code] = shard.steer_index
+        program, code = bpf_program(steering_program(self.remote_address, index_for_system))
+        self.local_recv_socket.setsockopt(socket.SOL_SOCKET, SO_ATTACH_REUSEPORT_CBPF, program)
+
+    def make_log_dict(self, json_dict):
+        """ The supervisor keeps no downlink logs: the workers do. """
+        return {}
+
+    def start_shards(self):
+        """
+        Starts a worker process for each shard, and waits (up to
+        `SHARD_START_TIMEOUT_S`) for each to report that it is receiving.
+
+        Returns
+        -------
+        Bool
+            `True` if every worker started.
+        """
+        self._forward_socket = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
+        self._forward_socket.bind(("127.0.0.1", 0))
+        forward_endpoint = self._forward_socket.getsockname()
+
+        # a fresh interpreter per worker, rather than a fork of this
+        # (threaded) process
+        context = multiprocessing.get_context("spawn")
+        for shard in self.shards:
+            shard.control_path = self.unix_socket_path + ShardWorker.shard_instance_name(shard.index)
+            shard.process = context.Process(
+                target=run_shard_worker,
+                args=(self.json_config_file, shard.index, {"systems": shard.systems, "port": shard.port,
+                      "mcast_group": shard.mcast_group}, os.path.basename(self.log_in_folder),
+                      self.unix_socket_path, forward_endpoint, self.local_system, self.remote_system,
+                      self.resume, shard.socket),
+                name="shard" + str(shard.index)
+            )
+            shard.process.start()
+            print("started shard", shard.index, "(pid", str(shard.process.pid) + ") for", ", ".join(shard.systems))
+
+        # meanwhile, downlink datagrams wait in the kernel receive buffer
+        selector = selectors.DefaultSelector()
+        selector.register(self.unix_socket, selectors.EVENT_READ)
+        deadline = time.monotonic() + SHARD_START_TIMEOUT_S
+        while any(shard.report is None and shard.process.is_alive() for shard in self.shards):
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                break
+            if selector.select(timeout=min(remaining, 0.5)):
+                while self.read_unix_socket_to_queue():
+                    pass
+        selector.close()
+        started = all(shard.report is not None for shard in self.shards)
+        if not started:
+            print("not every shard worker started:", ", ".join(
+                str(shard.index) for shard in self.shards if shard.report is None))
+        return started
+
+    def stop_shards(self, timeout: float=5.0):
+        """ Waits for the workers to exit, interrupting any that don't. """
+        for shard in self.shards:
+            if shard.process is None:
+                continue
+            # on Ctrl-C, the workers were interrupted along with us
+            shard.process.join(2.0)
+            if shard.process.is_alive():
+                os.kill(shard.process.pid, signal.SIGINT)
+                shard.process.join(timeout)
+            if shard.process.is_alive():
+                print("shard", shard.index, "didn't exit; terminating")
+                shard.process.terminate()
+                shard.process.join()
+            shard.downlink = None
+
+    def _run_log(self):
+        self.start_shards()
+        super()._run_log()
+
+    def log_datagram(self, data, journaled: bool=False):
+        """
+        Journals a downlink datagram (if enabled, and `journaled` is
+        not set) and forwards it to the worker that owns its system, or
+        writes it to the catch log if no running worker does.
+        """
+        if self.journal is not None and not journaled:
+            self.journal.append(data)
+        if len(data) < self.header_size:
+            return
+        shard = self._shard_for_system[data[0x00]]
+        if shard is None or shard.downlink is None:
+            self.write_to_catch(data)
+            return
+        try:
+            self._forward_socket.sendto(data, shard.downlink)
+            shard.forwarded += 1
+        except OSError:
+            shard.forward_errors += 1
+
+    def handle_control_message(self, data: bytes, sender):
+        """
+        As `Listener.handle_control_message()`, but also takes worker
+        health reports, and passes log-related messages on to the
+        workers.
+        """
+        if data[:2] == SHARD_REPORT and len(data) > 2:
+            self.receive_shard_report(data[2:])
+            return
+        if data[:2] == SUBSCRIBE and len(data) > 2:
+            name = os.path.splitext(os.path.basename(data[2:].decode("utf-8", "replace")))[0]
+            for shard in self.shards:
+                if shard.report is not None and name in shard.report["stats"]["logs"]:
+                    self.forward_control_message(shard, data, sender)
+                    return
+            print("no shard has a log for", data[2:])
+            return
+        if data == UNSUBSCRIBE or (len(data) == 2 and data[0] == 0x00 and data[1] in (0xff, 0xcb, 0xcd)):
+            for shard in self.shards:
+                self.forward_control_message(shard, data, sender)
+        super().handle_control_message(data, sender)
+
+    def forward_control_message(self, shard: ShardHandle, data: bytes, sender):
+        """ Passes a control message from `sender` on to `shard`'s worker. """
+        sender = (sender or "").encode("utf-8")
+        try:
+            self.unix_socket.sendto(SHARD_FORWARDED + bytes([len(sender)]) + sender + data, shard.control_path)
+        except OSError as e:
+            print("couldn't pass control message to shard", shard.index, e)
+
+    def receive_shard_report(self, payload: bytes):
+        """ Records a health report from a worker. """
+        try:
+            report = json.loads(payload.decode("utf-8"))
+            shard = self.shards[report["index"]]
+        except (ValueError, KeyError, IndexError):
+            print("ignored bad shard report")
+            return
+        if shard.report is None and shard.port is None and shard.socket is None:
+            shard.downlink = ("127.0.0.1", report["downlink_port"])
+        shard.report = report
+        shard.report_time = time.monotonic()
+
+    def check_shards(self, now: float=None):
+        """
+        Updates each shard's state, printing any change, and stops
+        forwarding to workers that have exited.
+
+        Returns
+        -------
+        int
+            Number of shards in the `"ok"` state.
+        """
+        if now is None:
+            now = time.monotonic()
+        healthy = 0
+        for shard in self.shards:
+            if shard.process is None:
+                continue
+            if not shard.process.is_alive():
+                state = "exited"
+                # its packets go to the catch log from now on
+                shard.downlink = None
+            elif shard.report_time is None:
+                state = "starting"
+            elif now - shard.report_time > SHARD_STALE_S:
+                state = "stale"
+            else:
+                state = "ok"
+            if state != shard.state:
+                print("shard", shard.index, "is", state, "(was", shard.state + ")" +
+                      ("" if state != "exited" else ", exit code " + str(shard.process.exitcode)))
+                shard.state = state
+                if state == "exited" and shard.socket is not None:
+                    try:
+                        self.steer()
+                    except OSError as e:
+                        print("couldn't steer shard", shard.index, "systems away:", e)
+            if state == "ok":
+                healthy += 1
+        return healthy
+
+    def housekeeping(self, now: float=None):
+        if now is None:
+            now = time.monotonic()
+        super().housekeeping(now)
+        self.check_shards(now)
+
+    def get_stats(self):
+        """
+        As `Listener.get_stats()`, with every worker's logs (as of its
+        last report) under `"logs"`, and `"shards"` (see
+        `ShardHandle.get_stats()`) under `"listener"`.
+        """
+        stats = super().get_stats()
+        now = time.monotonic()
+        for shard in self.shards:
+            if shard.report is not None:
+                stats["logs"].update(shard.report["stats"]["logs"])
+        stats["listener"]["shards"] = [shard.get_stats(now) for shard in self.shards]
+        return stats
+
+class ShardWorker(Listener):
+    """
+    Worker process of a `ShardedListener`: a `Listener` that logs only
+    its shard's systems, into the supervisor's run folder, and leaves
+    the uplink and journal to the supervisor.
+    """
+
+    def __init__(self, json_config_file, index: int, shard: dict, run_name: str,
+                 supervisor_socket: str, forward_endpoint, local_system="gse",
+                 remote_system="formatter", resume=False, downlink_socket=None):
+        """
+        Parameters
+        ----------
+        json_config_file : str
+            As for `Listener`.
+
+        index : int
+            This shard's number.
+
+        shard : dict
+            `"systems"` to log, and optional `"port"` and
+            `"mcast_group"` to receive on (see `plan_shards()`).
+
+        run_name : str
+            The supervisor's run folder name.
+
+        supervisor_socket : str
+            The supervisor's Unix socket, for health reports.
+
+        forward_endpoint : tuple
+            Address the supervisor forwards datagrams from.
+
+        local_system, remote_system : str
+            As for `Listener`.
+
+        resume : bool
+            Append to this shard's logs in `run_name`, as for `Listener`.
+
+        downlink_socket : socket.socket
+            This shard's socket on the downlink port, that the kernel
+            steers its datagrams to (see
+            `ShardedListener.open_steered_sockets()`), or `None` to
+            receive them as `shard` says.
+        """
+        self.index = index
+        self.downlink_socket = downlink_socket
+        self.shard = shard
+        self.run_name = run_name
+        self.supervisor_socket = supervisor_socket
+        self.forward_endpoint = tuple(forward_endpoint)
+        self.supervisor_pid = os.getppid()
+        self.instance_name = self.shard_instance_name(index)
+        super().__init__(json_config_file, "uplink", local_system, remote_system, resume)
+
+    @staticmethod
+    def shard_instance_name(index: int):
+        return "_shard" + str(index)
+
+    def run_folder_name(self, now):
+        return self.run_name
+
+    def open_journal(self, logger_interface: dict):
+        # the supervisor journals every datagram as it arrives
+        return None
+
+    def make_log_dict(self, json_dict):
+        return super().make_log_dict([element for element in json_dict
+                                      if element.get("name") in self.shard["systems"]])
+
+    def start_interface(self):
+        # the supervisor owns the uplink
+        self.open_downlink_socket()
+        return True
+
+    def open_downlink_socket(self):
+        if self.downlink_socket is not None:
+            self.local_recv_socket = self.downlink_socket
+            self.local_recv_socket.setblocking(False)
+            bound_address, bound_port = self.local_recv_socket.getsockname()
+            print("shard", self.index, "receiving steered downlink at:\t", bound_address + ":" + str(bound_port))
+            return
+        if self.shard.get("port") is None:
+            # receive from the supervisor's forwarding socket
+            self.mcast_group = None
+            self.local_recv_endpoint = ("127.0.0.1", 0)
+            self.remote_endpoint = self.forward_endpoint
+        else:
+            self.local_recv_port = self.shard["port"]
+            self.local_recv_endpoint = (self.local_recv_address, self.local_recv_port)
+            self.remote_port = self.local_recv_port
+            self.remote_endpoint = (self.remote_address, self.remote_port)
+            if self.shard.get("mcast_group") is not None:
+                self.mcast_group = self.shard["mcast_group"]
+        super().open_downlink_socket()
+
+    def send_report(self):
+        """ Sends a health report to the supervisor. """
+        report = {
+            "index": self.index,
+            "pid": os.getpid(),
+            "downlink_port": self.local_recv_socket.getsockname()[1],
+            "stats": self.get_stats()
+        }
+        try:
+            self.unix_socket.sendto(SHARD_REPORT + json.dumps(report).encode("utf-8"), self.supervisor_socket)
+        except OSError as e:
+            print("shard", self.index, "couldn't report to supervisor:", e)
+
+    def handle_control_message(self, data: bytes, sender):
+        if data[:2] == SHARD_FORWARDED and len(data) > 3:
+            length = data[2]
+            sender = data[3:3 + length].decode("utf-8", "replace")
+            data = data[3 + length:]
+        super().handle_control_message(data, sender)
+
+    def housekeeping(self, now: float=None):
+        super().housekeeping(now)
+        if os.getppid() != self.supervisor_pid:
+            print("shard", self.index, "lost its supervisor; stopping")
+            raise KeyboardInterrupt
+        self.send_report()
+
+    def _run_log(self):
+        self.send_report()
+        super()._run_log()
+
+def run_shard_worker(*args):
+    """ Worker process entry point: runs a `ShardWorker(*args)`. """
+    # stop on SIGINT (from the terminal, or `ShardedListener.stop_shards()`)
+    # even if the supervisor was started with SIGINT ignored
+    signal.signal(signal.SIGINT, signal.default_int_handler)
+    ShardWorker(*args)
+
+if __name__ == "__main__":
+    print("starting sharded listener...")
+    # `--resume` continues the newest run instead of starting a new one
+    resume = "--resume" in sys.argv
+    if resume:
+        sys.argv.remove("--resume")
+    if len(sys.argv) == 3:
+        ShardedListener(sys.argv[1], int(sys.argv[2]), resume=resume)
+    elif len(sys.argv) == 2:
+        ShardedListener(sys.argv[1], resume=resume)
+    else:
+        ShardedListener(resume=resume)
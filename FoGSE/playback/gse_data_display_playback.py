@@ -38,8 +38,18 @@ class GSEPlaybackDataDisplay(GSEDataDisplay):
 
 if __name__=="__main__":
     import time
+    import sys
+    from FoGSE.readers.BaseReader import BaseReader
+    from FoGSE.readers.ReaderWorker import MainThreadJitter
     app = QApplication([])
 
+    if "--threaded-readers" in sys.argv:
+        # parse on worker threads, leaving this one to draw
+        BaseReader.threaded = True
+    if "--jitter" in sys.argv:
+        # print how far behind the GUI thread runs every 5 s
+        jitter = MainThreadJitter(report_s=5)
+
     w = GSEPlaybackDataDisplay(window_alert=True)
 
     _s = 122
@@ -11,7 +11,6 @@ from PyQt6.QtCore import QTimer
 
 from FoGSE.readers.CMOSHKReader import CMOSHKReader
 
-from FoGSE.readBackwards import BackwardsReader
 from FoGSE.utils import get_frame_size
 
 class CMOSHKPlaybackReader(CMOSHKReader):
@@ -19,6 +18,9 @@ class CMOSHKPlaybackReader(CMOSHKReader):
     Reader for the FOXSI CMOS instrument.
     """
 
+    # playback steps through the whole file itself
+    read_every_frame = False
+
     def __init__(self, datafile, parent=None):
         """
         Raw : binary
@@ -39,8 +41,6 @@ class CMOSHKPlaybackReader(CMOSHKReader):
 
         self.frame_size = get_frame_size("cmos1", "hk") # 536 bytes
         self.frame_counter = 0
-        
-        self.define_buffer_size(size=0) # read whole file
 
     def file_modified_check(self):
         """ 
@@ -75,22 +75,17 @@ class CMOSHKPlaybackReader(CMOSHKReader):
 
         Returns
         -------
-        `list` :
-            Data read from `self.data_file`.
+        `bytes` :
+            The next frame from `self.data_file`.
         """
-        if self.frame_counter==0:
-            try:
-                with BackwardsReader(file=self.data_file, blksize=self.buffer_size, forward=True) as f:
-                    data = f.read_block()
-                if self._old_data==data:
-                    return self.return_empty() 
-            except FileNotFoundError:
-                return self.return_empty() 
-        
-            self.datalist = data
-            self.frame_counter += 1
-            return self.datalist[:self.frame_size]
+        try:
+            # frame `self.frame_counter`, straight from the memory-mapped log
+            view = self.log_view(self.frame_size)
+            view.refresh()
+            frame = view.frame(self.frame_counter)
+        except IndexError:
+            # no such frame (yet)
+            return self.return_empty() 
         
-        next_frame = self.datalist[self.frame_size*self.frame_counter:self.frame_size*(self.frame_counter+1)]
         self.frame_counter += 1
-        return next_frame
+        return frame.tobytes()
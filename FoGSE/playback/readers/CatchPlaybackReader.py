@@ -11,6 +11,7 @@ from PyQt6.QtCore import QTimer
 from FoGSE.readers.CatchReader import CatchReader
 
 from FoGSE.readBackwards import BackwardsReader
+from FoGSE.io.catch_log import catch_log_text, is_binary_catch_log
 
 class CatchPlaybackReader(CatchReader):
     """
@@ -78,8 +79,11 @@ class CatchPlaybackReader(CatchReader):
         # forward=True: reads buffer from the back but doesn't reverse the data 
         if self.frame_counter==0:
             try:
-                with BackwardsReader(file=self.data_file, blksize=self.buffer_size, forward=True) as f:
-                    datalist = f.read_block()
+                if is_binary_catch_log(self.data_file):
+                    datalist = catch_log_text(self.data_file)
+                else:
+                    with BackwardsReader(file=self.data_file, blksize=self.buffer_size, forward=True) as f:
+                        datalist = f.read_block()
                     
                 if self._old_data==datalist:
                     return self.return_empty() 
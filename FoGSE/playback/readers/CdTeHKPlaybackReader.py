@@ -9,7 +9,6 @@ Can read:
 import numpy as np
 from PyQt6.QtCore import QTimer
 
-from FoGSE.readBackwards import BackwardsReader
 from FoGSE.readers.CdTeHKReader import CdTeHKReader
 from FoGSE.utils import get_frame_size
 
@@ -18,6 +17,9 @@ class CdTeHKPlaybackReader(CdTeHKReader):
     Reader for the FOXSI CdTe instrument.
     """
 
+    # playback steps through the whole file itself
+    read_every_frame = False
+
     def __init__(self, datafile, delay=0, parent=None):
         """
         Raw : binary
@@ -39,8 +41,6 @@ class CdTeHKPlaybackReader(CdTeHKReader):
         self.frame_size = get_frame_size("cdte1", "hk") # 796 bytes
         self.frame_counter = 0
 
-        self.define_buffer_size(size=0) # read whole file
-
     def file_modified_check(self):
         """ 
         No need to check for file updates.
@@ -74,22 +74,17 @@ class CdTeHKPlaybackReader(CdTeHKReader):
 
         Returns
         -------
-        `list` :
-            Data read from `self.data_file`.
+        `bytes` :
+            The next frame from `self.data_file`.
         """
-        if self.frame_counter==0: 
-            try:
-                with BackwardsReader(file=self.data_file, blksize=self.buffer_size, forward=True) as f:
-                    data = f.read_block()
-                if self._old_data==data:
-                    return self.return_empty() 
-            except FileNotFoundError:
-                return self.return_empty() 
-            
-            self.datalist = data
-            self.frame_counter += 1
-            return self.datalist[:self.frame_size]
+        try:
+            # frame `self.frame_counter`, straight from the memory-mapped log
+            view = self.log_view(self.frame_size)
+            view.refresh()
+            frame = view.frame(self.frame_counter)
+        except IndexError:
+            # no such frame (yet)
+            return self.return_empty() 
         
-        next_frame = self.datalist[self.frame_size*self.frame_counter:self.frame_size*(self.frame_counter+1)]
         self.frame_counter += 1
-        return next_frame
+        return frame.tobytes()
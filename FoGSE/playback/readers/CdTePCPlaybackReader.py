@@ -8,11 +8,10 @@ Can read:
 
 import numpy as np
 from PyQt6.QtCore import QTimer
-import struct
 
 from FoGSE.readers.CdTePCReader import CdTePCReader
 
-from FoGSE.readBackwards import BackwardsReader
+from FoGSE.io.frame_words import CDTE_WORD
 from FoGSE.utils import get_frame_size
 
 class CdTePCPlaybackReader(CdTePCReader):
@@ -20,6 +19,9 @@ class CdTePCPlaybackReader(CdTePCReader):
     Reader for the FOXSI CdTe instrument.
     """
 
+    # playback steps through the whole file itself
+    read_every_frame = False
+
     def __init__(self, datafile, parent=None):
         """
         Raw : binary
@@ -37,8 +39,6 @@ class CdTePCPlaybackReader(CdTePCReader):
         self.frame_size = get_frame_size("cdte1", "pc") # 32_780 bytes
         self.frame_counter = 0
 
-        self.define_buffer_size(size=0) # read whole file
-
     def file_modified_check(self):
         """ 
         No need to check for file updates.
@@ -72,26 +72,17 @@ class CdTePCPlaybackReader(CdTePCReader):
 
         Returns
         -------
-        `list` :
-            Data read from `self.data_file`.
+        `numpy.ndarray` :
+            The next frame from `self.data_file`, as 32-bit words.
         """
-        # read the file `self.bufferSize` bytes from the end and extract the lines
-        # forward=True: reads buffer from the back but doesn't reverse the data 
-        if self.frame_counter==0:
-            try:
-                with BackwardsReader(file=self.data_file, blksize=self.buffer_size, forward=True) as f:
-                    iterative_unpack=struct.iter_unpack("<I",f.read_block())
-                    datalist=[]
-                    for _,data in enumerate(iterative_unpack):
-
-                        datalist.append(data[0])
-            except FileNotFoundError:
-                return self.return_empty() 
-            
-            self.datalist = datalist
-            self.frame_counter += 1
-            return self.datalist[:self.frame_size]
+        try:
+            # frame `self.frame_counter`, straight from the memory-mapped log
+            view = self.log_view(self.frame_size, CDTE_WORD)
+            view.refresh()
+            frame = view.frame(self.frame_counter)
+        except IndexError:
+            # no such frame (yet)
+            return self.return_empty() 
         
-        next_frame = self.datalist[self.frame_size*self.frame_counter:self.frame_size*(self.frame_counter+1)]
         self.frame_counter += 1
-        return next_frame
+        return frame
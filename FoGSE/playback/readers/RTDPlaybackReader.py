@@ -3,12 +3,10 @@ Create a class that will read the LOG file containing raw binary data received f
 the RTDs
 """
 
-import numpy as np
 from PyQt6.QtCore import QTimer
 
 from FoGSE.readers.RTDReader import RTDReader
 
-from FoGSE.readBackwards import BackwardsReader
 from FoGSE.utils import get_frame_size
 
 class RTDPlaybackReader(RTDReader):
@@ -33,7 +31,6 @@ class RTDPlaybackReader(RTDReader):
         self.frame_size = get_frame_size("housekeeping", "rtd")*2 # 84 bytes
         self.frame_counter = 0
 
-        self.define_buffer_size(size=0) # read whole file
         self.call_interval(1000)
 
     def file_modified_check(self):
@@ -72,22 +69,16 @@ class RTDPlaybackReader(RTDReader):
         `tuple` :
             (x, y) The new x and y coordinates read from `self.data_file`.
         """
-        if self.frame_counter==0:
-            try:
-                with BackwardsReader(file=self.data_file, blksize=self.buffer_size, forward=True) as f:
-                    datalist = f.read_block()
-
-                if self._old_data==datalist:
-                    return self.return_empty() 
-            except FileNotFoundError:
-                return self.return_empty() 
-            
-            self.datalist = datalist
-            self.frame_counter += 1
-            return self.datalist[:self.frame_size]
+        try:
+            # frame `self.frame_counter`, straight from the memory-mapped log
+            view = self.log_view(self.frame_size)
+            view.refresh()
+            frame = view.frame(self.frame_counter)
+        except IndexError:
+            # no such frame (yet)
+            return self.return_empty() 
         
-        next_frame = self.datalist[self.frame_size*self.frame_counter:self.frame_size*(self.frame_counter+1)]
         self.frame_counter += 1
-        return next_frame
+        return frame.tobytes()
 
     
\ No newline at end of file
@@ -6,12 +6,10 @@ Can read:
     * Timepix
 """
 
-import numpy as np
 from PyQt6.QtCore import QTimer
 
 from FoGSE.readers.TimepixHKReader import TimepixHKReader
 
-from FoGSE.readBackwards import BackwardsReader
 from FoGSE.utils import get_frame_size
 
 class TimepixHKPlaybackReader(TimepixHKReader):
@@ -19,6 +17,9 @@ class TimepixHKPlaybackReader(TimepixHKReader):
     Reader for the FOXSI Timepix instrument.
     """
 
+    # playback steps through the whole file itself
+    read_every_frame = False
+
     def __init__(self, datafile, parent=None):
         """
         Raw : binary
@@ -35,8 +36,6 @@ class TimepixHKPlaybackReader(TimepixHKReader):
         
         self.frame_size = get_frame_size("timepix", "tpx") # bytes
         self.frame_counter = 0
-
-        self.define_buffer_size(size=0) # read whole file
         self.call_interval(1000)
 
     def file_modified_check(self):
@@ -72,23 +71,17 @@ class TimepixHKPlaybackReader(TimepixHKReader):
 
         Returns
         -------
-        `list` :
-            Data read from `self.data_file`.
+        `bytes` :
+            The next frame from `self.data_file`.
         """
-        if self.frame_counter==0:
-            try:
-                with BackwardsReader(file=self.data_file, blksize=self.buffer_size, forward=True) as f:
-                    datalist = f.read_block()
-                    
-                if self._old_data==datalist:
-                    return self.return_empty() 
-            except FileNotFoundError:
-                return self.return_empty() 
-            
-            self.datalist = datalist
-            self.frame_counter += 1
-            return self.datalist[:self.frame_size]
+        try:
+            # frame `self.frame_counter`, straight from the memory-mapped log
+            view = self.log_view(self.frame_size)
+            view.refresh()
+            frame = view.frame(self.frame_counter)
+        except IndexError:
+            # no such frame (yet)
+            return self.return_empty() 
         
-        next_frame = self.datalist[self.frame_size*self.frame_counter:self.frame_size*(self.frame_counter+1)]
         self.frame_counter += 1
-        return next_frame
+        return frame.tobytes()
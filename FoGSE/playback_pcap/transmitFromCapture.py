@@ -1,123 +1,167 @@
-import sys, os, time, socket
-import scapy.all
-import numpy as np
-from pprint import pprint
+"""
+Replay the downlink datagrams in a packet capture to the GSE, at the
+capture's own pace, N times faster, or as fast as possible.
+
+The capture is streamed (see `FoGSE.io.capture`), so captures of any
+size start sending straight away. Send times follow the capture's
+timestamps, scaled by the speed, on the monotonic clock: datagrams due
+within `batch_s` of each other are sent back to back, and the sender
+only sleeps when the next one is further ahead than that. Progress
+(packets/s achieved and how far behind schedule the sender is) is
+printed every `report_interval` seconds.
+
+From a shell:
+    python3 FoGSE/playback_pcap/transmitFromCapture.py path/to/your.pcap local-ip local-port [speed|max] [--to 224.1.1.118:9999]
+"""
+import sys, time, socket
+
+from FoGSE.io.capture import CaptureReader
+
+DEFAULT_DEST_ADDRESS = "224.1.1.118"
+DEFAULT_DEST_PORT = 9999
+DEFAULT_BATCH_S = 0.001
 
 class CaptureTransmitter:
-    def __init__(self, capture: str, address: str, port: int):
-        print("\topening capture...")
-        # capture = pyshark.FileCapture(input_file=capture, include_raw=True, use_json=True)
+    """
+    Sends the datagrams in a capture from a local address to the GSE's
+    downlink address (by default, the downlink multicast group).
+    """
+
+    def __init__(self, capture: str, address: str, port: int,
+                 dest_address: str=DEFAULT_DEST_ADDRESS, dest_port: int=DEFAULT_DEST_PORT,
+                 capture_address: str=None):
+        """
+        Parameters
+        ----------
+        capture : `str`
+            The pcap or pcapng capture.
+
+        address, port :
+            Local address and port to send from (as the Formatter
+            would).
+
+        dest_address, dest_port :
+            Where to send the datagrams.
+
+        capture_address : `str`
+            Destination address of the datagrams to replay from the
+            capture. Default is `dest_address`.
+        """
+        self.capture = capture
+        self.dest = (dest_address, dest_port)
+        self.capture_address = dest_address if capture_address is None else capture_address
 
         self.socket = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
         self.socket.bind((address, port))
+        if socket.inet_aton(dest_address)[0] >> 4 == 0xe:
+            # multicast: stay on the local network, and let local Listeners hear it
+            self.socket.setsockopt(socket.IPPROTO_IP, socket.IP_MULTICAST_TTL, 1)
+            self.socket.setsockopt(socket.IPPROTO_IP, socket.IP_MULTICAST_LOOP, 1)
+            if address != "0.0.0.0":
+                self.socket.setsockopt(socket.IPPROTO_IP, socket.IP_MULTICAST_IF, socket.inet_aton(address))
+
+    def transmit(self, speed: float=1.0, report_interval: float=1.0, batch_s: float=DEFAULT_BATCH_S):
+        """
+        Send every datagram in the capture.
+
+        Parameters
+        ----------
+        speed : `float`
+            Multiple of the capture's own rate to send at (e.g. 1 for
+            real time, 10 for ten times faster). 0 sends as fast as
+            possible.
+
+        report_interval : `float`
+            Seconds between progress reports. 0 for none.
 
-        capture = scapy.all.rdpcap(capture)
-        
-        print("\tfound",len(capture),"saved packets")
-        times = []
-        raw_packets = []
-        print("\tparsing capture...")
-        packet_index = 0
-        this_fragment_id = None
-        this_fragment_offset = None
-        this_frame = {}
-        this_frame_time = []
-        for packet in capture:
-            if scapy.all.IP in packet and packet[scapy.all.IP].dst == "224.1.1.118":
-                flags = int(packet[scapy.all.IP].flags)
-                # print("counter:",packet_index,", flags:",flags)
-                if flags == 0x02:
-                    # this is a non-fragmented packet, just add it to the list as usual.
-                    # print("\tfound packet")
-                    payload = packet[scapy.all.UDP].payload
-                    raw_packets.append(bytes(payload))
-                    # print("\t\tfor flag 0x02, length:",len(bytes(payload)))
-                    times.append(float(packet.time))
-                    packet_index += 1
-                
-                if flags == 0x01:
-                    # print("\tfound fragmented packet")
-                    this_fragment_id = packet[scapy.all.IP].id
-                    this_fragment_offset = packet[scapy.all.IP].frag
-                    payload = packet[scapy.all.IP].payload
-                    this_frame[this_fragment_offset] = bytes(payload)[8:]
-                    # print("\t\tfor flag 0x01, length:",len(bytes(payload)))
-                    this_frame_time.append(float(packet.time))
-
-                if flags == 0x00:
-                    # print("\tfound terminal fragmented packet")
-                    # this is the last fragment for the fragment id.
-                    if packet[scapy.all.IP].id == this_fragment_id:
-                        this_fragment_offset = packet[scapy.all.IP].frag
-                        payload = packet[scapy.all.IP].payload
-                        this_frame[this_fragment_offset] = bytes(payload)
-                        # print("\t\tfor flag 0x00, length:",len(bytes(payload)))
-                        this_frame_time.append(float(packet.time))
-
-                        # assemble the frame
-                        this_frame = dict(sorted(this_frame.items()))
-                        this_packet = bytearray()
-                        for key in this_frame.keys():
-                            this_packet.extend(this_frame[key])
-
-                        # print("\tbuilt fragmented packet of length", len(this_packet))
-                        this_time = max(this_frame_time)
-
-                        # write the frame to raw_packets and time to times
-                        times.append(this_time)
-                        raw_packets.append(bytes(this_packet))
-
-                        # clear the fragment-tracking data
-                        this_fragment_id = None
-                        this_fragment_offset = None
-                        this_frame = {}
-                        this_frame_time = []
-
-                        # increment packet counter
-                        packet_index += 1
-                    else: 
-                        print("failed to rebuild fragmented packet! Retained id", this_fragment_id,"but found",packet[scapy.all.IP].id)
-                        pprint(packet)
-        
-        print("\tfound",len(raw_packets),"packets to send")
-        # times = times[:packet_index]
-        # raw_packets = raw_packets[:packet_index]
-        duration = times[-1] - times[0]
-        print("\tpacket transmission will last", duration, "seconds")
+        batch_s : `float`
+            Datagrams due within this many seconds are sent together,
+            without sleeping in between.
+
+        Returns
+        -------
+        `dict` :
+            `"packets"` and `"bytes"` sent, `"errors"` (failed sends),
+            `"elapsed_s"`, `"capture_s"` (the capture time covered),
+            `"packets_per_s"` achieved and `"max_late_s"` (furthest
+            behind schedule).
+        """
+        reader = CaptureReader(self.capture, self.capture_address)
+        sendto = self.socket.sendto
+        dest = self.dest
+        packets = 0
+        nbytes = 0
+        errors = 0
+        max_late = 0.0
+        first_ns = None
+        last_ns = None
+        start = time.monotonic()
+        now = start
+        last_report = (start, 0)
+        for datagram in reader.datagrams():
+            if first_ns is None:
+                first_ns = datagram.timestamp_ns
+            last_ns = datagram.timestamp_ns
+            due = start + (last_ns - first_ns)/1e9/speed if speed > 0 else now
+            if due > now or packets & 0xff == 0:
+                now = time.monotonic()
+                if due - now > batch_s:
+                    if due - now > 5.0:
+                        print("\tsleeping", due - now, "seconds")
+                    time.sleep(due - now)
+                    now = time.monotonic()
+                late = max(now - due, 0.0) if speed > 0 else 0.0
+                max_late = max(max_late, late)
+                if report_interval > 0 and now - last_report[0] >= report_interval:
+                    print("\tsent", packets, "packets,", "{:.0f}".format((packets - last_report[1])/(now - last_report[0])),
+                          "packets/s,", "{:.1f}".format((last_ns - first_ns)/1e9/(now - start)) + "x capture rate,",
+                          "{:.1f}".format(1e3*late), "ms behind")
+                    last_report = (now, packets)
+            try:
+                sendto(datagram.data, dest)
+            except OSError:
+                errors += 1
+                continue
+            packets += 1
+            nbytes += len(datagram.data)
+
+        elapsed = time.monotonic() - start
+        return {"packets": packets, "bytes": nbytes, "errors": errors, "elapsed_s": elapsed,
+                "capture_s": 0.0 if first_ns is None else (last_ns - first_ns)/1e9,
+                "packets_per_s": packets/elapsed if elapsed > 0 else 0.0, "max_late_s": max_late}
+
+    def close(self):
+        self.socket.close()
+
+if __name__ == '__main__':
+    args = sys.argv[1:]
+    dest = (DEFAULT_DEST_ADDRESS, DEFAULT_DEST_PORT)
+    if "--to" in args:
+        k = args.index("--to")
+        host, dest_port = args[k + 1].rsplit(":", 1)
+        dest = (host, int(dest_port))
+        del args[k:k + 2]
+    if len(args) >= 3:
+        speed = 1.0
+        if len(args) > 3:
+            speed = 0.0 if args[3] == "max" else float(args[3])
+        print("opening capture file", args[0])
+        transmitter = CaptureTransmitter(args[0], args[1], int(args[2]), dest[0], dest[1])
+        print("\twill send to", dest[0] + ":" + str(dest[1]), "at",
+              "maximum speed" if speed == 0 else str(speed) + "x the capture rate")
         key = input("> Press Q to quit, or another key to start sending: ")
         if key == 'q' or key == 'Q':
             print("\texiting.")
             sys.exit()
 
         print("\tstarting transmission.")
-        last_time = 0
-        negative_counter = 0
-        total_start = time.time()
-        for i, packet in enumerate(raw_packets):
-            if i > 0:
-                delay = times[i] - times[i - 1]
-                elapsed = time.time() - last_time
-                sleepy_time = max(delay - elapsed, 0.0)
-                if delay > 5.0:
-                    print("\tsleeping", delay - elapsed, "seconds")
-                if sleepy_time == 0.0:
-                    negative_counter += 1
-                time.sleep(sleepy_time)
-
-            # self.socket.sendto(packet, ("224.1.1.118", 9999))
-            # print("sending",packet.hex()[:8])
-            last_time = time.time()
-        
-        print("\ttotal transmission time:", time.time() - total_start, "seconds")
-        print("\tfound", negative_counter, "timer overruns.")
-
+        result = transmitter.transmit(speed)
+        transmitter.close()
+        print("\tsent", result["packets"], "packets (" + str(result["bytes"]), "bytes) covering",
+              "{:.2f}".format(result["capture_s"]), "s of capture in", "{:.2f}".format(result["elapsed_s"]), "s")
+        print("\tachieved", "{:.0f}".format(result["packets_per_s"]), "packets/s,",
+              "{:.1f}".format(1e3*result["max_late_s"]), "ms furthest behind schedule,",
+              result["errors"], "failed sends.")
         print("\ttransmission complete.")
-
-
-
-if __name__ == '__main__':
-    if len(sys.argv) > 3:
-        print("opening capture file", sys.argv[1])
-        CaptureTransmitter(sys.argv[1], sys.argv[2], int(sys.argv[3]))
     else:
-        print("run like this:\n\t> python3 FoGSE/transmitFromCapture.py path/to/your.pcap local-ip local-port")
\ No newline at end of file
+        print("run like this:\n\t> python3 FoGSE/playback_pcap/transmitFromCapture.py path/to/your.pcap local-ip local-port [speed|max] [--to address:port]")
@@ -10,7 +10,6 @@ I (Kris) have mainly added some functionality so the BackwardsReader class can b
 manager. I have also fixed the ...split('\n') lines."""
 
 import os
-import struct
 
 
 
@@ -101,17 +100,14 @@ class BackwardsReader:
 
 def read_raw_cdte(file):
     from FoGSE.telemetry_tools.parsers.CdTeparser import CdTerawalldata2parser
+    from FoGSE.io.frame_words import frame_words, word_list
     # blksize=41204 for first full frame, blksize=73984 to do 2 frames, 
     # so 73984 + (73984-41204) for the next? -> correct, so 41204 bytes
     # to get to the end of the first frame, 32780 bytes thereafter
     with BackwardsReader(file=file, blksize=50_000, forward=True) as f:
-        iterative_unpack=struct.iter_unpack("<I",f.read_block())
-        datalist=[]
-        for _,data in enumerate(iterative_unpack):
+        datalist = frame_words(f.read_block())
 
-            datalist.append(data[0])
-
-        flags, event_df, all_hkdicts = CdTerawalldata2parser(datalist)
+    flags, event_df, all_hkdicts = CdTerawalldata2parser(word_list(datalist))
     return flags, event_df, all_hkdicts
 
 
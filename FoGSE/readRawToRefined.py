@@ -28,12 +28,12 @@ Cannot Read:
 """
 
 import time
-import struct
 
 from PyQt6 import QtCore
 from PyQt6.QtWidgets import QWidget
 
 from FoGSE.readBackwards import BackwardsReader
+from FoGSE.io.frame_words import frame_words, word_list
 from FoGSE.telemetry_tools.parsers.CdTeparser import CdTerawalldata2parser
 from FoGSE.telemetry_tools.collections.CdTeCollection import CdTeCollection
 
@@ -189,18 +189,15 @@ class Reader(QWidget):
         # forward=True: reads buffer from the back but doesn't reverse the data 
         try:
             with BackwardsReader(file=self.data_file, blksize=self.buffer_size, forward=True) as f:
-                iterative_unpack=struct.iter_unpack("<I",f.read_block())
-                datalist=[]
-                for _,data in enumerate(iterative_unpack):
-
-                    datalist.append(data[0])
-            if self._old_data==datalist:
+                block = f.read_block()
+            # compare the bytes read (a memcmp) before decoding anything
+            if self._old_data==block:
                 return self.return_empty() 
         except FileNotFoundError:
             return self.return_empty() 
         
-        self._old_data = datalist
-        return datalist
+        self._old_data = block
+        return frame_words(block)
 
     def raw_2_parsed(self, raw_data):
         """
@@ -220,7 +217,7 @@ class Reader(QWidget):
         # return or set human readable data
         # do stuff with the raw data and return nice, human readable data
         try:
-            flags, event_df, all_hkdicts = CdTerawalldata2parser(raw_data)
+            flags, event_df, all_hkdicts = CdTerawalldata2parser(word_list(raw_data))
         except ValueError:
             # no data from parser so pass nothing on with a time of -1
             print("No data from parser.")
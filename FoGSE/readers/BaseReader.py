@@ -20,10 +20,19 @@ binary data to a collected, human readable form for investigation and analysis.
 """
 
 import os
+import threading
+import numpy as np
 
 from PyQt6 import QtCore
 from PyQt6.QtWidgets import QWidget
 
+from FoGSE.io.frame_events import FrameEventSubscriber
+from FoGSE.io.frame_ring import FrameRingReader
+from FoGSE.io.log_tail import LogTail
+from FoGSE.io.log_view import LogView
+from FoGSE.readers.ReaderWorker import ReaderWorker, reader_thread
+from FoGSE.utils import get_system_value
+
 # import parser for `extract_raw_data` and `extract_raw_data_<det>`
 # import collection for `parsed_2_collections`
 # for example `from FoGSE.telemetry_tools.parsers.CdTeparser import CdTerawalldata2parser`
@@ -39,10 +48,51 @@ class BaseReader(QWidget):
     * extract_raw_data_<det>()
     * raw_2_parsed()
     * parsed_2_collection()
+
+    If the Listener is running, the reader subscribes to its 
+    "frame written" events for `datafile` and reads new data as soon as 
+    it arrives. The timer then only polls the file every 
+    `event_fallback_interval` ms, in case events are missed.
+
+    Readers that read the newest frames (`self.buffer_size` is a 
+    whole number of frames) can use `read_latest_block()` to take them 
+    from the Listener's shared memory ring (see `FoGSE.io.frame_ring`) 
+    instead of reading the file. The Listener only keeps rings for the 
+    data types read this way (see `listening.RING_DATA_TYPES`, the RTDs).
+
+    Such readers can instead set `read_every_frame`: each update then 
+    reads only the frames appended since the last one (see 
+    `read_new_frames()`), and parses and collects every one of them in 
+    order, converting each with `frame_2_raw()`. No frame is skipped if 
+    the Listener writes several between updates, and nothing is read 
+    if it has written none. A reader more than `max_frames_per_update` 
+    frames behind carries on with the rest straight after the GUI has 
+    drawn, without waiting for the file to change again.
+
+    Readers with `threaded` set read, parse and collect on a shared 
+    worker thread (see `FoGSE.readers.ReaderWorker`) and only set 
+    `collection` on the GUI thread, so the GUI stays responsive while 
+    they parse.
     """
 
     # need to be class variable to connect
     value_changed_collection = QtCore.pyqtSignal()
+    # asks the worker (in threaded mode) to update
+    update_requested = QtCore.pyqtSignal()
+
+    # slowest timer interval (ms) to use while subscribed to frame events
+    event_fallback_interval = 1_000
+
+    # collect every new frame in order, rather than the newest block
+    read_every_frame = False
+    # most frames to collect in one update (a reader that has fallen 
+    # behind catches up over several)
+    max_frames_per_update = 64
+
+    # read, parse and collect on a worker thread, not the GUI thread
+    threaded = False
+    # number of worker threads shared by all threaded readers
+    reader_threads = 2
 
     def __init__(self, datafile, parent=None):
         """
@@ -62,6 +112,29 @@ class BaseReader(QWidget):
         # sttr used to track whether self.data_file is modified
         self._cached_stamp = 0
 
+        # set by `self.subscribe_to_listener()`
+        self._frame_events = None
+        self.subscribe_to_listener()
+
+        # set by `self.read_latest_frame()` once the Listener's ring is found
+        self._frame_ring = None
+        # the ring's frames published and the log's size when last read
+        self._ring_published = 0
+        self._ring_log_size = 0
+
+        # set by `self.read_new_frames()`
+        self._log_tail = None
+        # a catch-up update is queued (see `self.update_collection()`)
+        self._catching_up = False
+
+        # set by `self.log_view()`
+        self._log_view = None
+
+        # set by `self.request_update()` in threaded mode
+        self._worker = None
+        self._update_lock = threading.Lock()
+        self._update_pending = None
+
         # default is update plot every 100 ms
         self.call_interval()
         # read 25,000 bytes from the end of `self.data_file` at a time
@@ -100,11 +173,218 @@ class BaseReader(QWidget):
 
     def setup_and_start_timer(self):
         """ Control the start and stop of the timer. """
+        interval = self._call_interval
+        if self._frame_events is not None:
+            # new data is signalled by frame events, so only poll as a fallback
+            interval = max(interval, self.event_fallback_interval)
         self.timer = QtCore.QTimer()
-        self.timer.setInterval(self._call_interval) # fastest is every millisecond here, with a value of 1
+        self.timer.setInterval(interval) # fastest is every millisecond here, with a value of 1
         self.timer.timeout.connect(self.raw_2_collected) # call self.update_plot_data every cycle
         self.timer.start()
 
+    def subscribe_to_listener(self, socket_path=None):
+        """
+        Subscribe to the Listener's "frame written" events for 
+        `self.data_file` (see `FoGSE.io.frame_events`).
+
+        If the Listener can't be reached, the reader carries on polling 
+        the file.
+
+        Parameters
+        ----------
+        socket_path : `str` or `None`
+            The Listener's Unix socket. Default is the `gse` 
+            `unix_listen_socket` in systems.json.
+
+        Returns
+        -------
+        `bool` :
+            True if the subscription request was sent.
+        """
+        self.unsubscribe_from_listener()
+        if (not isinstance(self.data_file, str)) or (not os.path.isfile(self.data_file)):
+            return False
+        try:
+            if socket_path is None:
+                socket_path = get_system_value("gse", "logger_interface", "unix_listen_socket")
+            self._frame_events = FrameEventSubscriber(socket_path, self.data_file)
+        except (OSError, KeyError, TypeError):
+            self._frame_events = None
+            return False
+
+        self._frame_notifier = QtCore.QSocketNotifier(self._frame_events.fileno(), 
+                                                      QtCore.QSocketNotifier.Type.Read, 
+                                                      self)
+        self._frame_notifier.activated.connect(self.frame_events_2_collected)
+        # close the subscription (and remove its socket) with the reader, 
+        # or when the GUI quits
+        self.destroyed.connect(self._frame_events.close)
+        app = QtCore.QCoreApplication.instance()
+        if app is not None:
+            app.aboutToQuit.connect(self._frame_events.close)
+        return True
+
+    def unsubscribe_from_listener(self):
+        """
+        Stop getting the Listener's frame events, if subscribed (see 
+        `subscribe_to_listener()`). The timer carries on polling the 
+        file.
+        """
+        if self._frame_events is None:
+            return
+        self._frame_notifier.setEnabled(False)
+        self._frame_notifier.deleteLater()
+        self._frame_events.close()
+        self._frame_events = None
+        if hasattr(self, "timer"):
+            self.timer.setInterval(self._call_interval)
+
+    def read_latest_frame(self):
+        """
+        Get the newest `self.buffer_size` bytes of frames for 
+        `self.data_file` from the Listener's shared memory ring.
+
+        Returns
+        -------
+        `bytes` or `None` :
+            The frames, oldest first, or None if there is no ring, it 
+            doesn't hold enough frames, or `self.buffer_size` is not a 
+            whole number of its frames.
+        """
+        if self._frame_ring is not None and self._frame_ring_is_stale():
+            # replaced by a restarted (or resumed) Listener
+            self._frame_ring.close()
+            self._frame_ring = None
+        if self._frame_ring is None:
+            if not isinstance(self.data_file, str):
+                return None
+            try:
+                self._frame_ring = FrameRingReader(self.data_file)
+            except (OSError, ValueError):
+                return None
+            self._ring_published = self._frame_ring.published
+            self._ring_log_size = self._log_size()
+        ring = self._frame_ring
+        count, remainder = divmod(self.buffer_size, ring.frame_len)
+        if count < 1 or remainder != 0 or count > ring.slots:
+            return None
+        if count == 1:
+            frame = ring.latest()
+            return None if frame is None else frame.data
+        frames = ring.frames_since(ring.published - 1 - count)
+        if len(frames) != count:
+            # not published yet, or overwritten while reading
+            return None
+        return b"".join(frame.data for frame in frames)
+
+    def _frame_ring_is_stale(self):
+        """
+        True if the Listener has closed the ring being read, or if 
+        nothing has been published to it since the last check although 
+        the log has grown (e.g. the ring was removed without being 
+        closed).
+        """
+        ring = self._frame_ring
+        if ring.closed:
+            return True
+        published, size = ring.published, self._log_size()
+        stalled = published == self._ring_published and size > self._ring_log_size
+        self._ring_published, self._ring_log_size = published, size
+        return stalled
+
+    def _log_size(self):
+        """ Size of `self.data_file` in bytes, 0 if it doesn't exist. """
+        try:
+            return os.path.getsize(self.data_file)
+        except OSError:
+            return 0
+
+    def read_latest_block(self):
+        """
+        Read the last `self.buffer_size` bytes of `self.data_file`, from 
+        the Listener's shared memory ring if possible (see 
+        `read_latest_frame()`), otherwise from the file (across its
+        segments if the log is segmented, see `log_view()`).
+
+        Returns
+        -------
+        `bytes` :
+            The data.
+
+        Raises
+        ------
+        FileNotFoundError : if the data has to come from the file and it 
+        does not exist.
+        """
+        data = self.read_latest_frame()
+        if data is not None:
+            return data
+        view = self.log_view()
+        view.refresh()
+        return view.tail(self.buffer_size)
+
+    def log_view(self, frame_len: int=None, dtype="u1"):
+        """
+        Return a memory-mapped view of `self.data_file` (see 
+        `FoGSE.io.log_view.LogView`), made on the first call and kept 
+        while `self.data_file` and the arguments stay the same. Call its 
+        `refresh()` to pick up new data.
+
+        Parameters
+        ----------
+        frame_len : `int`
+            Frame size, in bytes. Default is `self.buffer_size` (or 1 
+            byte if that is 0).
+
+        dtype : `numpy.dtype` or `str`
+            Type of the frames' elements, as for `LogView`.
+        """
+        if frame_len is None:
+            frame_len = max(self.buffer_size, 1)
+        view = self._log_view
+        if view is None or view.log_path != self.data_file or view.frame_len != frame_len \
+                or view.dtype != np.dtype(dtype):
+            self._log_view = LogView(self.data_file, frame_len, dtype)
+        return self._log_view
+
+    def read_new_frames(self):
+        """
+        Read the complete frames (of `self.buffer_size` bytes) appended 
+        to `self.data_file` since the last call, oldest first, up to 
+        `max_frames_per_update` of them. The first call returns the 
+        newest frame.
+
+        Returns
+        -------
+        `list` :
+            The frames, as `bytes`.
+        """
+        if self._log_tail is None or self._log_tail.frame_len != self.buffer_size \
+                or self._log_tail.log_path != self.data_file:
+            self._log_tail = LogTail(self.data_file, self.buffer_size)
+        return self._log_tail.read_new(self.max_frames_per_update)
+
+    def frames_behind(self):
+        """
+        Number of complete frames `read_new_frames()` left unread last 
+        time, because of `max_frames_per_update`.
+        """
+        if (not self.read_every_frame) or self._log_tail is None:
+            return 0
+        return self._log_tail.frames_behind
+
+    def frame_2_raw(self, frame):
+        """
+        Convert one frame from `read_new_frames()` into the raw data 
+        `raw_2_parsed()` takes. By default, the frame itself.
+
+        Parameters
+        ----------
+        frame : `bytes`
+            One frame from `self.data_file`.
+        """
+        return frame
+
     @property
     def collection(self):
         """ 
@@ -239,13 +519,113 @@ class BaseReader(QWidget):
 
         Sets the `collections` attribute.
         """
-        if not self.file_modified_check():
+        if self.threaded:
+            # the worker checks the file, off the GUI thread
+            self.request_update(check_modified=True)
+            return
+
+        # frames left from the last update are read whether or not the 
+        # file has changed since
+        if self.frames_behind() == 0 and not self.file_modified_check():
+            return
+        
+        self.update_collection()
+
+    def frame_events_2_collected(self):
+        """
+        Called when the Listener reports new frames in `self.data_file`, 
+        to update the collection without waiting for the timer.
+        """
+        if len(self._frame_events.read_events()) == 0:
             return
         
+        self.update_collection()
+
+    def new_collections(self):
+        """ 
+        Read, parse and collect the newest data from `self.data_file` 
+        (every new frame, if `read_every_frame` is set).
+
+        Yields
+        ------
+        Each new collection, oldest first.
+        """
+        if self.read_every_frame:
+            for frame in self.read_new_frames():
+                parsed = self.raw_2_parsed(self.frame_2_raw(frame))
+                yield self.parsed_2_collection(parsed)
+            return
+
         raw = self.extract_raw_data()
 
         # might need in future: `if raw!=self.return_empty():``
         parsed = self.raw_2_parsed(raw)
 
-        # assign the collected data and trigger the `emit`
-        self.collection = self.parsed_2_collection(parsed)
\ No newline at end of file
+        yield self.parsed_2_collection(parsed)
+
+    def update_collection(self):
+        """ 
+        Read, parse and collect the newest data from `self.data_file` 
+        (on the worker thread, if `threaded` is set).
+
+        Sets the `collections` attribute.
+        """
+        if self.threaded:
+            self.request_update(check_modified=False)
+            return
+
+        for collection in self.new_collections():
+            # assign the collected data and trigger the `emit`
+            self.collection = collection
+
+        if self.frames_behind() > 0 and not self._catching_up:
+            # read the rest once the GUI has drawn these
+            self._catching_up = True
+            QtCore.QTimer.singleShot(0, self._catch_up)
+
+    def _catch_up(self):
+        """ Carry on reading frames left by the last update. """
+        self._catching_up = False
+        self.update_collection()
+
+    def request_update(self, check_modified: bool=False):
+        """
+        Ask the worker thread to update the collection, starting the 
+        worker if need be. Requests made while one is waiting are merged 
+        into it, so a busy reader never has more than one queued.
+
+        Parameters
+        ----------
+        check_modified : `bool`
+            Only update if `file_modified_check()` says the file has 
+            changed.
+        """
+        if self._worker is None:
+            self._worker = ReaderWorker(self, reader_thread(self.reader_threads))
+            self._worker.collected.connect(self._set_collection)
+            # (queued, so the worker can ask for another update itself)
+            self.update_requested.connect(self._worker.update, QtCore.Qt.ConnectionType.QueuedConnection)
+            self.destroyed.connect(self._worker.deleteLater)
+        with self._update_lock:
+            pending = self._update_pending
+            self._update_pending = check_modified if pending is None else (pending and check_modified)
+        if pending is None:
+            self.update_requested.emit()
+
+    def take_update_request(self):
+        """
+        Take the waiting update request (called by the worker).
+
+        Returns
+        -------
+        `bool` or `None` :
+            Whether to check the file has been modified first, or `None` 
+            if no update is waiting.
+        """
+        with self._update_lock:
+            pending, self._update_pending = self._update_pending, None
+        return pending
+
+    def _set_collection(self, collection):
+        """ Set a collection made by the worker (runs on the GUI thread). """
+        self.collection = collection
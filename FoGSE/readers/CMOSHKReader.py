@@ -8,7 +8,6 @@ Can read:
 
 from FoGSE.readers.BaseReader import BaseReader
 
-from FoGSE.readBackwards import BackwardsReader
 import FoGSE.telemetry_tools.parsers.CMOSparser as cmosp
 from FoGSE.telemetry_tools.collections.CMOSHKCollection import CMOSHKCollection
 from FoGSE.utils import get_frame_size, get_system_value
@@ -18,6 +17,9 @@ class CMOSHKReader(BaseReader):
     Reader for the FOXSI CMOS instrument.
     """
 
+    # parse every new frame in order (see `BaseReader.read_every_frame`)
+    read_every_frame = True
+
     def __init__(self, datafile, parent=None):
         """
         Raw : binary
@@ -58,8 +60,7 @@ class CMOSHKReader(BaseReader):
         # read the file `self.bufferSize` bytes from the end and extract the lines
         # forward=True: reads buffer from the back but doesn't reverse the data 
         try:
-            with BackwardsReader(file=self.data_file, blksize=self.buffer_size, forward=True) as f:
-                data = f.read_block()
+            data = self.read_latest_block()
             if self._old_data==data:
                 return self.return_empty() 
         except FileNotFoundError:
@@ -8,7 +8,6 @@ Can read:
 
 from FoGSE.readers.BaseReader import BaseReader
 
-from FoGSE.readBackwards import BackwardsReader
 from FoGSE.telemetry_tools.parsers.CMOSparser import PCimageData
 from FoGSE.telemetry_tools.collections.CMOSPCCollection import CMOSPCCollection
 from FoGSE.utils import get_frame_size, get_system_value
@@ -18,6 +17,13 @@ class CMOSPCReader(BaseReader):
     Reader for the FOXSI CMOS instrument.
     """
 
+    # parse every new frame in order (see `BaseReader.read_every_frame`)
+    read_every_frame = True
+    # frames are ~0.5 MB and slow to parse, so only take a couple per 
+    # update and let the GUI draw in between (the rest follow straight 
+    # after)
+    max_frames_per_update = 2
+
     def __init__(self, datafile, parent=None):
         """
         Raw : binary
@@ -54,8 +60,7 @@ class CMOSPCReader(BaseReader):
         # read the file `self.bufferSize` bytes from the end and extract the lines
         # forward=True: reads buffer from the back but doesn't reverse the data 
         try:
-            with BackwardsReader(file=self.data_file, blksize=self.buffer_size, forward=True) as f:
-                data = f.read_block()
+            data = self.read_latest_block()
             if self._old_data==data:
                 return self.return_empty() 
         except FileNotFoundError:
@@ -8,12 +8,16 @@ Can read:
 from FoGSE.readers.BaseReader import BaseReader
 
 from FoGSE.readBackwards import BackwardsReader
+from FoGSE.io.catch_log import CatchLogReader, is_binary_catch_log
 from FoGSE.telemetry_tools.collections.CatchCollection import CatchCollection
 from FoGSE.utils import get_system_value
 
 class CatchReader(BaseReader):
     """
     Reader for the FOXSI catch logging file.
+
+    Reads either the text `catch.log` or the binary `catch.bin` (see 
+    `FoGSE.io.catch_log`), which is turned into the same text.
     """
 
     def __init__(self, datafile, parent=None):
@@ -23,6 +27,9 @@ class CatchReader(BaseReader):
         Collected : organised by intrumentation
         """
         BaseReader.__init__(self, datafile, parent)
+
+        # set once `self.data_file` is found to be a binary catch log
+        self._catch_log = None
         
         self.define_buffer_size(size=100) # bytes, 
         self.call_interval(get_system_value("gse", "display_settings", "timepix", "tpx", "readers", "read_interval"))
@@ -52,8 +59,13 @@ class CatchReader(BaseReader):
         # read the file `self.bufferSize` bytes from the end and extract the lines
         # forward=True: reads buffer from the back but doesn't reverse the data 
         try:
-            with BackwardsReader(file=self.data_file, blksize=self.buffer_size, forward=True) as f:
-                datalist = f.read_block()
+            if self._catch_log is None and is_binary_catch_log(self.data_file):
+                self._catch_log = CatchLogReader(self.data_file)
+            if self._catch_log is not None:
+                datalist = self._catch_log.tail_text(self.buffer_size)
+            else:
+                with BackwardsReader(file=self.data_file, blksize=self.buffer_size, forward=True) as f:
+                    datalist = f.read_block()
                 
             if self._old_data==datalist:
                 return self.return_empty() 
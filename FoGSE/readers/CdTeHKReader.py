@@ -6,12 +6,8 @@ Can read:
     * CdTe
 """
 
-import struct
-import numpy as np
-
 from FoGSE.readers.BaseReader import BaseReader
 
-from FoGSE.readBackwards import BackwardsReader
 from FoGSE.telemetry_tools.parsers.CdTeparser import CdTecanisterhkparser
 # from FoGSE.telemetry_tools.parsers.CdTeframeparser import CdTerawdataframe2parser
 from FoGSE.telemetry_tools.collections.CdTeHKCollection import CdTeHKCollection
@@ -22,6 +18,9 @@ class CdTeHKReader(BaseReader):
     Reader for the FOXSI CdTe instrument.
     """
 
+    # parse every new frame in order (see `BaseReader.read_every_frame`)
+    read_every_frame = True
+
     def __init__(self, datafile, parent=None):
         """
         Raw : binary
@@ -62,8 +61,7 @@ class CdTeHKReader(BaseReader):
         # read the file `self.bufferSize` bytes from the end and extract the lines
         # forward=True: reads buffer from the back but doesn't reverse the data 
         try:
-            with BackwardsReader(file=self.data_file, blksize=self.buffer_size, forward=True) as f:
-                data = f.read_block()
+            data = self.read_latest_block()
             if self._old_data==data:
                 return self.return_empty() 
         except FileNotFoundError:
@@ -6,13 +6,11 @@ Can read:
     * CdTe
 """
 
-import struct
 import numpy as np
-import os
 
 from FoGSE.readers.BaseReader import BaseReader
+from FoGSE.io.frame_words import frame_words, word_list
 
-from FoGSE.readBackwards import BackwardsReader
 from FoGSE.telemetry_tools.parsers.CdTeparser import CdTerawalldata2parser
 from FoGSE.telemetry_tools.parsers.CdTeframeparser import CdTerawdataframe2parser
 from FoGSE.telemetry_tools.collections.CdTeCollection import CdTeCollection
@@ -23,6 +21,9 @@ class CdTePCReader(BaseReader):
     Reader for the FOXSI CdTe instrument.
     """
 
+    # parse every new frame in order (see `BaseReader.read_every_frame`)
+    read_every_frame = True
+
     def __init__(self, datafile, parent=None):
         """
         Raw : binary
@@ -53,25 +54,38 @@ class CdTePCReader(BaseReader):
 
         Returns
         -------
-        `list` :
-            Data read from `self.data_file`.
+        `numpy.ndarray` :
+            Data read from `self.data_file`, as 32-bit words.
         """
         # read the file `self.bufferSize` bytes from the end and extract the lines
         # forward=True: reads buffer from the back but doesn't reverse the data 
         try:
-            with BackwardsReader(file=self.data_file, blksize=self.buffer_size, forward=True) as f:
-                iterative_unpack=struct.iter_unpack("<I",f.read_block())
-                datalist=[]
-                for _,data in enumerate(iterative_unpack):
-
-                    datalist.append(data[0])
-            if self._old_data==datalist:
+            block = self.read_latest_block()
+            # compare the bytes read (a memcmp) before decoding anything
+            if self._old_data==block:
                 return self.return_empty() 
         except FileNotFoundError:
             return self.return_empty() 
         
-        self._old_data = datalist
-        return datalist
+        self._old_data = block
+        return self.frame_2_raw(block)
+
+    def frame_2_raw(self, frame):
+        """
+        View one CdTe frame as its 32-bit little-endian words (see 
+        `FoGSE.io.frame_words`), without copying it.
+
+        Parameters
+        ----------
+        frame : `bytes`
+            One frame from `self.data_file`.
+
+        Returns
+        -------
+        `numpy.ndarray` :
+            The frame's words.
+        """
+        return frame_words(frame)
 
     def raw_2_parsed(self, raw_data):
         """
@@ -79,9 +93,8 @@ class CdTePCReader(BaseReader):
 
         Parameters
         ----------
-        raw_data : list of strings
-            The lines from the content of `self.data_file` obtained using 
-            `FoGSE.readBackwards.BackwardsReader`.
+        raw_data : `numpy.ndarray` or `list`
+            The 32-bit words from `self.data_file`.
 
         Returns
         -------
@@ -91,7 +104,7 @@ class CdTePCReader(BaseReader):
         # return or set human readable data
         # do stuff with the raw data and return nice, human readable data
         try:
-            flags, event_df, all_hkdicts = CdTerawdataframe2parser(raw_data) #CdTerawalldata2parser(raw_data)# 
+            flags, event_df, all_hkdicts = CdTerawdataframe2parser(word_list(raw_data)) #CdTerawalldata2parser(raw_data)# 
         except ValueError:
             # no data from parser so pass nothing on with a time of -1
             print("No data from parser.")
@@ -8,7 +8,6 @@ Can read:
 
 from FoGSE.readers.BaseReader import BaseReader
 
-from FoGSE.readBackwards import BackwardsReader
 from FoGSE.telemetry_tools.parsers.CdTeparser import CdTedehkparser
 # from FoGSE.telemetry_tools.parsers.CdTeframeparser import CdTerawdataframe2parser
 from FoGSE.telemetry_tools.collections.DECollection import DECollection
@@ -19,6 +18,9 @@ class DEReader(BaseReader):
     Reader for the FOXSI CdTe instrument.
     """
 
+    # parse every new frame in order (see `BaseReader.read_every_frame`)
+    read_every_frame = True
+
     def __init__(self, datafile, parent=None):
         """
         Raw : binary
@@ -59,8 +61,7 @@ class DEReader(BaseReader):
         # read the file `self.bufferSize` bytes from the end and extract the lines
         # forward=True: reads buffer from the back but doesn't reverse the data 
         try:
-            with BackwardsReader(file=self.data_file, blksize=self.buffer_size, forward=True) as f:
-                data = f.read_block()
+            data = self.read_latest_block()
             if self._old_data==data:
                 return self.return_empty() 
         except FileNotFoundError:
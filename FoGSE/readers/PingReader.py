@@ -5,7 +5,6 @@ Formatter Ping messages
 
 from FoGSE.readers.BaseReader import BaseReader
 
-from FoGSE.readBackwards import BackwardsReader
 from FoGSE.telemetry_tools.parsers.Pingparser import pingparser
 from FoGSE.telemetry_tools.collections.PingCollection import PingCollection
 from FoGSE.utils import get_frame_size, get_system_value
@@ -15,6 +14,9 @@ class PingReader(BaseReader):
     Reader for Formatter Ping messages.
     """
 
+    # parse every new frame in order (see `BaseReader.read_every_frame`)
+    read_every_frame = True
+
     def __init__(self, datafile, parent=None):
         """
         Raw : binary
@@ -41,8 +43,7 @@ class PingReader(BaseReader):
         # read the file `self.bufferSize` bytes from the end and extract the lines
         # forward=True: reads buffer from the back but doesn't reverse the data 
         try:
-            with BackwardsReader(file=self.data_file, blksize=self.buffer_size, forward=True) as f:
-                datalist = f.read_block()
+            datalist = self.read_latest_block()
 
             if self._old_data==datalist:
                 return self.return_empty() 
@@ -5,7 +5,6 @@ the RTDs
 
 from FoGSE.readers.BaseReader import BaseReader
 
-from FoGSE.readBackwards import BackwardsReader
 from FoGSE.telemetry_tools.parsers.RTDparser import rtdparser
 from FoGSE.telemetry_tools.collections.RTDCollection import RTDCollection
 from FoGSE.utils import get_frame_size, get_system_value
@@ -51,8 +50,7 @@ class RTDReader(BaseReader):
         # read the file `self.bufferSize` bytes from the end and extract the lines
         # forward=True: reads buffer from the back but doesn't reverse the data 
         try:
-            with BackwardsReader(file=self.data_file, blksize=self.buffer_size, forward=True) as f:
-                datalist = f.read_block()
+            datalist = self.read_latest_block()
 
             if self._old_data==datalist:
                 return self.return_empty() 
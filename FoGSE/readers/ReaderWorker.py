@@ -0,0 +1,170 @@
+"""
+Run readers' read -> parse -> collect pipelines off the GUI thread.
+
+A reader with `threaded` set (see `FoGSE.readers.BaseReader`) hands its
+updates to a `ReaderWorker` living on one of a few shared `QThread`s.
+The worker runs `extract_raw_data()` (or `read_new_frames()`),
+`raw_2_parsed()` and `parsed_2_collection()` and sends each finished
+collection back through a queued signal, so the GUI thread only sets the
+reader's `collection` and draws it.
+
+`MainThreadJitter` measures how late the GUI thread's event loop runs a
+timer, to see how much the readers are holding it up.
+"""
+import atexit
+import collections
+import time
+
+from PyQt6 import QtCore
+
+# shared worker threads, made when the first threaded reader starts
+_threads = []
+# number of workers on each of `_threads`
+_workers = []
+
+def reader_thread(threads: int=2):
+    """
+    Return the least busy of the shared reader threads, starting them if
+    they haven't been.
+
+    Parameters
+    ----------
+    threads : `int`
+        Number of threads to share between all threaded readers (only
+        used when they are started).
+    """
+    if len(_threads)==0:
+        for _ in range(max(threads, 1)):
+            thread = QtCore.QThread()
+            thread.start()
+            _threads.append(thread)
+            _workers.append(0)
+        atexit.register(stop_reader_threads)
+    k = _workers.index(min(_workers))
+    _workers[k] += 1
+    return _threads[k]
+
+def stop_reader_threads(timeout_ms: int=2_000):
+    """ Stop the shared reader threads, letting running updates finish. """
+    for thread in _threads:
+        thread.quit()
+    for thread in _threads:
+        thread.wait(timeout_ms)
+    _threads.clear()
+    _workers.clear()
+
+class ReaderWorker(QtCore.QObject):
+    """
+    Runs a reader's pipeline on a reader thread, and sends the
+    collections it makes back to the reader.
+    """
+
+    # a new collection, for `reader.collection` (queued to the GUI thread)
+    collected = QtCore.pyqtSignal(object)
+
+    def __init__(self, reader, thread):
+        """
+        Parameters
+        ----------
+        reader : `FoGSE.readers.BaseReader.BaseReader`
+            The reader whose pipeline to run.
+
+        thread : `QtCore.QThread`
+            The thread to run it on (see `reader_thread()`).
+        """
+        QtCore.QObject.__init__(self)
+        self.reader = reader
+        # time (s) the last update took, and the longest
+        self.last_update_s = 0.0
+        self.max_update_s = 0.0
+        self.moveToThread(thread)
+
+    @QtCore.pyqtSlot()
+    def update(self):
+        """ Run the reader's pipeline for the update(s) requested. """
+        check_modified = self.reader.take_update_request()
+        if check_modified is None:
+            return
+        start = time.monotonic()
+        if (not check_modified) or self.reader.frames_behind() > 0 or self.reader.file_modified_check():
+            for collection in self.reader.new_collections():
+                self.collected.emit(collection)
+        if self.reader.frames_behind() > 0:
+            # carry on with the frames left (after other readers' updates)
+            self.reader.request_update(check_modified=False)
+        self.last_update_s = time.monotonic() - start
+        self.max_update_s = max(self.max_update_s, self.last_update_s)
+
+class MainThreadJitter(QtCore.QObject):
+    """
+    Measures the GUI thread's responsiveness: how late a precise timer
+    on the thread's event loop fires.
+
+    Example
+    -------
+    >>> jitter = MainThreadJitter(report_s=5) # print a summary every 5 s
+    >>> jitter.stats()["p99_ms"]
+    """
+
+    def __init__(self, interval_ms: int=10, report_s: float=0, samples: int=1_000, parent=None):
+        """
+        Parameters
+        ----------
+        interval_ms : `int`
+            Timer interval, in milliseconds.
+
+        report_s : `float`
+            Seconds between printed summaries. 0 for none.
+
+        samples : `int`
+            Number of recent timer intervals to keep statistics over.
+        """
+        QtCore.QObject.__init__(self, parent)
+        self.interval_ms = interval_ms
+        self.report_s = report_s
+        self._lateness = collections.deque(maxlen=samples)
+        self._last = time.monotonic()
+        self._last_report = self._last
+
+        self.timer = QtCore.QTimer(self)
+        self.timer.setTimerType(QtCore.Qt.TimerType.PreciseTimer)
+        self.timer.setInterval(interval_ms)
+        self.timer.timeout.connect(self._tick)
+        self.timer.start()
+
+    def _tick(self):
+        now = time.monotonic()
+        self._lateness.append(max(now - self._last - self.interval_ms/1e3, 0.0))
+        self._last = now
+        if self.report_s > 0 and now - self._last_report >= self.report_s:
+            self._last_report = now
+            s = self.stats()
+            print("GUI thread jitter over", s["samples"], "ticks:", "mean", "{:.1f}".format(s["mean_ms"]),
+                  "ms, p99", "{:.1f}".format(s["p99_ms"]), "ms, max", "{:.1f}".format(s["max_ms"]), "ms")
+
+    def stats(self):
+        """
+        Return how late the timer has fired, over the recent samples.
+
+        Returns
+        -------
+        `dict` :
+            `"samples"`, and the `"mean_ms"`, `"p99_ms"` and `"max_ms"`
+            lateness in milliseconds.
+        """
+        lateness = sorted(self._lateness)
+        if len(lateness)==0:
+            return {"samples": 0, "mean_ms": 0.0, "p99_ms": 0.0, "max_ms": 0.0}
+        return {"samples": len(lateness),
+                "mean_ms": 1e3*sum(lateness)/len(lateness),
+                "p99_ms": 1e3*lateness[min(int(0.99*len(lateness)), len(lateness) - 1)],
+                "max_ms": 1e3*lateness[-1]}
+
+    def reset(self):
+        """ Forget the samples so far. """
+        self._lateness.clear()
+        self._last = time.monotonic()
+
+    def stop(self):
+        """ Stop measuring. """
+        self.timer.stop()
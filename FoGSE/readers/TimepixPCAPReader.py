@@ -7,7 +7,6 @@ Can read:
 """
 from FoGSE.readers.BaseReader import BaseReader
 
-from FoGSE.readBackwards import BackwardsReader
 from FoGSE.telemetry_tools.parsers.Timepixparser import timepix_pcap_parser
 from FoGSE.telemetry_tools.collections.TimepixPCAPCollection import TimepixPCAPCollection
 from FoGSE.utils import get_frame_size, get_system_value
@@ -17,6 +16,9 @@ class TimepixPCAPReader(BaseReader):
     Reader for the FOXSI Timepix instrument.
     """
 
+    # parse every new frame in order (see `BaseReader.read_every_frame`)
+    read_every_frame = True
+
     def __init__(self, datafile, parent=None):
         """
         Raw : binary
@@ -53,8 +55,7 @@ class TimepixPCAPReader(BaseReader):
         # read the file `self.bufferSize` bytes from the end and extract the lines
         # forward=True: reads buffer from the back but doesn't reverse the data 
         try:
-            with BackwardsReader(file=self.data_file, blksize=self.buffer_size, forward=True) as f:
-                datalist = f.read_block()
+            datalist = self.read_latest_block()
                 
             if self._old_data==datalist:
                 return self.return_empty() 
@@ -0,0 +1,184 @@
+"""
+Rebuild downlink log files from a raw packet journal (see
+`FoGSE.io.packet_journal`).
+
+Every journaled datagram is fed, in the order it was received, through
+the same `listening.LogFileManager` reassembly the Listener uses, as
+fast as the journal can be read. Frame sizes come from a systems.json
+file, and can be overridden per log, so a run can be reprocessed with
+different frame sizes. Incomplete frames are evicted on the journal's
+own clock, as the Listener would have evicted them, and frames are
+indexed at the arrival time of the datagram that completed (or evicted)
+them.
+`reassemble_datagrams()` does the same for any sequence of timestamped
+datagrams (see `FoGSE.capture_to_log` for packet captures).
+
+From a shell:
+    python FoGSE/reassemble_journal.py <journal folder> <systems.json> <output folder> [cdte1_pc=0x800c ...]
+"""
+import json
+import os
+import sys
+import time
+
+from FoGSE.listening import LogFileManager, LogWriter, DOWNLINK_TYPE_ENUM, PACKET_HEADER, \
+    DEFAULT_MAX_FRAMES_IN_FLIGHT, DEFAULT_FRAME_TIMEOUT_MS
+from FoGSE.io.packet_journal import read_journal
+from FoGSE.utils import get_system_dict, get_ring_buffer_interface
+
+def reassemble_journal(journal_path, json_config_file, out_folder, frame_sizes=None,
+                       local_system="gse", check_interval: float=1.0):
+    """
+    Write a log file per (system, data type) from the packets in a
+    journal.
+
+    Parameters
+    ----------
+    journal_path : `str`
+        A journal folder, or a single journal segment.
+
+    json_config_file, out_folder, frame_sizes, local_system, check_interval :
+        As for `reassemble_datagrams()`.
+
+    Returns
+    -------
+    `dict` :
+        As for `reassemble_datagrams()`.
+    """
+    return reassemble_datagrams(read_journal(journal_path), json_config_file, out_folder,
+                                frame_sizes, local_system, check_interval)
+
+def reassemble_datagrams(records, json_config_file, out_folder, frame_sizes=None,
+                         local_system="gse", check_interval: float=1.0):
+    """
+    Write a log file per (system, data type) from a sequence of
+    downlink datagrams.
+
+    Parameters
+    ----------
+    records : iterable
+        The datagrams, in the order received, each with `timestamp_ns`
+        (arrival time, nanoseconds since the Unix epoch) and `data`
+        attributes (e.g. `packet_journal.JournalRecord` or
+        `capture.Datagram`).
+
+    json_config_file : `str`
+        systems.json file to take systems, data types, frame sizes and
+        the packet payload size from.
+
+    out_folder : `str`
+        Folder to write the log files (and their `dump/` folder) to.
+
+    frame_sizes : `dict` or `None`
+        Frame sizes (bytes) to use instead of `ring_frame_size_bytes`,
+        keyed by log name, e.g. `{"cdte1_pc": 0x800c}`.
+
+    local_system : `str`
+        The `name` of the system in `json_config_file` that received
+        the packets.
+
+    check_interval : `float`
+        Seconds of journal time between checks for stale frames
+        (`LogFileManager.evict_stale()`), as in the Listener.
+
+    Returns
+    -------
+    `dict` :
+        `LogFileManager.get_stats()` for each log, keyed by log name,
+        plus `"unrouted"`: the number of packets with no log file.
+    """
+    if frame_sizes is None:
+        frame_sizes = {}
+    with open(json_config_file, "r") as json_config:
+        json_dict = json.load(json_config)
+    local_system_config = get_system_dict(local_system, json_dict)
+    if local_system_config is None:
+        print("can't access system in provided JSON!")
+        raise RuntimeError
+    payload_len = local_system_config["ethernet_interface"]["max_payload_bytes"] - PACKET_HEADER.size
+    os.makedirs(os.path.join(out_folder, "dump"), exist_ok=True)
+
+    writer = LogWriter()
+    lookup = {}
+    names = {}
+    for element in json_dict:
+        rbif = get_ring_buffer_interface(element)
+        if type(rbif) is not dict:
+            continue
+        addr = int(element["hex"], 16)
+        lookup[addr] = {}
+        for key in rbif.keys():
+            name = element["name"] + "_" + key
+            try:
+                manager = LogFileManager(
+                    os.path.join(out_folder, name + ".log"),
+                    addr,
+                    DOWNLINK_TYPE_ENUM[key],
+                    frame_sizes.get(name, int(rbif[key]["ring_frame_size_bytes"], 16)),
+                    payload_len,
+                    writer=writer,
+                    max_frames=rbif[key].get("max_frames_in_flight", DEFAULT_MAX_FRAMES_IN_FLIGHT),
+                    frame_timeout_ms=rbif[key].get("frame_timeout_ms", DEFAULT_FRAME_TIMEOUT_MS)
+                )
+            except Exception as e:
+                print(e)
+                print("\tcouldn't create log for ", name)
+                continue
+            lookup[addr][DOWNLINK_TYPE_ENUM[key]] = manager
+            names[name] = manager
+    managers = list(names.values())
+
+    unrouted = 0
+    last_check = None
+    timestamp_ns = None
+    for record in records:
+        timestamp_ns = record.timestamp_ns
+        now = timestamp_ns/1e9
+        if last_check is None:
+            last_check = now
+        elif now - last_check >= check_interval:
+            for manager in managers:
+                manager.evict_stale(now, timestamp_ns)
+            last_check = now
+
+        data = record.data
+        if len(data) < PACKET_HEADER.size:
+            continue
+        manager = lookup.get(data[0], {}).get(data[5])
+        if manager is None:
+            unrouted += 1
+            continue
+        # timed by the datagrams' own clock, not by how fast they are
+        # replayed
+        manager.enqueue(data, timestamp_ns)
+
+    # as on Listener shutdown, anything still incomplete goes to dump/
+    for manager in managers:
+        for counter in list(manager.frames.keys()):
+            manager.dump(counter, timestamp_ns)
+    writer.stop()
+
+    stats = {"unrouted": unrouted}
+    for name, manager in names.items():
+        manager.close()
+        stats[name] = manager.get_stats()
+    return stats
+
+if __name__ == "__main__":
+    if len(sys.argv) < 4:
+        print("usage: python FoGSE/reassemble_journal.py <journal> <systems.json> <output folder> [<log>=<frame size> ...]")
+        sys.exit(1)
+    sizes = {}
+    for arg in sys.argv[4:]:
+        name, size = arg.split("=")
+        sizes[name] = int(size, 0)
+    start = time.monotonic()
+    result = reassemble_journal(sys.argv[1], sys.argv[2], sys.argv[3], sizes)
+    elapsed = time.monotonic() - start
+    packets = sum(s["packets"] for name, s in result.items() if name != "unrouted") + result["unrouted"]
+    for name, s in sorted(result.items()):
+        if name != "unrouted":
+            print(name, "frames:", s["frames_completed"], "dumped:", s["frames_dumped"],
+                  "missing packets:", s["missing_packets"])
+    print("unrouted packets:", result["unrouted"])
+    print("reassembled", packets, "packets in", "{:.2f}".format(elapsed), "s")
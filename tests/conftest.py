@@ -0,0 +1,41 @@
+"""Fixtures shared by the tests"""
+
+import os
+
+import pytest
+
+# so the checks in the shared helpers report like the tests' own
+pytest.register_assert_rewrite("tests.helpers")
+
+def _qt_platform_available():
+    """Whether a `QApplication` can be made here without Qt aborting the tests."""
+    from PyQt6.QtCore import QLibraryInfo
+
+    platform = os.environ.get("QT_QPA_PLATFORM", "")
+    if platform.split(":")[0] in ("offscreen", "minimal"):
+        return True
+    if os.environ.get("DISPLAY") or os.environ.get("WAYLAND_DISPLAY"):
+        return True
+    if platform:
+        # some other platform asked for, with no display to show it on
+        return False
+    # no display: run headless, if Qt has the plugin for it
+    plugins = os.path.join(QLibraryInfo.path(QLibraryInfo.LibraryPath.PluginsPath), "platforms")
+    if not any("offscreen" in name for name in (os.listdir(plugins) if os.path.isdir(plugins) else [])):
+        return False
+    os.environ["QT_QPA_PLATFORM"] = "offscreen"
+    return True
+
+@pytest.fixture
+def qapp():
+    """The `QApplication` for tests of the readers, skipping them where there is no PyQt6 or display."""
+    QtWidgets = pytest.importorskip("PyQt6.QtWidgets")
+    app = QtWidgets.QApplication.instance()
+    if app is not None:
+        return app
+    if not _qt_platform_available():
+        pytest.skip("no display for Qt")
+    try:
+        return QtWidgets.QApplication([])
+    except Exception as e:
+        pytest.skip("can't make a QApplication: " + str(e))
@@ -0,0 +1,131 @@
+"""Helpers shared by the tests of the Listener and the logs it writes"""
+
+import os
+import sys
+import glob
+import json
+import time
+import signal
+import socket
+import subprocess
+
+from FoGSE.listening import LogFileManager, MAX_DATAGRAMS_PER_WAKEUP
+from FoGSE.io.log_index import LogIndex, DEST_LOG
+from FoGSE.io.ingest_stats import request_stats
+
+def make_manager(tmp_path, frame_len=10, payload_len=4, system=0x09, data=0x00, **kwargs):
+    """Make a `LogFileManager` writing into `tmp_path` (with its `dump/` folder)."""
+    os.makedirs(os.path.join(tmp_path, "dump"), exist_ok=True)
+    return LogFileManager(os.path.join(tmp_path, "test.log"), system, data, frame_len, payload_len, **kwargs)
+
+def make_packets(frame, payload_len, frame_counter, system=0x09, data=0x00):
+    """Split `frame` into packets with the 8-byte downlink header."""
+    chunks = [frame[i:i + payload_len] for i in range(0, len(frame), payload_len)]
+    packets = []
+    for k, chunk in enumerate(chunks):
+        header = bytes([system,
+                        (len(chunks) >> 8) & 0xff, len(chunks) & 0xff,
+                        ((k + 1) >> 8) & 0xff, (k + 1) & 0xff,
+                        data,
+                        (frame_counter >> 8) & 0xff, frame_counter & 0xff])
+        packets.append(header + chunk)
+    return packets
+
+def loopback_config(folder, port):
+    """Write a systems.json for a Listener on 127.0.0.1:`port` (the formatter on 127.0.0.2) into `folder`, and return its path."""
+    config = [
+        {"name": "gse", "hex": "0x00",
+         "ethernet_interface": {"protocol": "udp", "address": "127.0.0.1", "port": port,
+                                "max_payload_bytes": 12, "recv_buffer_bytes": 1 << 20},
+         "logger_interface": {"log_received_folder": os.path.join(folder, "received"),
+                              "log_sent_folder": os.path.join(folder, "sent"),
+                              "unix_listen_socket": os.path.join(folder, "listen.sock"),
+                              "uplink_device": os.path.join(folder, "no_uplink")}},
+        {"name": "formatter", "hex": "0x01", "ethernet_interface": {"protocol": "udp", "address": "127.0.0.2", "port": port}},
+        {"name": "uplink", "hex": "0x02", "uart_interface": {"baud_rate": 9600}},
+        {"name": "test", "hex": "0x09", "ring_buffer_interface": {"pc": {"ring_frame_size_bytes": "0xa"}}}
+    ]
+    path = os.path.join(folder, "systems.json")
+    with open(path, "w") as f:
+        json.dump(config, f)
+    return path
+
+def check_listener_loopback(script, tmp_path, frames=60):
+    """
+    Run the Listener `script` (e.g. `"FoGSE/listening.py"`) over loopback:
+    queue more than `MAX_DATAGRAMS_PER_WAKEUP` datagrams of interleaved
+    frames while it is paused, send it control messages on its Unix
+    socket, and check what reaches its log and index.
+    """
+    # the formatter's end, on the same port as the Listener
+    sender = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
+    sender.bind(("127.0.0.2", 0))
+    port = sender.getsockname()[1]
+    config = loopback_config(str(tmp_path), port)
+    root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+    proc = subprocess.Popen([sys.executable, os.path.join(root, script), config], cwd=root,
+                            env=dict(os.environ, PYTHONPATH=root), stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+    control = os.path.join(tmp_path, "listen.sock")
+    try:
+        deadline = time.monotonic() + 20
+        stats = None
+        while stats is None and time.monotonic() < deadline and proc.poll() is None:
+            try:
+                stats = request_stats(control, timeout=0.2)
+            except OSError:
+                time.sleep(0.05)
+        assert stats is not None, "Listener didn't start."
+        assert stats["logs"]["test_pc"]["packets"] == 0
+        log = glob.glob(os.path.join(tmp_path, "received", "*", "test_pc.log"))[0]
+
+        data = [bytes([n])*10 for n in range(frames)]
+        packets = []
+        for n in range(0, frames, 2):
+            a, b = make_packets(data[n], 4, n), make_packets(data[n + 1], 4, n + 1)
+            packets += [b[2], a[1], b[0], a[2], a[0], b[1]]
+        assert len(packets) > MAX_DATAGRAMS_PER_WAKEUP
+        # part of a frame, left in flight
+        packets.append(make_packets(bytes([0xaa])*10, 4, 99)[1])
+        os.kill(proc.pid, signal.SIGSTOP)
+        try:
+            for packet in packets:
+                sender.sendto(packet, ("127.0.0.1", port))
+        finally:
+            os.kill(proc.pid, signal.SIGCONT)
+
+        def wait_for_size(size):
+            deadline = time.monotonic() + 10
+            while os.path.getsize(log) < size and time.monotonic() < deadline:
+                time.sleep(0.01)
+            return os.path.getsize(log)
+
+        assert wait_for_size(10*frames) == 10*frames, "Every whole frame should reach the log."
+        stats = request_stats(control)
+        assert stats["logs"]["test_pc"]["packets"] == len(packets)
+        assert stats["logs"]["test_pc"]["frames_completed"] == frames
+
+        # clear frames to log, then an uplink command (which fails: there is no uplink device)
+        client = socket.socket(socket.AF_UNIX, socket.SOCK_DGRAM)
+        client.sendto(b"\x00\xcb", control)
+        client.sendto(b"\x01\x23", control)
+        client.close()
+        assert wait_for_size(10*(frames + 1)) == 10*(frames + 1), "Clearing should write the frame in flight."
+        deadline = time.monotonic() + 5
+        while request_stats(control)["listener"]["uplink"]["failed"] == 0 and time.monotonic() < deadline:
+            time.sleep(0.01)
+        assert request_stats(control)["listener"]["uplink"]["failed"] == 1, "The command should go to the uplink."
+    finally:
+        sender.close()
+        proc.send_signal(signal.SIGINT)
+        try:
+            proc.wait(10)
+        except subprocess.TimeoutExpired:
+            proc.kill()
+            proc.wait()
+
+    with open(log, "rb") as f:
+        assert f.read() == b"".join(data) + bytes(4) + bytes([0xaa])*4 + bytes(2)
+    records = LogIndex(log).records()
+    assert [r.counter for r in records] == list(range(frames)) + [99]
+    assert [r.offset for r in records] == list(range(0, 10*(frames + 1), 10))
+    assert (records[-1].destination, records[-1].missing) == (DEST_LOG, 2)
@@ -0,0 +1,110 @@
+"""
+Measure how much the packet journal (`FoGSE.io.packet_journal`) costs
+the Listener's receive throughput.
+
+Runs the `selectors` Listener (`FoGSE/listening.py`) on
+`benchmark_listener.py`'s loopback systems.json, once without and once
+with `"packet_journal": true`. The Listener is paused while a burst of
+cdte1 PC frames is queued on its socket (a burst must fit in the socket
+buffer), then resumed and timed until the burst's frames are in the log.
+There is no sender competing for the CPU while it drains, so the drain
+rate is the Listener's receive throughput. The CPU time it takes (all
+threads, so the journal's writes count too) is reported as well. The
+best of several runs of each is kept.
+
+From the repository root (Linux only):
+    python tests/network/benchmark_journal.py [frames] [runs] [frames per burst]
+"""
+import os
+import signal
+import socket
+import subprocess
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+from benchmark_listener import FRAME_LEN, LISTEN_PORT, cpu_seconds, make_config, make_packets
+
+def find_log(folder, timeout=10.0):
+    """ Wait for the Listener to create its cdte1 PC log in `folder`, and return its path. """
+    received = os.path.join(folder, "received")
+    end = time.monotonic() + timeout
+    while time.monotonic() < end:
+        for run_folder in (os.listdir(received) if os.path.isdir(received) else []):
+            path = os.path.join(received, run_folder, "cdte1_pc.log")
+            if os.path.exists(path):
+                return path
+        time.sleep(0.1)
+    print("Listener didn't start")
+    raise RuntimeError
+
+def run(packets, frames: int, burst_frames: int, journal: bool):
+    """
+    Drain `packets` (`frames` frames) through a Listener in bursts of
+    `burst_frames` frames.
+
+    Returns
+    -------
+    `dict` :
+        Packets received per second, CPU microseconds per packet, and
+        whether every frame reached the log.
+    """
+    per_frame = len(packets)//frames
+    with tempfile.TemporaryDirectory() as folder:
+        config = make_config(folder, journal)
+        env = dict(os.environ, PYTHONPATH=os.getcwd())
+        proc = subprocess.Popen([sys.executable, "FoGSE/listening.py", config], env=env,
+                                stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+        sender = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
+        complete = True
+        busy = wall = 0.0
+        try:
+            log = find_log(folder)
+            # let start-up settle
+            time.sleep(1.0)
+            sender.bind(("127.0.0.2", LISTEN_PORT))
+            for first in range(0, frames, burst_frames):
+                last = min(first + burst_frames, frames)
+                os.kill(proc.pid, signal.SIGSTOP)
+                for packet in packets[first*per_frame:last*per_frame]:
+                    sender.sendto(packet, ("127.0.0.1", LISTEN_PORT))
+                start, start_cpu = time.monotonic(), cpu_seconds(proc.pid)
+                os.kill(proc.pid, signal.SIGCONT)
+                end = start + 10
+                while os.path.getsize(log) < last*FRAME_LEN and time.monotonic() < end:
+                    time.sleep(0.001)
+                wall += time.monotonic() - start
+                busy += cpu_seconds(proc.pid) - start_cpu
+                complete = complete and os.path.getsize(log) >= last*FRAME_LEN
+        finally:
+            sender.close()
+            os.kill(proc.pid, signal.SIGCONT)
+            proc.send_signal(signal.SIGINT)
+            try:
+                proc.wait(10)
+            except subprocess.TimeoutExpired:
+                proc.kill()
+    return {"packets_per_s": len(packets)/wall, "us_per_packet": busy/len(packets)*1e6, "complete": complete}
+
+if __name__ == "__main__":
+    frames = int(sys.argv[1]) if len(sys.argv) > 1 else 2000
+    runs = int(sys.argv[2]) if len(sys.argv) > 2 else 5
+    burst_frames = int(sys.argv[3]) if len(sys.argv) > 3 else 80
+    packets = make_packets(frames)
+    print(len(packets), "packets,", frames, "frames of", FRAME_LEN, "bytes, in bursts of", burst_frames,
+          "frames, best of", runs, "runs")
+    results = {False: [], True: []}
+    for _ in range(runs):
+        for journal in (False, True):
+            result = run(packets, frames, burst_frames, journal)
+            if not result["complete"]:
+                print("frames missing", "with" if journal else "without", "the journal")
+            results[journal].append(result)
+    best = {journal: (max(r["packets_per_s"] for r in results[journal]),
+                      min(r["us_per_packet"] for r in results[journal])) for journal in results}
+    for journal in (False, True):
+        print("{:16s} {:8.0f} packets/s   {:6.2f} us CPU/packet".format(
+            "with journal" if journal else "without journal", *best[journal]))
+    print("journal costs {:4.1f} % of receive throughput ({:4.1f} % more CPU)".format(
+        100*(1 - best[True][0]/best[False][0]), 100*(best[True][1]/best[False][1] - 1)))
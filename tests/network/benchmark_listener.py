@@ -0,0 +1,169 @@
+"""
+Compare the CPU cost of the `selectors` Listener (`FoGSE/listening.py`),
+the asyncio Listener (`FoGSE/listening_async.py`) and the sharded
+Listener (`FoGSE/listening_sharded.py`, whose workers' CPU is counted
+too, and shown separately).
+
+Each Listener is started in its own process on a temporary
+systems.json (loopback only: the Listener on 127.0.0.1, the formatter on
+127.0.0.2). The benchmark measures the Listener's CPU use (all threads,
+from /proc) while idle, then while it logs a burst of frames, and reports
+CPU time per packet. Packets are sent at a fixed rate that both
+Listeners should keep up with, so the CPU figures are for the same work.
+
+From the repository root (Linux only):
+    python tests/network/benchmark_listener.py [frames] [idle seconds] [packets/s]
+"""
+import json
+import os
+import signal
+import socket
+import subprocess
+import sys
+import tempfile
+import time
+
+FRAME_LEN = 0x800c
+MAX_PAYLOAD = 1448
+HEADER_LEN = 8
+LISTEN_PORT = 19990
+
+def make_config(folder, journal: bool=False):
+    """
+    Write a loopback systems.json to `folder` and return its path.
+    `journal` turns on the packet journal.
+    """
+    config = [
+        {"name": "gse", "hex": "0x00",
+         "ethernet_interface": {"protocol": "udp", "address": "127.0.0.1", "port": LISTEN_PORT,
+                                "max_payload_bytes": MAX_PAYLOAD, "recv_buffer_bytes": 8388608},
+         "logger_interface": {"log_received_folder": os.path.join(folder, "received"),
+                              "log_sent_folder": os.path.join(folder, "sent"),
+                              "unix_listen_socket": os.path.join(folder, "listen.sock"),
+                              "uplink_device": os.path.join(folder, "no_uplink"),
+                              "packet_journal": journal}},
+        {"name": "formatter", "hex": "0x01",
+         "ethernet_interface": {"protocol": "udp", "address": "127.0.0.2", "port": LISTEN_PORT}},
+        {"name": "uplink", "hex": "0x02", "uart_interface": {"baud_rate": 9600}},
+        {"name": "cdte1", "hex": "0x09",
+         "spacewire_interface": {"ring_buffer_interface": {"pc": {"ring_frame_size_bytes": hex(FRAME_LEN)}}}}
+    ]
+    path = os.path.join(folder, "systems.json")
+    with open(path, "w") as f:
+        json.dump(config, f)
+    return path
+
+def make_packets(frames: int):
+    """ Return the datagrams for `frames` cdte1 PC frames. """
+    payload = MAX_PAYLOAD - HEADER_LEN
+    total = -(-FRAME_LEN//payload)
+    packets = []
+    for n in range(frames):
+        frame = bytes([n & 0xff])*FRAME_LEN
+        for k in range(total):
+            header = bytes([0x09, total >> 8, total & 0xff, (k + 1) >> 8, (k + 1) & 0xff,
+                            0x00, (n >> 8) & 0xff, n & 0xff])
+            packets.append(header + frame[k*payload:(k + 1)*payload])
+    return packets
+
+def cpu_seconds(pid):
+    """ User plus system CPU time of process `pid` (all threads), in seconds. """
+    with open("/proc/" + str(pid) + "/stat") as f:
+        fields = f.read().rsplit(")", 1)[1].split()
+    return (int(fields[11]) + int(fields[12]))/os.sysconf("SC_CLK_TCK")
+
+def child_cpu_seconds(pid):
+    """ Total `cpu_seconds()` of the running children of process `pid`. """
+    try:
+        with open("/proc/" + str(pid) + "/task/" + str(pid) + "/children") as f:
+            children = f.read().split()
+    except OSError:
+        return 0.0
+    total = 0.0
+    for child in children:
+        try:
+            total += cpu_seconds(child)
+        except OSError:
+            pass
+    return total
+
+def wait_for_size(path, size, timeout=30.0):
+    """ Wait until the file at `path` holds `size` bytes. """
+    end = time.monotonic() + timeout
+    while time.monotonic() < end:
+        if os.path.exists(path) and os.path.getsize(path) >= size:
+            return True
+        time.sleep(0.01)
+    return False
+
+def run(script, packets, frames, idle_s, rate, journal: bool=False):
+    """
+    Benchmark one Listener script (with the packet journal on, if
+    `journal`).
+
+    Returns
+    -------
+    `dict` :
+        Idle CPU fraction, CPU microseconds per packet (in total, and in
+        child processes), and whether every frame reached the log.
+    """
+    with tempfile.TemporaryDirectory() as folder:
+        config = make_config(folder, journal)
+        env = dict(os.environ, PYTHONPATH=os.getcwd())
+        proc = subprocess.Popen([sys.executable, script, config], env=env,
+                                stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+        try:
+            # wait for the log file, then let start-up settle
+            received = os.path.join(folder, "received")
+            end = time.monotonic() + 10
+            log = None
+            while log is None and time.monotonic() < end:
+                time.sleep(0.1)
+                for run_folder in (os.listdir(received) if os.path.isdir(received) else []):
+                    path = os.path.join(received, run_folder, "cdte1_pc.log")
+                    if os.path.exists(path):
+                        log = path
+            if log is None:
+                print("Listener", script, "didn't start")
+                raise RuntimeError
+            time.sleep(1.0)
+
+            start = cpu_seconds(proc.pid) + child_cpu_seconds(proc.pid)
+            time.sleep(idle_s)
+            idle = (cpu_seconds(proc.pid) + child_cpu_seconds(proc.pid) - start)/idle_s
+
+            sender = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
+            sender.bind(("127.0.0.2", LISTEN_PORT))
+            start = cpu_seconds(proc.pid)
+            start_children = child_cpu_seconds(proc.pid)
+            send_start = time.monotonic()
+            for k, packet in enumerate(packets):
+                sender.sendto(packet, ("127.0.0.1", LISTEN_PORT))
+                if k % 64 == 63:
+                    ahead = send_start + (k + 1)/rate - time.monotonic()
+                    if ahead > 0:
+                        time.sleep(ahead)
+            complete = wait_for_size(log, frames*FRAME_LEN)
+            busy_children = child_cpu_seconds(proc.pid) - start_children
+            busy = cpu_seconds(proc.pid) - start + busy_children
+            sender.close()
+        finally:
+            proc.send_signal(signal.SIGINT)
+            try:
+                proc.wait(10)
+            except subprocess.TimeoutExpired:
+                proc.kill()
+    return {"idle_cpu": idle, "us_per_packet": busy/len(packets)*1e6,
+            "us_per_packet_children": busy_children/len(packets)*1e6, "complete": complete}
+
+if __name__ == "__main__":
+    frames = int(sys.argv[1]) if len(sys.argv) > 1 else 2000
+    idle_s = float(sys.argv[2]) if len(sys.argv) > 2 else 5.0
+    rate = float(sys.argv[3]) if len(sys.argv) > 3 else 20000
+    packets = make_packets(frames)
+    print(len(packets), "packets,", frames, "frames of", FRAME_LEN, "bytes, at", rate, "packets/s")
+    for script in ("FoGSE/listening.py", "FoGSE/listening_async.py", "FoGSE/listening_sharded.py"):
+        result = run(script, packets, frames, idle_s, rate)
+        print("{:28s} idle CPU {:5.2f} %   {:6.2f} us CPU/packet ({:6.2f} in workers)   {}".format(
+            script, 100*result["idle_cpu"], result["us_per_packet"], result["us_per_packet_children"],
+            "all frames logged" if result["complete"] else "FRAMES MISSING"))
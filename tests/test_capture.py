@@ -0,0 +1,100 @@
+"""Test reading downlink captures with `capture.CaptureReader`, converting them with `capture_to_log` and replaying them with `transmitFromCapture`"""
+
+import os
+import json
+import socket
+import struct
+
+import pytest
+
+from FoGSE.capture_to_log import convert_capture
+from FoGSE.io.capture import CaptureReader
+from FoGSE.io.log_index import LogIndex, DEST_LOG
+from FoGSE.playback_pcap.transmitFromCapture import CaptureTransmitter, DEFAULT_BATCH_S
+
+from tests.helpers import make_packets
+
+def _ipv4_fragments(payload, ident, port, fragment_len=None, dst="224.1.1.118"):
+    """Make the Ethernet frames carrying `payload` as a UDP datagram, split into IPv4 fragments."""
+    udp = struct.pack(">HHHH", 9999, port, 8 + len(payload), 0) + payload
+    fragment_len = fragment_len or len(udp)
+    frames = []
+    for offset in range(0, len(udp), fragment_len):
+        chunk = udp[offset:offset + fragment_len]
+        more = 0x2000 if offset + fragment_len < len(udp) else 0
+        ip = struct.pack(">BBHHHBBH4s4s", 0x45, 0, 20 + len(chunk), ident, more | offset//8, 64, 17, 0,
+                         socket.inet_aton("192.168.1.8"), socket.inet_aton(dst))
+        frames.append(bytes(12) + b"\x08\x00" + ip + chunk)
+    return frames
+
+def _write_capture(path, frames, pcapng=False):
+    """Write Ethernet `frames` to a pcap (or pcapng) capture, a millisecond apart."""
+    start_us = 1_700_000_000_000_000
+    with open(path, "wb") as f:
+        if not pcapng:
+            f.write(struct.pack("<IHHiIII", 0xa1b2c3d4, 2, 4, 0, 0, 65535, 1))
+            for n, frame in enumerate(frames):
+                t = start_us + 1000*n
+                f.write(struct.pack("<IIII", t//1_000_000, t%1_000_000, len(frame), len(frame)) + frame)
+            return
+        f.write(struct.pack("<IIIHHqI", 0x0a0d0d0a, 28, 0x1a2b3c4d, 1, 0, -1, 28))
+        f.write(struct.pack("<IIHHII", 1, 20, 1, 0, 65535, 20))
+        for n, frame in enumerate(frames):
+            t = start_us + 1000*n
+            padded = frame + bytes(-len(frame) % 4)
+            f.write(struct.pack("<IIIIIII", 6, 32 + len(padded), 0, t >> 32, t & 0xffffffff, len(frame), len(frame))
+                    + padded + struct.pack("<I", 32 + len(padded)))
+
+def test_capture_to_log(tmp_path):
+    """Check downlink datagrams are read from pcap and pcapng captures, reassembling IPv4 fragments."""
+    frames = [bytes([n])*10 for n in range(4)]
+    packets = [p for n, frame in enumerate(frames) for p in make_packets(frame, 4, n)]
+    captured = []
+    for n, packet in enumerate(packets):
+        fragments = _ipv4_fragments(packet, n, 9999, fragment_len=8 if n % 2 else None)
+        captured += fragments[::-1] if n == 3 else fragments
+    captured[5:5] = _ipv4_fragments(bytes(12), 100, 8888) # another port
+    captured += _ipv4_fragments(bytes(12), 101, 9999, fragment_len=8)[1:] # never completed
+
+    config = [{"name": "gse", "hex": "0x00", "ethernet_interface": {"address": "192.168.1.100", "port": 9999,
+                                                                    "mcast_group": "224.1.1.118",
+                                                                    "max_payload_bytes": 12}},
+              {"name": "test", "hex": "0x09", "ring_buffer_interface": {"pc": {"ring_frame_size_bytes": "0xa"}}}]
+    with open(os.path.join(tmp_path, "systems.json"), "w") as f:
+        json.dump(config, f)
+    for pcapng in (False, True):
+        path = os.path.join(tmp_path, "downlink.pcapng" if pcapng else "downlink.pcap")
+        _write_capture(path, captured, pcapng)
+        capture = CaptureReader(path, "224.1.1.118", 9999)
+        datagrams = list(capture.datagrams())
+        assert [d.data for d in datagrams] == packets, "Fragmented datagrams should be reassembled in order."
+        assert capture.fragments_dropped == 1
+
+        folder, stats = convert_capture(path, os.path.join(tmp_path, "systems.json"), os.path.join(tmp_path, str(pcapng)))
+        assert stats["test_pc"]["frames_completed"] == 4
+        with open(os.path.join(folder, "test_pc.log"), "rb") as log:
+            assert log.read() == b"".join(frames)
+        # each frame is indexed at the capture time of its last packet
+        assert [r.timestamp_ns for r in LogIndex(os.path.join(folder, "test_pc.log")).records(DEST_LOG)] \
+            == [datagrams[3*n + 2].timestamp_ns for n in range(4)], "Frames should be indexed at capture times."
+
+def test_capture_replay(tmp_path):
+    """Check a capture is replayed in order, at a multiple of its own pace."""
+    packets = [bytes([n])*20 for n in range(50)]
+    path = os.path.join(tmp_path, "downlink.pcap")
+    # 50 ms of capture
+    _write_capture(path, [f for n, packet in enumerate(packets) for f in _ipv4_fragments(packet, n, 9999)])
+    receiver = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
+    receiver.bind(("127.0.0.1", 0))
+    receiver.settimeout(1.0)
+    transmitter = CaptureTransmitter(path, "127.0.0.1", 0, "127.0.0.1", receiver.getsockname()[1],
+                                     capture_address="224.1.1.118")
+    for speed in (10, 0):
+        result = transmitter.transmit(speed, report_interval=0)
+        assert [receiver.recv(2048) for _ in packets] == packets
+        assert result["packets"] == len(packets) and result["capture_s"] == pytest.approx(0.049)
+        if speed > 0:
+            # (datagrams may go up to one batch window early)
+            assert result["elapsed_s"] >= 0.049/speed - DEFAULT_BATCH_S, "Replay should keep to the (scaled) capture timing."
+    transmitter.close()
+    receiver.close()
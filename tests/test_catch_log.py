@@ -0,0 +1,89 @@
+"""Test the binary catch log `catch_log.CatchLogWriter` and `catch_log.CatchLogReader`"""
+
+import os
+
+from FoGSE.io import catch_log
+from FoGSE.io.catch_log import CatchLogWriter, CatchLogReader, convert_catch_log, is_binary_catch_log, catch_log_text
+from FoGSE.io.catch_log import CATCH_HEADER, CATCH_RECORD, CATCH_MAGIC
+
+def test_binary_catch_log(tmp_path):
+    """Check caught packets round-trip through the binary catch log and convert to the text view."""
+    catch = CatchLogWriter(os.path.join(tmp_path, "catch.bin"), summary_interval=0)
+    packets = [bytes([0x42, 0, 1, 0, 1, 0x99, 0, n]) + bytes([n])*n for n in range(3)]
+    catch.write(packets[0])
+    catch.report()
+    assert is_binary_catch_log(catch.filepath)
+
+    reader = CatchLogReader(catch.filepath)
+    first = reader.read_new()
+    assert [r.data for r in first] == packets[:1]
+    catch.write(memoryview(packets[1]))
+    catch.write(packets[2])
+    assert reader.read_new() == [], "Buffered records should not be visible before a flush."
+    assert catch.report() == 2, "Summary should count packets caught since the last one."
+    assert [r.data for r in reader.read_new()] == packets[1:], "Only new records should be returned."
+    catch.close()
+
+    assert convert_catch_log(catch.filepath, os.path.join(tmp_path, "catch.log")) == 3
+    with open(os.path.join(tmp_path, "catch.log")) as text:
+        lines = text.read().splitlines()
+    assert [line.split("] ")[1] for line in lines] == [p.hex() for p in packets]
+    assert lines[0].startswith("[0:00:00."), "Times should be shown since the start of the log."
+    assert CatchLogReader(catch.filepath).tail_text(20) == (lines[2] + "\n").encode()[-20:]
+
+
+def test_catch_log_tail(tmp_path, monkeypatch):
+    """Check the text tail is read back from the end of the log, formatting only the records it needs."""
+    catch = CatchLogWriter(os.path.join(tmp_path, "catch.bin"), summary_interval=0)
+    packets = [bytes([0x42, 0, 1, 0, 1, 0x99, 0, n & 0xff]) + bytes(n % 7) for n in range(5000)]
+    for packet in packets:
+        catch.write(packet)
+    catch.report()
+    text = catch_log_text(catch.filepath)
+
+    formatted = []
+    format_record = catch_log.format_record
+    monkeypatch.setattr(catch_log, "format_record", lambda record: formatted.append(record) or format_record(record))
+    reader = CatchLogReader(catch.filepath)
+    assert reader.tail_text(100) == text[-100:]
+    assert len(formatted) <= 4, "Only the records in the tail should be formatted."
+    assert reader.tail_text(100) == text[-100:] and len(formatted) <= 4, "An unchanged log shouldn't be read again."
+    catch.write(packets[0])
+    catch.report()
+    assert reader.tail_text(100) == catch_log_text(catch.filepath)[-100:]
+    assert reader.tail_text(0) == catch_log_text(catch.filepath)
+    catch.close()
+
+def test_catch_log_append(tmp_path):
+    """Check appending to a catch log cuts off a torn last record, and keeps a version 1 log in its format."""
+    path = os.path.join(tmp_path, "catch.bin")
+    packets = [bytes([0x42, 0, 1, 0, 1, 0x99, 0, n]) + bytes([n])*n for n in range(4)]
+    catch = CatchLogWriter(path)
+    for packet in packets[:2]:
+        catch.write(packet)
+    catch.close()
+    complete = os.path.getsize(path)
+    with open(path, "ab") as f:
+        # the start of a record whose write was cut short
+        f.write(CATCH_RECORD.pack(0, 50) + bytes(20))
+    catch = CatchLogWriter(path, append=True)
+    catch.write(packets[2])
+    catch.close()
+    assert os.path.getsize(path) > complete
+    assert [r.data for r in CatchLogReader(path).read_new()] == packets[:3]
+    assert CatchLogReader(path).tail_text(0) == catch_log_text(path)
+
+    # a version 1 log: no length trailers
+    old = os.path.join(tmp_path, "old.bin")
+    with open(old, "wb") as f:
+        f.write(CATCH_HEADER.pack(CATCH_MAGIC, 1, 0))
+        for packet in packets[:2]:
+            f.write(CATCH_RECORD.pack(0, len(packet)) + packet)
+        f.write(CATCH_RECORD.pack(0, 50))
+    catch = CatchLogWriter(old, append=True)
+    catch.write(packets[2])
+    catch.close()
+    reader = CatchLogReader(old)
+    assert reader.version == 1
+    assert [r.data for r in reader.read_new()] == packets[:3]
+    assert CatchLogReader(old).tail_text(0) == catch_log_text(old)
@@ -0,0 +1,65 @@
+"""Test `frame_events.FrameEventPublisher` and `frame_events.FrameEventSubscriber`, and readers' subscriptions"""
+
+import os
+import socket
+
+from FoGSE.listening import LogWriter
+from FoGSE.io.frame_events import FrameEventPublisher, FrameEventSubscriber, SUBSCRIBE
+
+from tests.helpers import make_manager, make_packets
+
+def test_frame_written_events(tmp_path):
+    """Check the Listener's frame events reach a subscriber after each frame is written."""
+    listener_socket = socket.socket(socket.AF_UNIX, socket.SOCK_DGRAM)
+    listener_socket.bind(os.path.join(tmp_path, "listener.sock"))
+    subscriber = FrameEventSubscriber(os.path.join(tmp_path, "listener.sock"), os.path.join(tmp_path, "test.log"))
+    request, address = listener_socket.recvfrom(4096)
+    assert request == SUBSCRIBE + os.path.realpath(os.path.join(tmp_path, "test.log")).encode("utf-8")
+
+    publisher = FrameEventPublisher()
+    publisher.subscribe(address, 0x09, 0x00)
+    writer = LogWriter()
+    manager = make_manager(tmp_path, writer=writer)
+    manager.on_frame_written = publisher.publish
+    for counter in range(2):
+        for packet in make_packets(bytes([counter])*10, 4, counter):
+            manager.enqueue(packet)
+    writer.join()
+
+    assert subscriber.read_events() == [(0x09, 0x00, 0, 10, 0), (0x09, 0x00, 10, 10, 1)], "Expected one event per written frame."
+    subscriber.close()
+    publisher.publish(0x09, 0x00, 20, 10, 2)
+    assert publisher._subscribers == {}, "Subscribers whose socket is gone should be dropped."
+    writer.stop()
+    publisher.close()
+    listener_socket.close()
+
+def test_reader_closes_subscription(tmp_path, qapp):
+    """Check a reader's frame event subscription (and its temporary socket) goes with the reader."""
+    from PyQt6 import sip
+    from FoGSE.readers.BaseReader import BaseReader
+
+    listener_socket = socket.socket(socket.AF_UNIX, socket.SOCK_DGRAM)
+    listener_socket.bind(os.path.join(tmp_path, "listener.sock"))
+    path = os.path.join(tmp_path, "test.log")
+    open(path, "wb").close()
+
+    reader = BaseReader(path)
+    assert reader.subscribe_to_listener(os.path.join(tmp_path, "listener.sock"))
+    events = reader._frame_events
+    assert os.path.isdir(events._dir)
+    assert reader.subscribe_to_listener(os.path.join(tmp_path, "listener.sock"))
+    assert not os.path.exists(events._dir), "Subscribing again should close the old subscription."
+
+    events = reader._frame_events
+    sip.delete(reader)
+    assert not os.path.exists(events._dir), "Deleting the reader should close its subscription."
+
+    reader = BaseReader(path)
+    reader.subscribe_to_listener(os.path.join(tmp_path, "listener.sock"))
+    events = reader._frame_events
+    qapp.aboutToQuit.emit()
+    assert not os.path.exists(events._dir), "Quitting should close the subscription."
+    reader.unsubscribe_from_listener()
+    assert reader._frame_events is None
+    listener_socket.close()
@@ -0,0 +1,91 @@
+"""Test the shared memory ring `frame_ring.FrameRing`, and readers taking frames from it"""
+
+import os
+
+from FoGSE.listening import LogWriter
+from FoGSE.io.frame_ring import FrameRing, FrameRingReader
+
+from tests.helpers import make_manager, make_packets
+
+def test_shared_frame_ring(tmp_path):
+    """Check written frames are published to the shared memory ring, and overwritten frames are detected."""
+    writer = LogWriter()
+    manager = make_manager(tmp_path, writer=writer)
+    manager.ring = FrameRing(manager.filepath, manager.frame_len, slots=3)
+    reader = FrameRingReader(manager.filepath)
+    assert reader.latest() is None, "Empty ring should have no latest frame."
+
+    for counter in range(5):
+        for packet in make_packets(bytes([counter])*10, 4, counter):
+            manager.enqueue(packet)
+    writer.join()
+
+    latest = reader.latest()
+    assert (latest.index, latest.counter, latest.data) == (4, 4, bytes([4])*10), "Latest frame should be the last one written."
+    assert [f.counter for f in reader.frames_since(1)] == [2, 3, 4]
+    assert [f.counter for f in reader.frames_since(-1)] == [2, 3, 4], "Only the last `slots` frames should be kept."
+    assert reader.read(0) is None, "Overwritten frames should not be returned."
+
+    reader.close()
+    writer.stop()
+    manager.ring.close()
+
+def test_frame_ring_replaced(tmp_path, qapp):
+    """Check readers see a ring replaced by a restarted Listener as closed, and reattach to the new one."""
+    from FoGSE.readers.BaseReader import BaseReader
+
+    path = os.path.join(tmp_path, "test.log")
+    with open(path, "wb") as f:
+        f.write(bytes([1])*10)
+    old = FrameRing(path, 10)
+    old.publish(bytes([1])*10, 1)
+    ring_reader = FrameRingReader(path)
+    reader = BaseReader(path)
+    reader.define_buffer_size(10)
+    assert reader.read_latest_frame() == bytes([1])*10
+
+    # a Listener that didn't close its ring: the new one flags the old closed
+    new = FrameRing(path, 10)
+    new.publish(bytes([2])*10, 2)
+    assert ring_reader.closed and ring_reader.generation != new.generation
+    assert reader.read_latest_frame() == bytes([2])*10, "The reader should reattach to the new ring."
+    ring_reader.close()
+
+    # a ring removed without being flagged: nothing is published while the log grows
+    new._shm.unlink()
+    newer = FrameRing(path, 10)
+    newer.publish(bytes([3])*10, 3)
+    with open(path, "ab") as f:
+        f.write(bytes([3])*10)
+    assert reader.read_latest_frame() == bytes([3])*10, "A stalled ring should be reattached."
+
+    reader.timer.stop()
+    reader._frame_ring.close()
+    old._shm.close()
+    new._shm.close()
+    newer.close()
+
+def test_reader_ring_block(tmp_path, qapp):
+    """Check a reader takes a block of several frames from the ring, and falls back to the log when it can't."""
+    from FoGSE.readers.BaseReader import BaseReader
+
+    path = os.path.join(tmp_path, "test.log")
+    with open(path, "wb") as f:
+        f.write(bytes(range(30)))
+    ring = FrameRing(path, 10, slots=3)
+    reader = BaseReader(path)
+    reader.define_buffer_size(20)
+    ring.publish(bytes([1])*10, 1)
+    assert reader.read_latest_frame() is None, "Too few frames published for the block."
+    assert reader.read_latest_block() == bytes(range(10, 30)), "Should fall back to the log."
+    for counter in range(2, 5):
+        ring.publish(bytes([counter])*10, counter)
+    assert reader.read_latest_block() == bytes([3])*10 + bytes([4])*10
+    reader.define_buffer_size(40)
+    assert reader.read_latest_frame() is None, "Blocks longer than the ring can't come from it."
+    reader.define_buffer_size(15)
+    assert reader.read_latest_frame() is None
+
+    reader.timer.stop()
+    reader._frame_ring.close()
+    ring.close()
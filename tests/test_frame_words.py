@@ -0,0 +1,19 @@
+"""Test decoding frames into words with `frame_words`"""
+
+import struct
+
+from FoGSE.io.frame_words import frame_words, word_list
+
+def test_frame_words():
+    """Check frames decode to little-endian word views, matching struct, without a copy."""
+    frame = struct.pack("<4I", 0x02efcdab, 1, 0x2301ffff, 0xdeadbeef) + b"\x01\x02"
+    words = frame_words(frame)
+    assert words.dtype.str == "<u4" and not words.flags.writeable
+    assert word_list(words) == [w[0] for w in struct.iter_unpack("<I", frame[:16])], \
+        "Bytes after the last whole word should be left out."
+    assert word_list([1, 2]) == [1, 2]
+    buffer = bytearray(frame)
+    view = frame_words(buffer)
+    buffer[4] = 7
+    assert view[1] == 7, "The words should be a view onto the frame, not a copy."
+    assert frame_words(frame, ">u2")[0] == 0xabcd
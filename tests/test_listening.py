@@ -0,0 +1,295 @@
+"""Test frame reassembly in `listening.LogFileManager` and `listening.CurrentFrame`"""
+
+import os
+import time
+import threading
+
+import pytest
+
+from FoGSE.listening import CurrentFrame, LogWriter, UplinkSender
+from FoGSE.io.log_index import LogIndex
+
+from tests.helpers import make_manager, make_packets, check_listener_loopback
+
+def test_current_frame_bitmap():
+    """Check `CurrentFrame` tracks received packets and completion."""
+    frame = CurrentFrame(frame_len=20, packet_count=10, payload_len=2, frame_counter=3)
+    assert len(frame.queued) == 2, "Bitmap should use one bit per packet."
+
+    for i in range(1, 10):
+        assert frame.insert(i, bytes([i, i])), f"Packet {i} should insert into a fresh frame."
+        assert not frame.done, "Frame should not be done before the last packet."
+
+    assert frame.is_queued(9) and not frame.is_queued(10), "Bitmap does not match inserted packets."
+    assert not frame.insert(9, b"\xff\xff"), "Duplicate packet should be rejected."
+    assert not frame.insert(11, b"\xff\xff"), "Out-of-range packet should be rejected."
+    assert frame.received == 9, "Rejected packets should not be counted."
+
+    assert frame.insert(10, b"\x0a\x0a")
+    assert frame.done, "Frame should be done after all packets are received."
+    assert bytes(frame.data) == bytes([i//2 + 1 for i in range(20)]), "Frame data was not reassembled in order."
+
+def test_enqueue_out_of_order(tmp_path):
+    """Check interleaved, out-of-order packets from several frames are written whole."""
+    manager = make_manager(tmp_path)
+    frame_a = bytes(range(10))
+    frame_b = bytes(range(10, 20))
+    packets_a = make_packets(frame_a, 4, 1)
+    packets_b = make_packets(frame_b, 4, 2)
+
+    order = [packets_b[2], packets_a[1], packets_b[0], packets_a[2], packets_a[0], packets_b[1]]
+    completed = [manager.enqueue(p) for p in order]
+    assert completed == [False, False, False, False, True, True], "Frames completed on the wrong packets."
+    assert manager.frames == {}, "Completed frames should leave the in-flight table."
+    manager.file.close()
+
+    with open(manager.filepath, "rb") as log:
+        assert log.read() == frame_a + frame_b, "Log file does not contain both frames."
+
+def test_enqueue_duplicate_packet(tmp_path):
+    """Check a repeated packet flushes the partial frame and starts a new one."""
+    manager = make_manager(tmp_path)
+    packets = make_packets(bytes(range(10)), 4, 7)
+
+    assert not manager.enqueue(packets[0])
+    assert not manager.enqueue(packets[0])
+    assert list(manager.frames.keys()) == [7], "Frame should restart under the same counter."
+    assert manager.frames[7].received == 1, "Restarted frame should hold only the repeated packet."
+    manager.file.close()
+
+    with open(manager.filepath, "rb") as log:
+        assert len(log.read()) == 10, "The partial frame should have been written out once."
+    assert manager.frames_completed == 0 and manager.missing_packets == 2, \
+        "A frame cut short shouldn't count as completed."
+
+class _StalledFile:
+    """Wraps a real file so the writer thread waits until `release` is set."""
+    def __init__(self, file):
+        self.file = file
+        self.name = file.name
+        self.release = threading.Event()
+    def fileno(self):
+        self.release.wait()
+        return self.file.fileno()
+    def write(self, data):
+        self.release.wait()
+        return self.file.write(data)
+    def flush(self):
+        self.file.flush()
+
+def test_writer_thread(tmp_path):
+    """Check frames handed to a `LogWriter` reach the log in order."""
+    writer = LogWriter(max_frames=4)
+    manager = make_manager(tmp_path, writer=writer)
+    frames = [bytes([n]*10) for n in range(6)]
+    for n, frame in enumerate(frames):
+        for packet in make_packets(frame, 4, n):
+            manager.enqueue(packet)
+    writer.stop()
+    manager.file.close()
+
+    with open(manager.filepath, "rb") as log:
+        assert log.read() == b"".join(frames), "Writer thread did not write every frame in order."
+    assert 1 <= writer.high_water <= 4, "High-water mark should be within the queue bounds."
+
+def test_writer_drop_policy(tmp_path):
+    """Check a full `LogWriter` queue drops and counts frames under the "drop" policy."""
+    writer = LogWriter(max_frames=2, overflow="drop")
+    stalled = _StalledFile(open(os.path.join(tmp_path, "stalled.log"), "wb"))
+    results = [writer.submit(stalled, bytes([n])) for n in range(6)]
+    # the writer thread may already hold the first frame, so 2 or 3 get through
+    assert results[:2] == [True, True] and results[-1] is False, "Full queue should reject new frames."
+    assert writer.dropped == results.count(False), "Dropped frames were not counted."
+    assert writer.high_water == 2, "High-water mark should reach the queue size."
+
+    stalled.release.set()
+    writer.stop()
+    stalled.file.close()
+    with open(stalled.name, "rb") as log:
+        assert log.read() == bytes(range(results.count(True))), "Accepted frames were not written in order."
+
+def test_dropped_frames_not_announced(tmp_path):
+    """Check frames dropped by a full `LogWriter` aren't published or announced as written."""
+    writer = LogWriter(max_frames=1, overflow="drop")
+    manager = make_manager(tmp_path, frame_len=4, payload_len=4, writer=writer, flush_ms=0)
+    manager.file = _StalledFile(manager.file)
+    events = []
+    manager.on_frame_written = lambda system, data, offset, length, counter: events.append((offset, length, counter))
+    for n in range(6):
+        manager.enqueue(make_packets(bytes([n])*4, 4, n)[0])
+    manager.file.release.set()
+    writer.stop()
+    manager.file.file.close()
+    manager.dumpfile.close()
+    manager.indexfile.close()
+
+    with open(manager.filepath, "rb") as log:
+        data = log.read()
+    assert writer.dropped > 0 and len(data) < 6*4
+    assert len(events) == len(data)//4, "Only frames that reached the log should be announced."
+    for offset, length, counter in events:
+        assert data[offset:offset + length] == bytes([counter])*4, "Events should point at the frames written."
+
+def test_writer_empty_data(tmp_path):
+    """Check empty data handed to the `LogWriter` is skipped rather than retried forever."""
+    writer = LogWriter()
+    with open(os.path.join(tmp_path, "test.log"), "wb") as f:
+        writer.submit(f, b"")
+        writer.submit(f, b"abc", flush_ms=1000)
+        writer.submit(f, bytearray(), flush_ms=1000)
+        writer.submit(f, b"def")
+        thread = threading.Thread(target=writer.join, daemon=True)
+        thread.start()
+        thread.join(5)
+        assert not thread.is_alive(), "Writer thread stuck on empty data."
+    writer.stop()
+    with open(os.path.join(tmp_path, "test.log"), "rb") as f:
+        assert f.read() == b"abcdef"
+
+def test_writer_group_commit(tmp_path):
+    """Check frames are batched by size, and that time-limited frames still reach the file."""
+    writer = LogWriter()
+    with open(os.path.join(tmp_path, "batched.log"), "wb") as batched, \
+            open(os.path.join(tmp_path, "timed.log"), "wb") as timed:
+        for n in range(40):
+            writer.submit(batched, bytes([n])*100, flush_bytes=1000, flush_ms=10_000)
+        writer.submit(timed, b"hk", flush_bytes=0, flush_ms=20)
+        
+        deadline = time.monotonic() + 2
+        while os.path.getsize(timed.name) == 0 and time.monotonic() < deadline:
+            time.sleep(0.005)
+        assert os.path.getsize(timed.name) == 2, "Frame was not written within its flush interval."
+        assert os.path.getsize(batched.name) == 4000, "Size-limited frames were not written when full."
+        assert writer.write_calls == 5, "Frames should be written in one call per batch."
+        writer.stop()
+
+    with open(batched.name, "rb") as log:
+        assert log.read() == b"".join(bytes([n])*100 for n in range(40)), "Batched frames were written out of order."
+
+def test_evict_in_flight_frames(tmp_path):
+    """Check incomplete frames are evicted to `dump/` when too many are in flight or they go stale."""
+    manager = make_manager(tmp_path, max_frames=2, frame_timeout_ms=1000)
+    for counter in range(3):
+        manager.enqueue(make_packets(bytes([counter])*10, 4, counter)[0])
+    assert list(manager.frames.keys()) == [1, 2], "Oldest frame should be evicted first."
+    assert manager.evicted_full == 1
+
+    manager.frames[1].last_insert -= 2
+    assert manager.evict_stale() == 1, "Only the frame without recent packets should be evicted."
+    assert list(manager.frames.keys()) == [2] and manager.evicted_stale == 1
+    manager.dumpfile.close()
+
+    with open(manager.dumpfile.name, "rb") as dump:
+        assert dump.read() == bytes([0]*4 + [0]*6 + [1]*4 + [0]*6), "Evicted frames should be dumped as received."
+
+def test_frame_pool_reuse(tmp_path):
+    """Check steady-state ingest reuses pooled frames, and reused frames don't leak old data."""
+    writer = LogWriter()
+    manager = make_manager(tmp_path, writer=writer)
+    for counter in range(50):
+        for packet in make_packets(bytes([counter])*10, 4, counter & 0xff):
+            manager.enqueue(packet)
+        writer.join()
+    assert manager.pool.allocated == 1, "Frames should come from the pool once one has been released."
+    assert manager.pool.reused == 49
+
+    # an incomplete frame written from a reused buffer should have zeros where packets are missing
+    manager.enqueue(make_packets(bytes([0xaa])*10, 4, 99)[1])
+    manager.dump(99)
+    writer.stop()
+    manager.dumpfile.close()
+    with open(manager.dumpfile.name, "rb") as dump:
+        assert dump.read() == bytes(4) + bytes([0xaa])*4 + bytes(2), "Missing packets should be zero-filled."
+
+def test_single_packet_fast_path(tmp_path):
+    """Check single-packet data types are written without building frames."""
+    manager = make_manager(tmp_path, frame_len=6, payload_len=8, data=0x10)
+    assert manager.single_packet
+    for counter in range(3):
+        assert manager.enqueue(make_packets(bytes([counter])*6, 8, counter, data=0x10)[0])
+    assert manager.enqueue(make_packets(b"\x07\x07", 8, 3, data=0x10)[0])
+    assert manager.frames == {} and manager.pool.allocated == 0, "Fast path should not build frames."
+    for packet in (make_packets(b"\x01", 8, 4, system=0x0a, data=0x10)[0], make_packets(b"\x01", 8, 4, data=0x11)[0]):
+        with pytest.raises(KeyError):
+            manager.enqueue(packet)
+    manager.file.close()
+
+    with open(manager.filepath, "rb") as log:
+        assert log.read() == bytes([0]*6 + [1]*6 + [2]*6 + [7, 7, 0, 0, 0, 0]), "Short packets should be padded to the frame length."
+
+def test_ingest_stats(tmp_path):
+    """Check the ingest counters for completed, dumped, out-of-order and duplicate packets."""
+    manager = make_manager(tmp_path)
+    packets_a = make_packets(bytes(range(10)), 4, 1)
+    packets_b = make_packets(bytes(range(10)), 4, 2)
+    start = manager._rate_sample[0]
+
+    # a1, b0, a0 (older frame), b2, b2 (duplicate: restarts frame 2), b1 (earlier packet), a2 (older frame)
+    for packet in [packets_a[1], packets_b[0], packets_a[0], packets_b[2], packets_b[2], packets_b[1], packets_a[2]]:
+        manager.enqueue(packet)
+    manager.dump(2)
+
+    stats = manager.get_stats()
+    assert (stats["packets"], stats["bytes"]) == (7, 7*8 + 4*4 + 2*3)
+    assert (stats["frames_completed"], stats["frames_dumped"]) == (1, 1), \
+        "Only full frames should count as completed (not the restarted one), and dumped ones as dumped."
+    assert stats["out_of_order"] == 3 and stats["duplicates"] == 1
+    assert stats["missing_packets"] == 2, "Packets missing from the restarted and dumped frames were not counted."
+
+    manager.update_rates(start + 2)
+    assert manager.get_stats()["packets_per_s"] == 3.5, "Rate should be packets since the last sample per second."
+
+def test_uplink_sender():
+    """Check uplink commands are sent in order off the caller's thread, with timestamps and callbacks."""
+    release = threading.Event()
+    sent = []
+    def send(command):
+        release.wait()
+        sent.append(command)
+        return command != b"\x00\x01"
+    completed = []
+    uplink = UplinkSender(send)
+
+    start = time.monotonic()
+    commands = [uplink.submit(bytes([0, n]), completed.append) for n in range(3)]
+    assert time.monotonic() - start < 0.5, "Queueing should not wait for the device."
+    assert commands[0].sent_ns is None and commands[0].success is None
+
+    release.set()
+    uplink.join()
+    assert sent == [b"\x00\x00", b"\x00\x01", b"\x00\x02"], "Commands should be sent in order."
+    assert completed == commands, "Each command should get its completion callback."
+    assert [c.success for c in commands] == [True, False, True]
+    assert (uplink.sent, uplink.failed) == (2, 1)
+    assert all(c.sent_ns >= c.queued_ns for c in commands) and commands[2].latency_ms >= 0
+    uplink.stop()
+
+def test_resume_log(tmp_path):
+    """Check a resumed log is cut back to whole frames and records, then appended to."""
+    manager = make_manager(tmp_path)
+    frames = [bytes([n]*10) for n in range(4)]
+    for n, frame in enumerate(frames[:2]):
+        for packet in make_packets(frame, 4, n):
+            manager.enqueue(packet)
+    manager.close()
+    # as if the Listener stopped partway through writing a frame and its record
+    with open(manager.filepath, "ab") as f:
+        f.write(bytes([0xee]*7))
+    with open(os.path.join(tmp_path, "test.idx"), "ab") as f:
+        f.write(bytes(5))
+
+    manager = make_manager(tmp_path, resume=True)
+    for n, frame in enumerate(frames[2:], start=2):
+        for packet in make_packets(frame, 4, n):
+            manager.enqueue(packet)
+    manager.close()
+
+    with open(manager.filepath, "rb") as f:
+        assert f.read() == b"".join(frames), "The torn frame should be cut off, and new frames appended."
+    records = LogIndex(manager.filepath).records()
+    assert [r.offset for r in records] == list(range(0, 40, 10))
+    assert [r.counter for r in records] == [0, 1, 2, 3]
+
+def test_listener_loopback(tmp_path):
+    """Check a running Listener drains bursts of datagrams into whole frames, and acts on control messages."""
+    check_listener_loopback("FoGSE/listening.py", tmp_path)
@@ -0,0 +1,7 @@
+"""Test `listening_async.AsyncListener` over loopback"""
+
+from tests.helpers import check_listener_loopback
+
+def test_async_listener_loopback(tmp_path):
+    """Check a running asyncio Listener drains bursts of datagrams into whole frames, and acts on control messages."""
+    check_listener_loopback("FoGSE/listening_async.py", tmp_path)
@@ -0,0 +1,113 @@
+"""Test how `listening_sharded.plan_shards` spreads systems over Listener workers, and a running `listening_sharded.ShardedListener`"""
+
+import os
+import sys
+import glob
+import json
+import time
+import signal
+import socket
+import subprocess
+
+import pytest
+
+from FoGSE.listening_sharded import plan_shards
+from FoGSE.io.ingest_stats import request_stats
+
+from tests.helpers import make_packets, loopback_config
+
+def test_plan_shards():
+    """Check systems are spread over shard workers by log count, keeping shared hex codes together."""
+    systems = [
+        {"name": "gse", "hex": "0x00"},
+        {"name": "housekeeping", "hex": "0x02", "ring_buffer_interface": {"pow": {}, "rtd": {}}},
+        {"name": "uplink", "hex": "0x02"},
+        {"name": "cdte1", "hex": "0x09", "spacewire_interface": {"ring_buffer_interface": {"pc": {}, "hk": {}}}},
+        {"name": "cdte2", "hex": "0x0a", "spacewire_interface": {"ring_buffer_interface": {"pc": {}, "hk": {}}}},
+        {"name": "cmos1", "hex": "0x0e", "spacewire_interface": {"ring_buffer_interface": {"pc": {}, "ql": {}, "hk": {}}}},
+        {"name": "alias", "hex": "0x0e", "ring_buffer_interface": {"pc": {}}}
+    ]
+    plan = plan_shards(systems, 2)
+    assert sorted(sum((shard["systems"] for shard in plan), [])) == ["alias", "cdte1", "cdte2", "cmos1", "housekeeping"]
+    assert any(set(shard["systems"]) >= {"cmos1", "alias"} for shard in plan), "Shared hex codes should share a shard."
+    assert sorted(len(shard["systems"]) for shard in plan) == [2, 3], "Logs should be balanced across workers."
+    assert len(plan_shards(systems, 8)) == 4, "Workers with no systems should not be started."
+
+    given = [{"systems": ["cmos1", "alias"], "port": 10001}, {"systems": ["cdte1"]}]
+    assert plan_shards(systems, shards=given) == given
+    try:
+        plan_shards(systems, shards=[{"systems": ["cmos1"]}, {"systems": ["alias"]}])
+        assert False, "Splitting a hex code across shards should fail."
+    except ValueError:
+        pass
+
+@pytest.mark.skipif(not sys.platform.startswith("linux"), reason="steering datagrams to workers needs Linux")
+def test_sharded_listener_steering(tmp_path):
+    """Check a running ShardedListener's workers receive their systems' datagrams themselves, with none forwarded."""
+    sender = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
+    sender.bind(("127.0.0.2", 0))
+    port = sender.getsockname()[1]
+    config = loopback_config(str(tmp_path), port)
+    with open(config) as f:
+        systems = json.load(f)
+    systems.append({"name": "other", "hex": "0x0a", "ring_buffer_interface": {"pc": {"ring_frame_size_bytes": "0xa"}}})
+    systems[0]["logger_interface"]["shards"] = [{"systems": ["test"]}, {"systems": ["other"]}]
+    with open(config, "w") as f:
+        json.dump(systems, f)
+    root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+    proc = subprocess.Popen([sys.executable, os.path.join(root, "FoGSE", "listening_sharded.py"), config], cwd=root,
+                            env=dict(os.environ, PYTHONPATH=root), stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+    control = os.path.join(tmp_path, "listen.sock")
+
+    def shard_stats():
+        try:
+            return request_stats(control, timeout=0.2)["listener"]["shards"]
+        except OSError:
+            return None
+
+    frames = {0x09: [bytes([n])*10 for n in range(8)], 0x0a: [bytes([0x80 + n])*10 for n in range(8)]}
+    try:
+        deadline = time.monotonic() + 30
+        shards = None
+        while time.monotonic() < deadline and proc.poll() is None:
+            shards = shard_stats()
+            if shards is not None and all(shard["state"] == "ok" for shard in shards):
+                break
+            time.sleep(0.1)
+        assert shards is not None and all(shard["state"] == "ok" for shard in shards), "Workers didn't start."
+        assert all(shard["steered"] for shard in shards)
+
+        for n in range(8):
+            for system, data in frames.items():
+                for packet in make_packets(data[n], 4, n, system=system):
+                    sender.sendto(packet, ("127.0.0.1", port))
+        # not from the Formatter: dropped, as by a connected socket
+        stranger = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
+        stranger.bind(("127.0.0.3", 0))
+        for packet in make_packets(bytes(10), 4, 9) + [bytes([0x77]*12)]:
+            stranger.sendto(packet, ("127.0.0.1", port))
+        stranger.close()
+        # for no shard: to the supervisor's catch log
+        sender.sendto(bytes([0x77]*12), ("127.0.0.1", port))
+
+        logs = {}
+        deadline = time.monotonic() + 10
+        while time.monotonic() < deadline:
+            logs = {name: glob.glob(os.path.join(tmp_path, "received", "*", name + "_pc.log")) for name in ("test", "other")}
+            if all(len(paths) == 1 and os.path.getsize(paths[0]) >= 80 for paths in logs.values()):
+                break
+            time.sleep(0.05)
+        with open(logs["test"][0], "rb") as f:
+            assert f.read() == b"".join(frames[0x09])
+        with open(logs["other"][0], "rb") as f:
+            assert f.read() == b"".join(frames[0x0a])
+        assert all(shard["forwarded"] == 0 for shard in shard_stats()), "The supervisor shouldn't forward steered datagrams."
+        assert request_stats(control)["listener"]["catch_packets"] == 1
+    finally:
+        sender.close()
+        proc.send_signal(signal.SIGINT)
+        try:
+            proc.wait(15)
+        except subprocess.TimeoutExpired:
+            proc.kill()
+            proc.wait()
@@ -0,0 +1,28 @@
+"""Test the frame index `log_index.LogIndex` written by `listening.LogFileManager`"""
+
+from FoGSE.io.log_index import LogIndex, DEST_LOG, DEST_DUMP
+
+from tests.helpers import make_manager, make_packets
+
+def test_frame_index(tmp_path):
+    """Check every written or dumped frame gets an index record, and records can be searched by time."""
+    manager = make_manager(tmp_path)
+    for counter in range(3):
+        for packet in make_packets(bytes([counter])*10, 4, counter):
+            manager.enqueue(packet)
+    manager.enqueue(make_packets(bytes(10), 4, 9)[0])
+    manager.dump(9)
+    for packet in make_packets(bytes([3])*10, 4, 3):
+        manager.enqueue(packet)
+    manager.indexfile.close()
+
+    index = LogIndex(manager.filepath)
+    assert len(index) == 5, "Expected one index record per frame."
+    assert [r.offset for r in index.records(DEST_LOG)] == [0, 10, 20, 30], "Log offsets should step by the frame length."
+    assert [r.counter for r in index.records(DEST_LOG)] == [0, 1, 2, 3]
+    dumped = index.record(3)
+    assert (dumped.destination, dumped.offset, dumped.counter, dumped.missing) == (DEST_DUMP, 0, 9, 2)
+
+    assert index.nearest_time(index.record(1).timestamp_ns).counter == 1
+    assert index.nearest_time(index.record(3).timestamp_ns, destination=DEST_DUMP).counter == 9
+    assert index.nearest_time(0).counter == 0 and index.nearest_time(2**63).counter == 3
@@ -0,0 +1,38 @@
+"""Test downlink logs split into segments by `listening.LogFileManager`, read back with `log_segments.LogSegments`"""
+
+import os
+
+from FoGSE.listening import LogWriter
+from FoGSE.io.log_index import LogIndex
+from FoGSE.io.log_segments import LogSegments, manifest_path, segment_name
+
+from tests.helpers import make_manager, make_packets
+
+def test_segmented_log(tmp_path):
+    """Check a log rolls over into segments on frame boundaries, and reads back as one stream."""
+    writer = LogWriter()
+    manager = make_manager(tmp_path, writer=writer, flush_ms=10_000, segment_bytes=35, preallocate_bytes=1 << 16)
+    frames = [bytes([n]*10) for n in range(8)]
+    for n, frame in enumerate(frames):
+        for packet in make_packets(frame, 4, n):
+            manager.enqueue(packet)
+    # frames written so far can be read while the log is still open
+    writer.join()
+    assert LogSegments(manager.filepath).read(60, 20) == frames[6] + frames[7]
+    writer.stop()
+    manager.close()
+
+    names = [segment_name(manager.filepath, k) for k in range(3)]
+    assert [s["file"] for s in manager.segments] == names, "Each segment should hold at most 3 frames."
+    assert [os.path.getsize(os.path.join(tmp_path, name)) for name in names] == [30, 30, 20], \
+        "Segments should hold whole frames, with no preallocated space left over."
+    assert os.path.realpath(manager.filepath) == os.path.realpath(os.path.join(tmp_path, names[-1])), \
+        "The log should link to its last segment."
+    assert os.path.exists(manifest_path(manager.filepath))
+
+    log = LogSegments(manager.filepath)
+    assert log.segmented and log.size() == 80
+    assert log.read(0, 80) == b"".join(frames)
+    assert log.read(25, 10) == frames[2][5:] + frames[3][:5], "Reads should cross segment boundaries."
+    assert [r.offset for r in LogIndex(manager.filepath).records()] == list(range(0, 80, 10)), \
+        "Index offsets should count from the start of the whole stream."
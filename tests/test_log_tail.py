@@ -0,0 +1,45 @@
+"""Test reading new frames from a growing log with `log_tail.LogTail`"""
+
+from FoGSE.listening import LogWriter
+from FoGSE.io.log_segments import LogSegments
+from FoGSE.io.log_tail import LogTail
+
+from tests.helpers import make_manager, make_packets
+
+def test_log_tail(tmp_path):
+    """Check a tail returns each complete frame once and in order, across segments."""
+    writer = LogWriter()
+    manager = make_manager(tmp_path, writer=writer, flush_ms=0, segment_bytes=35)
+    frames = [bytes([n]*10) for n in range(8)]
+    early = LogTail(manager.filepath, 10)
+    assert early.read_new() == [], "Nothing should be read before the log exists."
+
+    def write(numbers):
+        for n in numbers:
+            for packet in make_packets(frames[n], 4, n):
+                manager.enqueue(packet)
+        writer.join()
+
+    write(range(2))
+    assert early.read_new() == frames[:2], "A tail started on an empty log should miss nothing."
+    tail = LogTail(manager.filepath, 10)
+    assert tail.read_new() == [frames[1]], "The first read should start at the newest frame."
+    assert tail.read_new() == []
+    write(range(2, 7))
+    assert tail.read_new(max_frames=3) == frames[2:5]
+    assert tail.frames_behind == 2
+    assert tail.read_new() == frames[5:7], "Frames left over should come on the next read."
+    assert tail.frames_behind == 0
+    # part of a frame isn't returned until the rest is written
+    packets = make_packets(frames[7], 4, 7)
+    for packet in packets[:-1]:
+        manager.enqueue(packet)
+    writer.join()
+    assert tail.read_new() == []
+    manager.enqueue(packets[-1])
+    writer.join()
+    assert tail.read_new() == [frames[7]]
+    writer.stop()
+    manager.close()
+    assert LogSegments(manager.filepath).segmented
+    assert LogTail(manager.filepath, 10, from_start=True).read_new() == frames
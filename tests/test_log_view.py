@@ -0,0 +1,56 @@
+"""Test the memory-mapped `log_view.LogView`"""
+
+import os
+import struct
+
+import pytest
+
+from FoGSE.listening import LogWriter
+from FoGSE.io.log_view import LogView
+
+from tests.helpers import make_manager, make_packets
+
+def test_log_view(tmp_path):
+    """Check a memory-mapped view gives frames of a growing (and segmented) log as arrays."""
+    path = os.path.join(tmp_path, "plain.log")
+    view = LogView(path, 8, "<u4")
+    assert len(view) == 0 and view.last(3).shape == (0, 2)
+    with pytest.raises(FileNotFoundError):
+        view.tail(8)
+
+    frames = [struct.pack("<2I", n, 100 + n) for n in range(6)]
+    with open(path, "wb") as f:
+        f.write(b"".join(frames[:3]) + frames[3][:5])
+    assert view.refresh() == 29 and len(view) == 3, "A partly written frame shouldn't count."
+    assert view.frame(-1).tolist() == [2, 102] and view.frame(0).tolist() == [0, 100]
+    assert view.last(2).tolist() == [[1, 101], [2, 102]]
+    with pytest.raises(IndexError):
+        view.frame(3)
+    assert view.tail(8) == frames[2][5:] + frames[3][:5]
+
+    with open(path, "ab") as f:
+        f.write(frames[3][5:] + frames[4])
+    view.refresh()
+    assert view.last(10).tolist() == [[n, 100 + n] for n in range(5)], "New frames should be mapped."
+    assert view.read(8, 8) == frames[1]
+    kept = view.frame(3)
+    with open(path, "r+b") as f:
+        f.truncate(33)
+    assert view.refresh() == 33 and len(view) == 4, "A log cut back should be remapped."
+    assert kept.tolist() == [3, 103], "Arrays given out should stay readable."
+
+    # a segmented log: frames come from each segment, and from both across a boundary
+    writer = LogWriter()
+    manager = make_manager(tmp_path, writer=writer, flush_ms=0, segment_bytes=35)
+    for n, frame in enumerate(frames):
+        for packet in make_packets(frame + bytes(2), 4, n):
+            manager.enqueue(packet)
+    writer.join()
+    writer.stop()
+    manager.close()
+    segmented = LogView(manager.filepath, 10, "u1")
+    assert len(segmented) == 6 and len(segmented._files) == 2
+    assert [bytes(segmented.frame(n)) for n in range(6)] == [frame + bytes(2) for frame in frames]
+    assert segmented.frames(2, 4).tobytes() == frames[2] + bytes(2) + frames[3] + bytes(2)
+    assert not segmented.frame(0).flags.writeable
+    segmented.close()
@@ -0,0 +1,98 @@
+"""Test `packet_journal.PacketJournal`, and reassembling logs from it with `reassemble_journal`"""
+
+import os
+import json
+import socket
+
+import pytest
+
+from FoGSE.listening import LogWriter
+from FoGSE.io.packet_journal import PacketJournal, JournalRecord, read_journal, journal_segments
+from FoGSE.io.log_index import LogIndex, DEST_LOG, DEST_DUMP
+from FoGSE.reassemble_journal import reassemble_journal, reassemble_datagrams
+
+from tests.helpers import make_packets
+
+def test_packet_journal_reassembly(tmp_path):
+    """Check journaled packets are read back in order across segments, and reassemble into the same log."""
+    frames = [bytes([n])*10 for n in range(4)]
+    packets = [p for n, frame in enumerate(frames) for p in make_packets(frame, 4, n)]
+    packets.insert(3, bytes([0x77]*12)) # no log file for this one
+
+    journal = PacketJournal(os.path.join(tmp_path, "journal"), segment_bytes=100, batch_bytes=40)
+    for packet in packets:
+        journal.append(memoryview(packet))
+    journal.close()
+    assert len(journal_segments(journal.folder)) > 1, "Journal should have rolled over to new segments."
+    records = list(read_journal(journal.folder))
+    assert [r.data for r in records] == packets, "Journal should return every datagram in order."
+    assert all(a.timestamp_ns <= b.timestamp_ns for a, b in zip(records, records[1:]))
+
+    config = [{"name": "gse", "hex": "0x00", "ethernet_interface": {"max_payload_bytes": 12}},
+              {"name": "test", "hex": "0x09", "ring_buffer_interface": {"pc": {"ring_frame_size_bytes": "0xa"}}}]
+    with open(os.path.join(tmp_path, "systems.json"), "w") as f:
+        json.dump(config, f)
+    stats = reassemble_journal(journal.folder, os.path.join(tmp_path, "systems.json"), os.path.join(tmp_path, "out"))
+    assert stats["unrouted"] == 1 and stats["test_pc"]["frames_completed"] == 4
+    with open(os.path.join(tmp_path, "out", "test_pc.log"), "rb") as log:
+        assert log.read() == b"".join(frames), "Reassembled log does not match the frames sent."
+
+    # the same packets with a different frame size
+    reassemble_journal(journal.folder, os.path.join(tmp_path, "systems.json"), os.path.join(tmp_path, "out8"),
+                       frame_sizes={"test_pc": 8})
+    with open(os.path.join(tmp_path, "out8", "test_pc.log"), "rb") as log:
+        assert log.read() == b"".join(frame[:8] for frame in frames), "Frame size override was not used."
+
+def test_reassembly_timestamps(tmp_path):
+    """Check reassembled frames are indexed, and evicted, by the datagrams' arrival times."""
+    config = [{"name": "gse", "hex": "0x00", "ethernet_interface": {"max_payload_bytes": 12}},
+              {"name": "test", "hex": "0x09", "ring_buffer_interface": {"pc": {"ring_frame_size_bytes": "0xa"}}}]
+    with open(os.path.join(tmp_path, "systems.json"), "w") as f:
+        json.dump(config, f)
+    t0 = 1_700_000_000*10**9
+    second = 10**9
+    packets = [make_packets(bytes([n])*10, 4, n) for n in range(3)]
+    records = [JournalRecord(t0, make_packets(bytes(10), 4, 7)[1])] # never completed
+    records += [JournalRecord(t0 + (1 + k)*second, p) for k, p in enumerate(packets[0])]
+    # (more than the 5 s frame timeout later)
+    records += [JournalRecord(t0 + (10 + k)*second, p) for k, p in enumerate(packets[1])]
+    records.append(JournalRecord(t0 + 13*second, packets[2][0])) # still in flight at the end
+
+    stats = reassemble_datagrams(records, os.path.join(tmp_path, "systems.json"), os.path.join(tmp_path, "out"))
+    assert stats["test_pc"]["frames_completed"] == 2 and stats["test_pc"]["evicted_stale"] == 1
+    index = LogIndex(os.path.join(tmp_path, "out", "test_pc.log"))
+    assert [(r.counter, r.timestamp_ns) for r in index.records(DEST_LOG)] == [(0, t0 + 3*second), (1, t0 + 12*second)], \
+        "Frames should be indexed at the arrival of their last packet."
+    assert [(r.counter, r.timestamp_ns) for r in index.records(DEST_DUMP)] == [(7, t0 + 10*second), (2, t0 + 13*second)], \
+        "Dumped frames should be indexed at the arrival of the packet that evicted them, or of the last packet."
+
+def test_packet_journal_receive(tmp_path):
+    """Check datagrams received straight into the journal are journaled whole, through reused buffers."""
+    receiver, sender = socket.socketpair(socket.AF_UNIX, socket.SOCK_DGRAM)
+    writer = LogWriter()
+    journal = PacketJournal(os.path.join(tmp_path, "journal"), writer, batch_bytes=64)
+    packets = [bytes([n])*(10 + n) for n in range(20)]
+    received = []
+    stamps = []
+    for n, packet in enumerate(packets):
+        if n % 5 == 0:
+            stamps.append(journal.stamp())
+        sender.send(packet)
+        received.append(bytes(journal.receive(receiver, 2048)))
+    assert received == packets
+    with pytest.raises(BlockingIOError):
+        receiver.setblocking(False)
+        journal.receive(receiver)
+    journal.flush()
+    writer.join()
+    assert len(journal._free) > 0, "Written batch buffers should be kept for reuse."
+    # nothing left to write when closing
+    journal.close()
+    writer.stop()
+    records = list(read_journal(journal.folder))
+    assert [r.data for r in records] == packets
+    assert [r.timestamp_ns for r in records] == [t for t in stamps for _ in range(5)], \
+        "Datagrams should take the time of the last stamp()."
+    assert journal.packets == len(packets)
+    receiver.close()
+    sender.close()
@@ -0,0 +1,106 @@
+"""Test readers running their pipelines on `ReaderWorker.ReaderWorker` threads"""
+
+import os
+import time
+import threading
+
+import pytest
+
+def test_threaded_reader(tmp_path, qapp):
+    """Check a threaded reader parses off the GUI thread and collects every frame, in order, on it."""
+    from PyQt6 import QtCore
+    from FoGSE.readers.BaseReader import BaseReader
+    from FoGSE.readers.ReaderWorker import MainThreadJitter, stop_reader_threads
+
+    class FrameReader(BaseReader):
+        read_every_frame = True
+        threaded = True
+
+        def raw_2_parsed(self, raw_data):
+            return threading.get_ident(), raw_data
+
+        def parsed_2_collection(self, parsed_data):
+            return parsed_data
+
+    path = os.path.join(tmp_path, "test.log")
+    frames = [bytes([n]*12) for n in range(5)]
+    with open(path, "wb") as f:
+        f.write(frames[0])
+    reader = FrameReader(path)
+    reader.timer.stop()
+    reader.define_buffer_size(12)
+    jitter = MainThreadJitter(interval_ms=5)
+    collected = []
+    reader.value_changed_collection.connect(lambda: collected.append((threading.get_ident(), reader.collection)))
+
+    def wait_for(count):
+        deadline = time.monotonic() + 5
+        while (len(collected) < count or jitter.stats()["samples"] == 0) and time.monotonic() < deadline:
+            qapp.processEvents(QtCore.QEventLoop.ProcessEventsFlag.AllEvents, 10)
+
+    try:
+        reader.raw_2_collected()
+        wait_for(1)
+        with open(path, "ab") as f:
+            f.write(b"".join(frames[1:]))
+        for _ in range(3):
+            # requests made while one is waiting are merged
+            reader.update_collection()
+        wait_for(5)
+    finally:
+        stop_reader_threads()
+        jitter.stop()
+
+    main = threading.get_ident()
+    assert [c[1] for _, c in collected] == frames, "Every frame should be collected once, in order."
+    assert all(thread == main for thread, _ in collected), "Collections should be set on the GUI thread."
+    assert all(c[0] != main for _, c in collected), "Parsing should happen off the GUI thread."
+    assert reader.take_update_request() is None
+    assert jitter.stats()["samples"] > 0
+
+@pytest.mark.parametrize("threaded", [False, True])
+def test_reader_catches_up(tmp_path, qapp, threaded):
+    """Check a reader reads every frame of a burst bigger than `max_frames_per_update` once writing stops."""
+    from PyQt6 import QtCore
+    from FoGSE.readers.BaseReader import BaseReader
+    from FoGSE.readers.ReaderWorker import stop_reader_threads
+
+    class FrameReader(BaseReader):
+        read_every_frame = True
+        max_frames_per_update = 3
+
+        def raw_2_parsed(self, raw_data):
+            return raw_data
+
+        def parsed_2_collection(self, parsed_data):
+            return parsed_data
+
+    FrameReader.threaded = threaded
+    path = os.path.join(tmp_path, "test.log")
+    frames = [bytes([n]*12) for n in range(11)]
+    with open(path, "wb") as f:
+        f.write(frames[0])
+    reader = FrameReader(path)
+    reader.timer.stop()
+    reader.define_buffer_size(12)
+    collected = []
+    reader.value_changed_collection.connect(lambda: collected.append(reader.collection))
+
+    def wait_for(count):
+        deadline = time.monotonic() + 5
+        while len(collected) < count and time.monotonic() < deadline:
+            qapp.processEvents(QtCore.QEventLoop.ProcessEventsFlag.AllEvents, 10)
+
+    try:
+        reader.raw_2_collected()
+        wait_for(1)
+        with open(path, "ab") as f:
+            f.write(b"".join(frames[1:]))
+        # one timer tick after the last write
+        reader.raw_2_collected()
+        wait_for(len(frames))
+    finally:
+        stop_reader_threads()
+
+    assert collected == frames, "Frames beyond `max_frames_per_update` should still be read."
+    assert reader.frames_behind() == 0